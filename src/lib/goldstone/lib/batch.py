@@ -0,0 +1,78 @@
+"""Per-transaction batch of backend writes.
+
+ChangeHandler.apply() usually writes to the backend (Redis, TAI, NETCONF...) for every changed leaf. A transaction which
+configures all the ports of a switch issues thousands of writes. Instead, handlers can add their writes to the batch
+ServerBase provides in user["batch"]:
+
+    class MTUHandler(ChangeHandler):
+        def apply(self, user):
+            user["batch"].add("CONFIG_DB", (f"PORT|{self.ifname}", "mtu"), self.change.value)
+
+After all the handlers are applied, ServerBase calls its flush() once for each target with all the writes for the
+target, and before post(). flush() returns the original values of the written keys. ServerBase writes them back with
+flush() when the transaction fails or is aborted, so handlers don't need to revert the writes they added.
+
+A handler which writes to the backend directly, or whose write depends on the writes of the preceding changes, calls
+ServerBase.flush_pending() first so that the writes reach the backend in the order of the changes.
+"""
+
+from collections import OrderedDict
+
+
+class WriteBatch:
+    """Backend writes collected during a transaction, grouped by target.
+
+    Attributes:
+        flushed (list): Targets flushed so far and their original values. (target, [(key, original value)])
+    """
+
+    def __init__(self):
+        # key: target id, value: (target, OrderedDict(key: value))
+        self._targets = OrderedDict()
+        self.flushed = []
+
+    def add(self, target, key, value, target_id=None):
+        """Add a write.
+
+        A later write for the same key of the same target overwrites the value.
+
+        Args:
+            target (any): Backend target passed to ServerBase.flush(). e.g. Redis DB name, TAI object
+            key (any): Key to write in the target. e.g. (Redis key, field), TAI attribute name
+            value (any): Value to write.
+            target_id (any): Hashable ID of the target. Defaults to target itself. Specify this when different
+                objects represent the same target.
+        """
+        if target_id is None:
+            target_id = target
+        _, writes = self._targets.setdefault(target_id, (target, OrderedDict()))
+        writes.pop(key, None)
+        writes[key] = value
+
+    def targets(self):
+        """List targets and their writes.
+
+        Returns:
+            list: (target, [(key, value)]) in the order the targets are first added.
+        """
+        return [
+            (target, list(writes.items())) for target, writes in self._targets.values()
+        ]
+
+    def take(self):
+        """List targets and their writes, and drop the writes. Flushed targets are kept for revert.
+
+        Returns:
+            list: (target, [(key, value)]) in the order the targets are first added.
+        """
+        targets = self.targets()
+        self._targets.clear()
+        return targets
+
+    def clear(self):
+        """Drop all writes."""
+        self._targets.clear()
+        self.flushed = []
+
+    def __len__(self):
+        return sum(len(writes) for _, writes in self._targets.values())
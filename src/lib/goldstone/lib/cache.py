@@ -0,0 +1,220 @@
+"""Operational state data cache for ServerBase.
+
+A south daemon's oper_cb() usually talks to hardware (Redis, TAI, ONLP...) on every call. When several northbound
+clients ask for the same subtree in a short period, the same data is fetched again and again. OperDataCache keeps the
+result of oper_cb() per requested xpath for a configurable period (TTL) so that those requests can be answered without
+touching the hardware.
+
+TTLs are configured per schema subtree (xpath without list keys). e.g.
+
+    OperDataCache(
+        ttls={
+            "/goldstone-interfaces:interfaces/interface": 2,
+            "/goldstone-interfaces:interfaces/interface/state/counters": 1,
+        }
+    )
+
+A cached entry never lives longer than the shortest TTL of the data it may contain. A TTL of 0 disables caching for the
+subtree. Daemons must call invalidate() when they learn that the data has changed (e.g. from a link state notification)
+so that clients don't see stale data.
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+import libyang
+
+from .xpath import split
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPER_CACHE_SIZE = int(os.getenv("GOLDSTONE_DEFAULT_OPER_CACHE_SIZE", 128))
+DEFAULT_OPER_CACHE_TTL = float(os.getenv("GOLDSTONE_DEFAULT_OPER_CACHE_TTL", 0))
+
+
+def _split(xpath):
+    return [(e[0], e[1], dict(e[2])) for e in split(xpath)]
+
+
+def _schema_path(xpath):
+    return tuple(e[1] for e in split(xpath))
+
+
+def _is_prefix(prefix, path):
+    if len(prefix) > len(path):
+        return False
+    return all(a == b or a == "*" or b == "*" for a, b in zip(prefix, path))
+
+
+def overlaps(a, b):
+    """Check whether two xpaths may select a common data node.
+
+    Args:
+        a (str): Xpath.
+        b (str): Xpath.
+
+    Returns:
+        bool: False if the xpaths are known to select disjoint subtrees. True otherwise.
+    """
+    try:
+        a = _split(a)
+        b = _split(b)
+    except libyang.LibyangError:
+        return True
+    if len(a) > 0 and len(b) > 0 and a[0][0] != b[0][0]:
+        return False
+    for x, y in zip(a, b):
+        if x[1] != y[1] and "*" not in (x[1], y[1]):
+            return False
+        for k, v in x[2].items():
+            w = y[2].get(k)
+            if w is not None and w != v:
+                return False
+    return True
+
+
+def covers(a, b):
+    """Check whether data selected by an xpath includes all data selected by another xpath.
+
+    Args:
+        a (str): Covering xpath candidate.
+        b (str): Xpath.
+
+    Returns:
+        bool: True if a selects a superset of b.
+    """
+    try:
+        a = _split(a)
+        b = _split(b)
+    except libyang.LibyangError:
+        return False
+    if len(a) > len(b):
+        return False
+    if len(a) > 0 and a[0][0] != b[0][0]:
+        return False
+    for x, y in zip(a, b):
+        if x[1] != y[1] and x[1] != "*":
+            return False
+        for k, v in x[2].items():
+            if y[2].get(k) != v:
+                return False
+    return True
+
+
+class OperDataCache:
+    """LRU cache of operational state data keyed by the requested xpath.
+
+    Args:
+        ttls (dict): TTL in seconds for each schema subtree. key: xpath without list keys, value: TTL.
+        default_ttl (float): TTL in seconds for xpaths not covered by ttls. 0 disables caching.
+        maxsize (int): Maximum number of cached xpaths.
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not answered from the cache.
+    """
+
+    def __init__(
+        self,
+        ttls=None,
+        default_ttl=DEFAULT_OPER_CACHE_TTL,
+        maxsize=DEFAULT_OPER_CACHE_SIZE,
+    ):
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._ttls = {}
+        self._entries = OrderedDict()  # key: xpath, value: (expire, data)
+        self.hits = 0
+        self.misses = 0
+        for xpath, ttl in (ttls or {}).items():
+            self.set_ttl(xpath, ttl)
+
+    def set_ttl(self, xpath, ttl):
+        """Set TTL for a schema subtree.
+
+        Args:
+            xpath (str): Path to the subtree. List keys are ignored.
+            ttl (float): TTL in seconds. 0 disables caching for the subtree.
+        """
+        self._ttls[_schema_path(xpath)] = ttl
+        self.clear()
+
+    def ttl(self, xpath):
+        """Get TTL for data selected by the xpath.
+
+        Args:
+            xpath (str): Requested xpath.
+
+        Returns:
+            float: TTL in seconds.
+        """
+        path = _schema_path(xpath)
+        ttl = self.default_ttl
+        depth = -1
+        below = []
+        for prefix, v in self._ttls.items():
+            if _is_prefix(prefix, path):
+                if len(prefix) > depth:
+                    ttl = v
+                    depth = len(prefix)
+            elif _is_prefix(path, prefix):
+                # the subtree is a part of the requested data
+                below.append(v)
+        return min([ttl] + below)
+
+    def get(self, xpath):
+        """Get cached data.
+
+        Args:
+            xpath (str): Requested xpath.
+
+        Returns:
+            tuple: (hit, data). hit is False when there is no valid cache for the xpath.
+        """
+        entry = self._entries.get(xpath)
+        if entry is not None:
+            expire, data = entry
+            if time.monotonic() < expire:
+                self._entries.move_to_end(xpath)
+                self.hits += 1
+                return True, data
+            del self._entries[xpath]
+        self.misses += 1
+        return False, None
+
+    def set(self, xpath, data):
+        """Cache data.
+
+        Args:
+            xpath (str): Requested xpath.
+            data (any): Data returned by oper_cb() for the xpath.
+        """
+        ttl = self.ttl(xpath)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[xpath] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(xpath)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, xpath=None):
+        """Drop cached data which may include data under the xpath.
+
+        Args:
+            xpath (str): Path to the changed data. None drops all cached data.
+        """
+        if xpath is None:
+            self.clear()
+            return
+        for key in [k for k in self._entries if overlaps(k, xpath)]:
+            logger.debug("invalidating oper cache: %s", key)
+            del self._entries[key]
+
+    def clear(self):
+        """Drop all cached data."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,18 +1,58 @@
 import sys
+import os
+import threading
+from collections import OrderedDict
 import libyang
 
 from goldstone.lib.errors import UnsupportedError
+from goldstone.lib.xpath import split
+
+DEFAULT_NODE_CACHE_SIZE = int(os.getenv("GOLDSTONE_DEFAULT_NODE_CACHE_SIZE", 1024))
+
+
+def _schema_path(xpath):
+    try:
+        elems = split(xpath)
+    except ValueError:
+        return xpath
+    path = []
+    prefix = None
+    for p, n, _ in elems:
+        if p and p != prefix:
+            path.append(f"/{p}:{n}")
+            prefix = p
+        else:
+            path.append(f"/{n}")
+    return "".join(path)
 
 
+# Node wraps a libyang schema node. Children and keys are looked up once and kept
+# so that walking a cached Node doesn't go through libyang again.
 class Node(object):
     def __init__(self, node):
         self.node = node
+        self._name = None
+        self._children = None
+        self._children_by_name = None  # key: name, value: Node
+        self._keys = None
 
     def name(self):
-        return self.node.name()
+        if self._name == None:
+            self._name = self.node.name()
+        return self._name
 
     def children(self):
-        return [Node(v) for v in self.node.children()]
+        if self._children == None:
+            self._children = [Node(v) for v in self.node.children()]
+        return list(self._children)
+
+    def child(self, name):
+        if self._children_by_name == None:
+            children = {}
+            for v in self.children():
+                children.setdefault(v.name(), v)
+            self._children_by_name = children
+        return self._children_by_name.get(name)
 
     def type(self):
         return str(self.node.type())
@@ -27,15 +67,13 @@ class Node(object):
         return self.node.default()
 
     def keys(self):
-        keys = getattr(self.node, "keys", None)
-        if keys is not None:
-            return keys()
-        else:
-            return []
+        if self._keys == None:
+            keys = getattr(self.node, "keys", None)
+            self._keys = list(keys()) if keys is not None else []
+        return self._keys
 
     def __iter__(self):
-        for v in self.node.children():
-            yield Node(v)
+        yield from self.children()
 
 
 class Session(object):
@@ -43,6 +81,11 @@ class Session(object):
 
 
 class Connector(object):
+    def __init__(self):
+        self._node_cache_lock = threading.Lock()
+        self._node_cache = OrderedDict()  # key: schema path, value: Node
+        self._node_cache_ctx = None
+
     @property
     def type(self):
         return "base"
@@ -56,19 +99,42 @@ class Connector(object):
         fname = sys._getframe().f_code.co_name
         raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
 
+    # find_node() results are cached by the schema path (xpath without list keys).
+    # The cache is dropped when self.ctx is replaced. Connectors that modify self.ctx
+    # in place must call clear_node_cache().
+    node_cache_size = DEFAULT_NODE_CACHE_SIZE
+
+    def clear_node_cache(self):
+        with self._node_cache_lock:
+            self._node_cache = OrderedDict()
+
     def find_node(self, xpath):
         ctx = getattr(self, "ctx", None)
         if ctx == None:
             fname = sys._getframe().f_code.co_name
             raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
+        path = _schema_path(xpath)
+        with self._node_cache_lock:
+            if self._node_cache_ctx is not ctx:
+                self._node_cache_ctx = ctx
+                self._node_cache = OrderedDict()
+            cache = self._node_cache
+            if path in cache:
+                cache.move_to_end(path)
+                return cache[path]
+
         try:
-            node = [n for n in ctx.find_path(xpath)]
+            node = [n for n in ctx.find_path(path)]
         except libyang.util.LibyangError:
-            return None
-        if len(node) == 0:
-            return None
-        assert len(node) == 1
-        return Node(node[0])
+            node = []
+        assert len(node) <= 1
+        node = Node(node[0]) if node else None
+
+        with self._node_cache_lock:
+            cache[path] = node
+            while len(cache) > self.node_cache_size:
+                cache.popitem(last=False)
+        return node
 
     def save(self, model):
         fname = sys._getframe().f_code.co_name
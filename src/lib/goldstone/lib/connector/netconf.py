@@ -6,6 +6,7 @@ from .base import (
 from goldstone.lib.errors import Error
 
 import libyang
+from goldstone.lib.xpath import split as xpath_split
 import logging
 import threading
 from pathlib import Path
@@ -180,6 +181,7 @@ class Session(BaseSession):
 
 class Connector(BaseConnector):
     def __init__(self, **kwargs):
+        super().__init__()
         if "host" not in kwargs:
             raise Error("missing host option")
         schema_dir = kwargs.pop("schema_dir", None)
@@ -226,6 +228,7 @@ class Connector(BaseConnector):
                 if not m["import-only"]:
                     schema = m["schema"]
                     self.ctx.parse_module_str(schema)
+        self.clear_node_cache()
 
         for m in self.ctx:
             logger.info(
@@ -270,7 +273,7 @@ class Connector(BaseConnector):
         return "netconf"
 
     def xpath2xml(self, xpath, value=None):
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         if len(xpath) == 0:
             return None
         node = xpath[0][1]
@@ -309,7 +312,7 @@ class Connector(BaseConnector):
         try:
             return {
                 elem[0]: self._models.get(elem[0])[0]["namespace"]
-                for elem in libyang.xpath_split(xpath)
+                for elem in xpath_split(xpath)
                 if elem[0]  # elem[0] == prefix
             }
         except TypeError:  # elem[0] not exist in self._modules
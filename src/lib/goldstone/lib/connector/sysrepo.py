@@ -10,10 +10,17 @@ import sysrepo
 import libyang
 import logging
 import inspect
+import os
+import threading
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_MS = 60_000
+DEFAULT_SESSION_POOL_SIZE = int(os.getenv("GOLDSTONE_DEFAULT_SESSION_POOL_SIZE", 4))
+DEFAULT_ASYNC_WORKERS = int(os.getenv("GOLDSTONE_DEFAULT_ASYNC_WORKERS", 4))
 
 # create a map which maps sysrepo.errors and goldstone.lib.errors
 _errors = [(v, getattr(goldstone.lib.errors, v)) for v in dir(goldstone.lib.errors)]
@@ -47,10 +54,11 @@ def wrap_sysrepo_error(func):
 
 
 class Session(BaseSession):
-    def __init__(self, conn, ds):
+    def __init__(self, conn, ds, pool=None):
         self.conn = conn
         self.session = conn.conn.start_session(ds)
         self.ds = ds
+        self.pool = pool
 
     @wrap_sysrepo_error
     def get(
@@ -148,16 +156,256 @@ class Session(BaseSession):
 
             self.session.subscribe_notification(model, f"/{model}:*", f)
 
+    # a pooled session is returned to the pool instead of being stopped
     def stop(self):
-        self.session.stop()
+        if self.pool:
+            self.pool.checkin(self)
+        else:
+            self.session.stop()
 
     def rpc(self, xpath, args):
         return self.session.rpc_send(xpath, args)
 
 
+# Pool of sysrepo sessions. Starting a sysrepo session has a visible cost.
+# Short-lived users, e.g. a transaction of a translator server, check out a session with checkout()
+# and return it by calling Session.stop().
+#
+# A returned session is health-checked by discarding its pending changes. Sessions that fail the check,
+# or that exceed the pool size of the datastore, are stopped.
+#
+# sizes: maximum number of idle sessions for each datastore. key: datastore, value: size
+# It is thread-safe.
+class SessionPool(object):
+    def __init__(self, conn, sizes=None, default_size=DEFAULT_SESSION_POOL_SIZE):
+        self.conn = conn
+        self.sizes = sizes or {}
+        self.default_size = default_size
+        self._idle = {}  # key: datastore, value: list of Session
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _stat(self, ds):
+        return self._stats.setdefault(
+            ds, {"created": 0, "reused": 0, "discarded": 0, "in-use": 0}
+        )
+
+    def checkout(self, ds="running"):
+        while True:
+            with self._lock:
+                idle = self._idle.get(ds)
+                sess = idle.pop() if idle else None
+            if sess == None:
+                break
+            # the session may have been used after it was returned
+            try:
+                sess.session.discard_changes()
+            except sysrepo.SysrepoError as e:
+                logger.warning(f"discarding unhealthy {ds} session: {e}")
+                with self._lock:
+                    self._stat(ds)["discarded"] += 1
+                self._stop(sess)
+                continue
+            with self._lock:
+                stat = self._stat(ds)
+                stat["in-use"] += 1
+                stat["reused"] += 1
+            return sess
+
+        sess = Session(self.conn, ds, pool=self)
+        with self._lock:
+            stat = self._stat(ds)
+            stat["in-use"] += 1
+            stat["created"] += 1
+        return sess
+
+    def checkin(self, sess):
+        try:
+            sess.session.discard_changes()
+            healthy = True
+        except sysrepo.SysrepoError as e:
+            logger.warning(f"discarding unhealthy {sess.ds} session: {e}")
+            healthy = False
+
+        with self._lock:
+            idle = self._idle.setdefault(sess.ds, [])
+            if any(v is sess for v in idle):
+                return  # already returned
+            stat = self._stat(sess.ds)
+            stat["in-use"] -= 1
+            if healthy and len(idle) < self.sizes.get(sess.ds, self.default_size):
+                idle.append(sess)
+                return
+            stat["discarded"] += 1
+        self._stop(sess)
+
+    def _stop(self, sess):
+        try:
+            sess.session.stop()
+        except sysrepo.SysrepoError as e:
+            logger.warning(f"failed to stop {sess.ds} session: {e}")
+
+    # returns metrics for each datastore. key: datastore, value: {"idle", "in-use", "created", "reused", "discarded"}
+    def stats(self):
+        with self._lock:
+            return {
+                ds: dict(stat, idle=len(self._idle.get(ds, [])))
+                for ds, stat in self._stats.items()
+            }
+
+    # stop all idle sessions
+    def close(self):
+        with self._lock:
+            sessions = [sess for v in self._idle.values() for sess in v]
+            self._idle = {}
+        for sess in sessions:
+            self._stop(sess)
+
+
+# Session whose methods are run by the worker threads of an AsyncConnector.
+# Calls are serialized since a sysrepo session must not be used by more than one thread at a time.
+class AsyncSession(object):
+    def __init__(self, aconn, sess):
+        self.aconn = aconn
+        self.session = sess
+        self.ds = sess.ds
+        self._lock = threading.Lock()
+
+    async def _run(self, name, *args, **kwargs):
+        def f():
+            with self._lock:
+                return getattr(self.session, name)(*args, **kwargs)
+
+        return await self.aconn.run(f)
+
+    async def get(
+        self,
+        xpath,
+        default=None,
+        include_implicit_defaults=False,
+        strip=True,
+        one=False,
+    ):
+        return await self._run(
+            "get", xpath, default, include_implicit_defaults, strip, one
+        )
+
+    async def set(self, xpath, value):
+        return await self._run("set", xpath, value)
+
+    async def delete(self, xpath):
+        return await self._run("delete", xpath)
+
+    async def apply(self):
+        return await self._run("apply")
+
+    async def discard_changes(self):
+        return await self._run("discard_changes")
+
+    async def stop(self):
+        return await self._run("stop")
+
+
+# Non-blocking interface of Connector for asyncio daemons.
+# sysrepo and libyang calls are run by a dedicated thread pool so that a slow get_data() doesn't stall
+# the event loop. max_workers bounds the number of concurrent calls.
+# Each call uses its own session checked out from the session pool of the connector.
+class AsyncConnector(object):
+    def __init__(self, conn, max_workers=DEFAULT_ASYNC_WORKERS):
+        self.conn = conn
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="goldstone-connector"
+        )
+        self._running_session = None
+
+    @property
+    def type(self):
+        return self.conn.type
+
+    async def run(self, f, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(f, *args, **kwargs)
+        )
+
+    # the session is pooled. stop() returns it to the pool
+    def new_session(self, ds="running"):
+        return AsyncSession(self, self.conn.new_session(ds, pooled=True))
+
+    async def get(
+        self,
+        xpath,
+        default=None,
+        include_implicit_defaults=False,
+        strip=True,
+        one=False,
+        ds="running",
+    ):
+        if ds not in ["running", "operational", "startup"]:
+            raise Error(f"unsupported ds: {ds}")
+
+        def get():
+            sess = self.conn.new_session(ds, pooled=True)
+            try:
+                return sess.get(xpath, default, include_implicit_defaults, strip, one)
+            except sysrepo.SysrepoNotFoundError as e:
+                raise NotFoundError(e.msg) from e
+            finally:
+                sess.stop()
+
+        return await self.run(get)
+
+    async def get_operational(
+        self,
+        xpath,
+        default=None,
+        include_implicit_defaults=False,
+        strip=True,
+        one=False,
+    ):
+        return await self.get(
+            xpath, default, include_implicit_defaults, strip, one, ds="operational"
+        )
+
+    async def get_startup(self, xpath):
+        return await self.get(xpath, ds="startup")
+
+    # set(), delete() and discard_changes() edit the changes to be applied by apply(), like Connector does
+    @property
+    def running_session(self):
+        if self._running_session == None:
+            self._running_session = self.new_session()
+        return self._running_session
+
+    async def set(self, xpath, value):
+        return await self.running_session.set(xpath, value)
+
+    async def delete(self, xpath):
+        return await self.running_session.delete(xpath)
+
+    async def apply(self):
+        return await self.running_session.apply()
+
+    async def discard_changes(self):
+        return await self.running_session.discard_changes()
+
+    def find_node(self, xpath):
+        return self.conn.find_node(xpath)
+
+    # it doesn't wait for the running calls
+    def stop(self):
+        if self._running_session:
+            self._running_session.session.stop()
+            self._running_session = None
+        self.executor.shutdown(wait=False)
+
+
 class Connector(BaseConnector):
-    def __init__(self):
+    def __init__(self, pool_sizes=None):
+        super().__init__()
         self.conn = sysrepo.SysrepoConnection()
+        self.pool = SessionPool(self, pool_sizes)
+        self._aio = None
         self.running_session = self.new_session()
         self.operational_session = self.new_session("operational")
         self.startup_session = self.new_session("startup")
@@ -167,7 +415,17 @@ class Connector(BaseConnector):
     def type(self):
         return "sysrepo"
 
-    def new_session(self, ds="running"):
+    # AsyncConnector shared by the users of this connector
+    @property
+    def aio(self):
+        if self._aio == None:
+            self._aio = AsyncConnector(self)
+        return self._aio
+
+    # pooled: check out a session from self.pool. Session.stop() returns it to the pool
+    def new_session(self, ds="running", pooled=False):
+        if pooled:
+            return self.pool.checkout(ds)
         return Session(self, ds)
 
     @property
@@ -245,8 +503,12 @@ class Connector(BaseConnector):
         return self.running_session.send_notification(name, notification)
 
     def stop(self):
+        if self._aio:
+            self._aio.stop()
+        self.pool.close()
         self.running_session.stop()
         self.operational_session.stop()
         self.startup_session.stop()
+        self.clear_node_cache()
         self.conn.release_context()
         self.conn.disconnect()
@@ -1,17 +1,38 @@
-import libyang
 import logging
 import asyncio
 import os
 import time
 
 from .server_connector import create_server_connector
-from .errors import InvalArgError, InternalError, UnsupportedError
+from .batch import WriteBatch
+from .cache import OperDataCache, covers, overlaps
+from .dispatch import HandlerTable
+from .errors import Error, InvalArgError, InternalError, UnsupportedError
 from .util import call
+from .xpath import split as xpath_split, to_xpath
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_REVERT_TIMEOUT = int(os.getenv("GOLDSTONE_DEFAULT_REVERT_TIMEOUT", 6))
 
+OPER_DATA_CHANGED_EVENT = "goldstone-telemetry:oper-data-changed-event"
+TELEMETRY_MODULE = "goldstone-telemetry"
+TELEMETRY_SUBSCRIBE_REQUESTS = (
+    "/goldstone-telemetry:subscribe-requests/subscribe-request"
+)
+
+
+# path to the list entry which includes the changed node.
+# e.g. "/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']" for
+# "/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']/config/mtu".
+# changes of a list entry's config may change any operational state of the entry
+def _changed_entry(xpath):
+    elems = xpath_split(xpath)
+    for i, (_, _, keys) in enumerate(elems):
+        if keys:
+            return to_xpath(elems[: i + 1])
+    return xpath
+
 
 class ChangeHandler(object):
     def __init__(self, server, change):
@@ -26,6 +47,12 @@ class ChangeHandler(object):
             user["cache"] = cache
         return cache
 
+    # key of the resource this handler modifies. e.g. interface name, TAI module location
+    # when the server enables parallel_apply, handlers with different keys are applied concurrently.
+    # None means that the handler may modify any resource.
+    def resource_key(self):
+        return None
+
     def validate(self, user):
         pass
 
@@ -40,12 +67,25 @@ NoOp = ChangeHandler
 
 
 class ServerBase(object):
-    def __init__(self, conn, module, revert_timeout=DEFAULT_REVERT_TIMEOUT):
+    def __init__(
+        self,
+        conn,
+        module,
+        revert_timeout=DEFAULT_REVERT_TIMEOUT,
+        oper_cache_ttls=None,
+        parallel_apply=False,
+    ):
         self.conn = create_server_connector(conn, module)
         self.handlers = {}
+        self.handler_table = None
+        self.oper_cache = OperDataCache(oper_cache_ttls)
+        self._oper_inflight = {}  # key: xpath, value: oper_cb() task
         self._current_handlers = None  # (req_id, handlers, user)
+        # paths of ON_CHANGE telemetry subscriptions. notify_oper_data_changed() sends notifications only for them
+        self._on_change_paths = []
         self._stop_event = asyncio.Event()
         self.revert_timeout = revert_timeout
+        self.parallel_apply = parallel_apply
         self.lock = asyncio.Lock()
 
     def get_running_data(
@@ -68,21 +108,45 @@ class ServerBase(object):
             include_implicit_defaults=include_implicit_defaults,
         )
 
-    def get_handler(self, xpath):
-        xpath = libyang.xpath_split(xpath)
-        cursor = self.handlers
-        for x in xpath:
-            v = cursor.get(x[1])
-            if v == None:
-                return None
-            if type(v) == type and issubclass(v, ChangeHandler):
-                return v
-            cursor = v
-        return NoOp
+    # non-blocking versions of get_running_data() and get_operational_data().
+    # the data is read by a worker thread so that other callbacks can run while waiting for sysrepo
+    async def get_running_data_async(
+        self, xpath, default=None, strip=True, include_implicit_defaults=False
+    ):
+        return await self.conn.get_async(
+            xpath,
+            default=default,
+            strip=strip,
+            include_implicit_defaults=include_implicit_defaults,
+        )
+
+    async def get_operational_data_async(
+        self, xpath, default=None, strip=True, include_implicit_defaults=False
+    ):
+        return await self.conn.get_operational_async(
+            xpath,
+            default=default,
+            strip=strip,
+            include_implicit_defaults=include_implicit_defaults,
+        )
+
+    # compile self.handlers into self.handler_table.
+    # call this again when you modify self.handlers after start()
+    def compile_handlers(self):
+        self.handler_table = HandlerTable(self.handlers, NoOp)
+        logger.debug(f"handler table:\n{self.handler_table.dump()}")
+
+    # memo: dict to cache resolved handlers by schema path. change_cb() uses one for each transaction
+    def get_handler(self, xpath, memo=None):
+        if self.handler_table == None or self.handler_table.source is not self.handlers:
+            self.compile_handlers()
+        return self.handler_table.lookup(xpath, memo)
 
     async def start(self):
+        self.compile_handlers()
         self.conn.subscribe_module_change(self.change_cb)
         self.conn.subscribe_oper_data_request(self._oper_cb)
+        self.watch_telemetry_subscriptions()
 
         return [self._stop_event.wait()]
 
@@ -145,9 +209,16 @@ class ServerBase(object):
                     raise InternalError("fatal error happened")
 
                 if event == "abort":
+                    await self.revert_batch(user["batch"])
                     for done in reversed(handlers):
                         await call(done.revert, user)
                 self._current_handlers = None
+                if event == "done":
+                    self.notify_oper_data_changed(
+                        [_changed_entry(change.xpath) for change in user["changes"]]
+                    )
+                else:
+                    self.invalidate_oper_cache()
                 return
 
             if self._current_handlers != None:
@@ -158,12 +229,13 @@ class ServerBase(object):
 
             handlers = []
 
-            user = {"changes": changes}
+            user = {"changes": changes, "batch": WriteBatch()}
 
             await call(self.pre, user)
 
+            memo = {}
             for change in changes:
-                cls = self.get_handler(change.xpath)
+                cls = self.get_handler(change.xpath, memo)
                 if not cls:
                     if change.type == "deleted":
                         continue
@@ -179,41 +251,232 @@ class ServerBase(object):
                 await call(h.validate, user)
                 handlers.append(h)
 
-            for i, handler in enumerate(handlers):
-                try:
-                    await call(handler.apply, user)
-                except Exception as e:
-                    for done in reversed(handlers[:i]):
-                        await call(done.revert, user)
-                    raise e
+            try:
+                if self.parallel_apply:
+                    await self.apply_parallel(handlers, user)
+                else:
+                    for i, handler in enumerate(handlers):
+                        try:
+                            await call(handler.apply, user)
+                        except Exception as e:
+                            for done in reversed(handlers[:i]):
+                                await call(done.revert, user)
+                            raise e
+            except Exception as e:
+                # writes flushed by flush_pending() during apply
+                await self.revert_batch(user["batch"])
+                raise e
+
+            try:
+                await self.flush_batch(user["batch"])
+            except Exception as e:
+                for done in reversed(handlers):
+                    await call(done.revert, user)
+                raise e
 
             await call(self.post, user)
 
             async def do_revert():
                 await asyncio.sleep(self.revert_timeout)
                 logging.warning("client timeout happens? reverting changes we made")
+                await self.revert_batch(user["batch"])
                 for done in reversed(handlers):
                     await call(done.revert, user)
                 self._current_handlers = None
+                self.invalidate_oper_cache()
 
             revert_task = asyncio.create_task(do_revert())
             self._current_handlers = (req_id, handlers, user, revert_task)
 
+    # Handlers are grouped by ChangeHandler.resource_key(). Handlers in a group are applied in order and groups are
+    # applied concurrently. A handler without a resource key works as a barrier; it is applied alone after all the
+    # preceding handlers are applied. NoOp handlers, e.g. the ones for list keys, do nothing and are left out.
+    #
+    # If any handler fails, the handlers applied so far are reverted in the reverse order of the changes after the
+    # running groups finish, then the first error is raised.
+    #
+    # All groups share the same user dict. apply() and revert() of handlers with different resource keys must not
+    # modify the same entries of it; add backend writes to user["batch"] and keep other scratch state, which is
+    # usually built in validate(), read-only.
+    async def apply_parallel(self, handlers, user):
+        stages = []
+        groups = {}
+        for i, handler in enumerate(handlers):
+            if type(handler) == NoOp:
+                continue
+            key = handler.resource_key()
+            if key == None:
+                if groups:
+                    stages.append(list(groups.values()))
+                    groups = {}
+                stages.append([[i]])
+            else:
+                groups.setdefault(key, []).append(i)
+        if groups:
+            stages.append(list(groups.values()))
+
+        applied = []
+
+        async def apply_group(group):
+            for i in group:
+                await call(handlers[i].apply, user)
+                applied.append(i)
+
+        for stage in stages:
+            logger.debug(f"applying {len(stage)} groups concurrently")
+            results = await asyncio.gather(
+                *(apply_group(group) for group in stage), return_exceptions=True
+            )
+            errors = [e for e in results if isinstance(e, BaseException)]
+            if errors:
+                for i in sorted(applied, reverse=True):
+                    await call(handlers[i].revert, user)
+                raise errors[0]
+
+    # Write the backend writes handlers added to user["batch"] with flush(), once for each target.
+    # See goldstone.lib.batch. Targets are flushed concurrently when parallel_apply is enabled.
+    # If flush() fails, the targets flushed so far are reverted and the first error is raised.
+    async def flush_batch(self, batch):
+        async def flush(target, writes):
+            logger.debug(f"flushing {len(writes)} writes to {target}")
+            original = await call(self.flush, target, writes)
+            batch.flushed.append((target, original))
+
+        targets = batch.take()
+        errors = []
+        if self.parallel_apply:
+            results = await asyncio.gather(
+                *(flush(*v) for v in targets), return_exceptions=True
+            )
+            errors = [e for e in results if isinstance(e, BaseException)]
+        else:
+            for v in targets:
+                try:
+                    await flush(*v)
+                except Exception as e:
+                    errors.append(e)
+                    break
+
+        if errors:
+            await self.revert_batch(batch)
+            raise errors[0]
+
+    # flush the writes added to user["batch"] so far.
+    # handlers call this before writing to the backend directly, or before a write which depends on the writes of the
+    # preceding changes, so that the writes reach the backend in the order of the changes
+    async def flush_pending(self, user):
+        await self.flush_batch(user["batch"])
+
+    # write back the original values of the flushed targets
+    async def revert_batch(self, batch):
+        for target, original in reversed(batch.flushed):
+            if original:
+                logger.warning(f"reverting {len(original)} writes to {target}")
+                await call(self.flush, target, original)
+        batch.flushed = []
+
+    # write the writes ([(key, value)]) to the target and return the original values ([(key, value)]).
+    # servers whose handlers add writes to user["batch"] must implement this.
+    # return None if the writes can't be reverted.
+    def flush(self, target, writes):
+        raise UnsupportedError(f"flush to {target} not supported")
+
     def pre(self, user):
         pass
 
     def post(self, user):
         pass
 
+    # Concurrent requests for the same xpath, or for an xpath covered by an in-flight request, share the result of
+    # one oper_cb() call instead of fetching the same data from the device again (single-flight).
+    # The shared task is shielded so that cancellation of one requester doesn't affect the others.
     async def _oper_cb(self, xpath, priv):
         logger.debug(f"xpath: {xpath}")
+        hit, data = self.oper_cache.get(xpath)
+        if hit:
+            logger.debug(f"xpath: {xpath}, oper cache hit")
+            return data
+
+        for k, task in self._oper_inflight.items():
+            if covers(k, xpath):
+                logger.debug(f"xpath: {xpath}, waiting in-flight request for {k}")
+                return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._fetch_oper_data(xpath, priv))
+        self._oper_inflight[xpath] = task
+
+        def done(_):
+            if self._oper_inflight.get(xpath) is task:
+                del self._oper_inflight[xpath]
+
+        task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+    async def _fetch_oper_data(self, xpath, priv):
         time_start = time.perf_counter_ns()
         data = await call(self.oper_cb, xpath, priv)
         time_end = time.perf_counter_ns()
         elapsed = (time_end - time_start) / 1000_1000_10
         logger.debug(f"xpath: {xpath}, elapsed: {elapsed}sec")
+        # don't cache the result when the data was invalidated while oper_cb() was running
+        if self._oper_inflight.get(xpath) is asyncio.current_task():
+            self.oper_cache.set(xpath, data)
         return data
 
+    # daemons call this when they get notified that the operational state under xpath has changed.
+    # xpath=None drops all cached data
+    def invalidate_oper_cache(self, xpath=None):
+        self.oper_cache.invalidate(xpath)
+        # requests arriving after the change must not join in-flight requests started before it
+        for k in [
+            k for k in self._oper_inflight if xpath is None or overlaps(k, xpath)
+        ]:
+            del self._oper_inflight[k]
+
+    # keep track of the paths of ON_CHANGE telemetry subscriptions so that notify_oper_data_changed() sends
+    # notifications only when someone is interested in the data. the paths are empty when goldstone-telemetry is
+    # not installed
+    def watch_telemetry_subscriptions(self):
+        try:
+            self.conn.subscribe_config_change(
+                TELEMETRY_MODULE, self._telemetry_config_cb
+            )
+        except Error as e:
+            logger.info(f"not watching telemetry subscriptions: {e}")
+            return
+        self._update_on_change_paths()
+
+    async def _telemetry_config_cb(self, event, req_id, changes, priv):
+        self._update_on_change_paths()
+
+    def _update_on_change_paths(self):
+        paths = []
+        for request in self.get_running_data(TELEMETRY_SUBSCRIBE_REQUESTS, []):
+            subscriptions = request.get("subscriptions", {}).get("subscription", [])
+            for subscription in subscriptions:
+                config = subscription.get("config", {})
+                if config.get("mode") == "ON_CHANGE" and "path" in config:
+                    paths.append(config["path"])
+        logger.debug(f"ON_CHANGE telemetry subscriptions: {paths}")
+        self._on_change_paths = paths
+
+    # daemons call this when they know that the operational state under the xpaths has changed.
+    # in addition to dropping the cached data, it tells the streaming telemetry server to sample the data for
+    # ON_CHANGE subscriptions. pass the narrowest xpaths known to have changed, e.g. the changed list entries.
+    # nothing is sent for the xpaths no ON_CHANGE subscription is interested in
+    def notify_oper_data_changed(self, xpaths):
+        if isinstance(xpaths, str):
+            xpaths = [xpaths]
+        xpaths = [x for x in xpaths if not any(y != x and covers(y, x) for y in xpaths)]
+        for xpath in dict.fromkeys(xpaths):
+            self.invalidate_oper_cache(xpath)
+            if not any(overlaps(p, xpath) for p in self._on_change_paths):
+                continue
+            try:
+                self.send_notification(OPER_DATA_CHANGED_EVENT, {"path": xpath})
+            except Error as e:
+                logger.warning(f"failed to send {OPER_DATA_CHANGED_EVENT}: {e}")
+
     def oper_cb(self, xpath, priv):
         pass
 
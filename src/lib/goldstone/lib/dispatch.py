@@ -0,0 +1,122 @@
+"""Change handler dispatch table for ServerBase.
+
+ServerBase.handlers is a nested dict which maps a schema path to a ChangeHandler class. e.g.
+
+    {
+        "interfaces": {
+            "interface": {
+                "name": NoOp,
+                "config": {"admin-status": AdminStatusHandler},
+            }
+        }
+    }
+
+HandlerTable compiles it into a trie of interned node names and resolves the handler of a changed xpath without
+parsing the xpath with libyang.xpath_split(). A change for an xpath that ends at an intermediate node gets the default
+handler. A change for an xpath whose node is not in the table gets None. A handler registered for an intermediate node
+handles all changes under the node.
+
+Changes in one transaction often share the same schema path (e.g. admin-status of all interfaces). Passing a dict as
+memo to lookup() resolves each schema path only once.
+"""
+
+import sys
+
+from .xpath import schema_path
+
+
+def schema_nodes(path):
+    """Split a schema path into node names without module prefixes.
+
+    Args:
+        path (str): Schema path. e.g. "/goldstone-interfaces:interfaces/interface/config/name"
+
+    Returns:
+        list: Node names. e.g. ["interfaces", "interface", "config", "name"]
+    """
+    return [n.rpartition(":")[2] for n in path.split("/") if n]
+
+
+class HandlerTable:
+    """Compiled ServerBase.handlers.
+
+    Args:
+        handlers (dict): Nested dict of handlers. A value is a dict for an intermediate node, otherwise a handler.
+        default (any): Handler for changes which end at an intermediate node.
+
+    Attributes:
+        source (dict): handlers the table was compiled from.
+        default (any): Handler for changes which end at an intermediate node.
+    """
+
+    def __init__(self, handlers, default=None):
+        self.source = handlers
+        self.default = default
+        self._root = self._compile(handlers)
+
+    def _compile(self, handlers):
+        node = {}
+        for name, v in handlers.items():
+            name = sys.intern(name)
+            node[name] = self._compile(v) if isinstance(v, dict) else v
+        return node
+
+    def lookup(self, xpath, memo=None):
+        """Resolve the handler for a changed xpath.
+
+        Args:
+            xpath (str): Changed xpath.
+            memo (dict): Resolved handlers by schema path. lookup() reads and updates it if given.
+
+        Returns:
+            any: Handler. None if the xpath is not supported.
+        """
+        path = schema_path(xpath)
+        if memo is not None:
+            try:
+                return memo[path]
+            except KeyError:
+                pass
+        cursor = self._root
+        for name in schema_nodes(path):
+            v = cursor.get(name)
+            if v is None or not isinstance(v, dict):
+                break
+            cursor = v
+        else:
+            v = self.default
+        if memo is not None:
+            memo[path] = v
+        return v
+
+    def entries(self):
+        """List handlers in the table.
+
+        Returns:
+            list: (schema path, handler) tuples in depth-first order. Intermediate nodes are not included.
+        """
+        ret = []
+
+        def walk(node, prefix):
+            for name, v in node.items():
+                path = f"{prefix}/{name}"
+                if isinstance(v, dict):
+                    walk(v, path)
+                else:
+                    ret.append((path, v))
+
+        walk(self._root, "")
+        return ret
+
+    def dump(self):
+        """Format the table for debugging.
+
+        Returns:
+            str: One "<schema path>: <handler>" line per handler.
+        """
+        return "\n".join(
+            f"{path}: {getattr(v, '__name__', v)}" for path, v in self.entries()
+        )
+
+    def __len__(self):
+        return len(self.entries())
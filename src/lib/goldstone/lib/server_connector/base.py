@@ -16,6 +16,10 @@ class ServerConnector(object):
         fname = sys._getframe().f_code.co_name
         raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
 
+    def subscribe_config_change(self, module, cb):
+        fname = sys._getframe().f_code.co_name
+        raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
+
     def subscribe_oper_data_request(self, name, oper_cb):
         fname = sys._getframe().f_code.co_name
         raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
@@ -1,11 +1,20 @@
+import os
+import copy
 import json
 import inspect
+import logging
 import sysrepo
 
 from .base import ServerConnector as BaseServerConnector
 import goldstone.lib.errors
 from goldstone.lib.errors import *
 
+logger = logging.getLogger(__name__)
+
+VERIFY_CONFIG_CACHE = (
+    os.getenv("GOLDSTONE_VERIFY_CONFIG_CACHE", "false").lower() == "true"
+)
+
 
 class Change:
     def __init__(self, change):
@@ -43,10 +52,34 @@ def convert2sysrepo(e):
     return sysrepo.SysrepoError(e.msg)
 
 
+def _normalize(data):
+    if isinstance(data, dict):
+        return {k: _normalize(v) for k, v in data.items()}
+    if isinstance(data, list):
+        v = [_normalize(d) for d in data]
+        return sorted(v, key=lambda d: json.dumps(d, sort_keys=True))
+    return data
+
+
+# returns the paths where a and b differ
+def _diff(a, b, path=""):
+    if isinstance(a, dict) and isinstance(b, dict):
+        ret = []
+        for k in sorted(set(a) | set(b), key=str):
+            ret += _diff(a.get(k), b.get(k), f"{path}/{k}")
+        return ret
+    return [] if a == b else [path]
+
+
 class ServerConnector(BaseServerConnector):
-    def __init__(self, conn, module):
+    def __init__(self, conn, module, verify_config_cache=VERIFY_CONFIG_CACHE):
         self.conn = conn
         self.session = conn.new_session("running")
+        # running config of the module, maintained from the changes of the committed transactions
+        self.config_cache = None
+        # changes of the transaction being processed
+        self._pending_changes = None
+        self.verify_config_cache = verify_config_cache
 
         m = self.conn.get_module(module)
         v = [n.name() for n in m if n.keyword() == "container"]
@@ -65,6 +98,13 @@ class ServerConnector(BaseServerConnector):
     def get_operational(self, *args, **kwargs):
         return self.conn.get_operational(*args, **kwargs)
 
+    # non-blocking versions of get() and get_operational(). see goldstone.lib.connector.sysrepo.AsyncConnector
+    async def get_async(self, *args, **kwargs):
+        return await self.conn.aio.get(*args, **kwargs)
+
+    async def get_operational_async(self, *args, **kwargs):
+        return await self.conn.aio.get_operational(*args, **kwargs)
+
     def send_notification(self, name: str, notification: dict):
         return self.session.send_notification(name, notification)
 
@@ -77,11 +117,34 @@ class ServerConnector(BaseServerConnector):
         )
 
     async def _change_cb(self, event, req_id, changes, priv):
+        if event == "change":
+            self._pending_changes = changes
+        elif event == "done":
+            self._commit_config_cache()
+        elif event == "abort":
+            self._pending_changes = None
+
         try:
             await self.change_cb(event, req_id, [Change(c) for c in changes], priv)
         except Error as e:
             raise convert2sysrepo(e) from None
 
+    # watch the committed changes of another module, e.g. the configuration of goldstone-telemetry.
+    # cb is called after the changes are applied with the same arguments as change_cb
+    def subscribe_config_change(self, module, cb):
+        asyncio_register = inspect.iscoroutinefunction(cb)
+        try:
+            self.session.session.subscribe_module_change(
+                module,
+                None,
+                cb,
+                passive=True,
+                done_only=True,
+                asyncio_register=asyncio_register,
+            )
+        except sysrepo.SysrepoError as e:
+            raise NotFoundError(f"failed to subscribe {module}: {e}") from None
+
     def subscribe_oper_data_request(self, oper_cb):
         asyncio_register = inspect.iscoroutinefunction(oper_cb)
         self.session.session.subscribe_oper_data_request(
@@ -92,16 +155,62 @@ class ServerConnector(BaseServerConnector):
             asyncio_register=asyncio_register,
         )
 
-    def get_config_cache(self, changes):
-        cache = self.get(
+    def _read_config(self):
+        return self.get(
             self.top,
             default={},
             strip=False,
             include_implicit_defaults=True,
         )
-        sysrepo.update_config_cache(cache, [c._raw for c in changes])
+
+    def _commit_config_cache(self):
+        changes = self._pending_changes
+        self._pending_changes = None
+        if self.config_cache == None or changes == None:
+            return
+        # implicit defaults reappear when nodes are deleted, which the changes don't tell. read the config again
+        if any(isinstance(c, sysrepo.ChangeDeleted) for c in changes):
+            self.config_cache = None
+            return
+        try:
+            sysrepo.update_config_cache(self.config_cache, changes)
+        except Exception as e:
+            logger.warning(f"failed to update config cache: {e}. resynchronizing")
+            self.config_cache = None
+
+    # The running config is read only once. After that, the cache is kept up to date with the changes of committed
+    # transactions, and read again after a transaction which deletes nodes or when the changes can't be applied.
+    # Each call returns a copy with the given changes applied, so callers may modify it.
+    # With verify_config_cache, the cache is compared with the running datastore every time and resynchronized when
+    # they diverge. The unit tests enable it.
+    def get_config_cache(self, changes):
+        if self.config_cache == None:
+            self.config_cache = self._read_config()
+        elif self.verify_config_cache:
+            running = self._read_config()
+            diff = _diff(_normalize(self.config_cache), _normalize(running))
+            if diff:
+                logger.warning(
+                    f"config cache diverged from the running datastore: {diff}. resynchronizing"
+                )
+                self.config_cache = running
+
+        cache = copy.deepcopy(self.config_cache)
+        try:
+            sysrepo.update_config_cache(cache, [c._raw for c in changes])
+        except Exception as e:
+            logger.warning(
+                f"failed to apply changes to config cache: {e}. resynchronizing"
+            )
+            self.config_cache = self._read_config()
+            cache = copy.deepcopy(self.config_cache)
+            sysrepo.update_config_cache(cache, [c._raw for c in changes])
         return cache
 
+    # drop the config cache. it will be read from the running datastore again when needed
+    def resync_config_cache(self):
+        self.config_cache = None
+
     def subscribe_notification(self, module, xpath, cb, priv=None):
         asyncio_register = inspect.iscoroutinefunction(cb)
         return self.session.session.subscribe_notification(
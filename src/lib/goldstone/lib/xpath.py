@@ -0,0 +1,85 @@
+"""Memoised xpath parsing.
+
+Daemons parse the same xpaths again and again: every change of a transaction, every oper_cb() request and every
+telemetry sample goes through libyang.xpath_split(). The set of distinct xpaths a daemon sees is small, so split()
+keeps the parsed result in an LRU cache. The result is immutable so that it can be shared by all callers.
+
+    >>> split("/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']/config")
+    (('goldstone-interfaces', 'interfaces', ()), (None, 'interface', (('name', 'Ethernet1_1'),)), (None, 'config', ()))
+
+The cache size is configured by GOLDSTONE_DEFAULT_XPATH_CACHE_SIZE.
+"""
+
+import os
+import re
+import functools
+import libyang
+
+
+DEFAULT_XPATH_CACHE_SIZE = int(os.getenv("GOLDSTONE_DEFAULT_XPATH_CACHE_SIZE", 4096))
+
+# list keys, e.g. [name='Ethernet1_1'], [name="it's"]
+_PREDICATE = re.compile(r"\[(?:[^\]'\"]|'[^']*'|\"[^\"]*\")*\]")
+
+
+@functools.lru_cache(maxsize=DEFAULT_XPATH_CACHE_SIZE)
+def split(xpath):
+    """Parse an xpath.
+
+    Args:
+        xpath (str): Xpath to parse.
+
+    Returns:
+        tuple: (prefix, name, keys) tuples. prefix is None when the node has no module prefix. keys is a tuple of
+            (key, value) tuples.
+    """
+    return tuple(
+        (prefix, name, tuple(tuple(kv) for kv in keys))
+        for prefix, name, keys in libyang.xpath_split(xpath)
+    )
+
+
+def _quote(value):
+    if "'" in value:
+        return f'"{value}"'
+    return f"'{value}'"
+
+
+def to_xpath(elems):
+    """Build an xpath from parsed nodes.
+
+    Args:
+        elems (iterable): (prefix, name, keys) tuples as returned by split().
+
+    Returns:
+        str: Xpath.
+    """
+    xpath = []
+    for prefix, name, keys in elems:
+        xpath.append(f"/{prefix}:{name}" if prefix else f"/{name}")
+        for k, v in keys:
+            xpath.append(f"[{k}={_quote(v)}]")
+    return "".join(xpath)
+
+
+def schema_path(xpath):
+    """Strip list keys from an xpath.
+
+    Args:
+        xpath (str): Data path. e.g. "/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']/config/name"
+
+    Returns:
+        str: Schema path. e.g. "/goldstone-interfaces:interfaces/interface/config/name"
+    """
+    if "[" not in xpath:
+        return xpath
+    return _PREDICATE.sub("", xpath)
+
+
+def cache_info():
+    """Get statistics of the parse cache.
+
+    Returns:
+        functools._CacheInfo: hits, misses, maxsize and currsize.
+    """
+    return split.cache_info()
@@ -0,0 +1,102 @@
+"""Benchmark of ServerBase.get_handler().
+
+Compares the compiled HandlerTable with the nested dict walk it replaced, for a transaction which configures 128
+interfaces.
+
+    cd src/lib && python -m tests.bench_dispatch
+"""
+
+import logging
+import timeit
+import libyang
+
+from goldstone.lib.core import ChangeHandler, NoOp
+from goldstone.lib.dispatch import HandlerTable
+
+logger = logging.getLogger(__name__)
+
+
+class Handler(ChangeHandler):
+    pass
+
+
+HANDLERS = {
+    "interfaces": {
+        "interface": {
+            "name": NoOp,
+            "config": {
+                "name": NoOp,
+                "admin-status": Handler,
+                "description": Handler,
+                "loopback-mode": Handler,
+                "prbs-mode": Handler,
+            },
+            "ethernet": {
+                "config": {"mtu": Handler, "fec": Handler},
+                "auto-negotiate": {"config": {"enabled": Handler}},
+            },
+        }
+    }
+}
+
+LEAVES = [
+    "name",
+    "config/name",
+    "config/admin-status",
+    "config/description",
+    "config/loopback-mode",
+    "config/prbs-mode",
+    "ethernet/config/mtu",
+    "ethernet/config/fec",
+    "ethernet/auto-negotiate/config/enabled",
+]
+
+XPATHS = [
+    f"/goldstone-interfaces:interfaces/interface[name='Ethernet{i}_1']/{leaf}"
+    for i in range(1, 129)
+    for leaf in LEAVES
+]
+
+
+def dict_walk(xpath):
+    xpath = libyang.xpath_split(xpath)
+    cursor = HANDLERS
+    for x in xpath:
+        v = cursor.get(x[1])
+        if v == None:
+            return None
+        if type(v) == type and issubclass(v, ChangeHandler):
+            return v
+        cursor = v
+    return NoOp
+
+
+def main():
+    table = HandlerTable(HANDLERS, NoOp)
+
+    for xpath in XPATHS:
+        assert table.lookup(xpath) == dict_walk(xpath), xpath
+
+    def transaction(f):
+        def t():
+            memo = {}
+            for xpath in XPATHS:
+                f(xpath, memo)
+
+        return t
+
+    n = 20
+    results = {
+        "dict walk": transaction(lambda xpath, memo: dict_walk(xpath)),
+        "table": transaction(lambda xpath, memo: table.lookup(xpath)),
+        "table + memo": transaction(table.lookup),
+    }
+    logger.info(f"{len(XPATHS)} changes per transaction, {n} transactions")
+    for name, f in results.items():
+        elapsed = min(timeit.repeat(f, number=n, repeat=3)) / n
+        logger.info(f"{name:>14}: {elapsed * 1000:.3f} msec/transaction")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of goldstone.lib.xpath.split().
+
+Compares the memoised parser with libyang.xpath_split() for the changes of a transaction which configures 128
+interfaces, parsed repeatedly as the handlers of the transaction do.
+
+    cd src/lib && python -m tests.bench_xpath
+"""
+
+import logging
+import timeit
+import libyang
+
+from goldstone.lib.xpath import split
+
+logger = logging.getLogger(__name__)
+
+
+LEAVES = [
+    "name",
+    "config/name",
+    "config/admin-status",
+    "config/description",
+    "ethernet/config/mtu",
+    "ethernet/auto-negotiate/config/enabled",
+]
+
+XPATHS = [
+    f"/goldstone-interfaces:interfaces/interface[name='Ethernet{i}_1']/{leaf}"
+    for i in range(1, 129)
+    for leaf in LEAVES
+]
+
+
+def main():
+    for xpath in XPATHS:
+        assert split(xpath) == tuple(
+            (p, n, tuple(k)) for p, n, k in libyang.xpath_split(xpath)
+        ), xpath
+
+    def transaction(f):
+        def t():
+            for xpath in XPATHS:
+                f(xpath)
+
+        return t
+
+    n = 20
+    results = {
+        "xpath_split": transaction(lambda xpath: list(libyang.xpath_split(xpath))),
+        "split": transaction(split),
+    }
+    logger.info(f"{len(XPATHS)} xpaths per transaction, {n} transactions")
+    for name, f in results.items():
+        elapsed = min(timeit.repeat(f, number=n, repeat=3)) / n
+        logger.info(
+            f"{name:>12}: {elapsed * 1000:.3f} msec/transaction, {len(XPATHS) / elapsed:.0f} xpaths/sec"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
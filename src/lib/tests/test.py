@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 
 import logging
+import asyncio
 from goldstone.lib.connector.sysrepo import Connector as SRConnector, wrap_sysrepo_error
 
 from goldstone.lib.errors import *
@@ -62,6 +63,53 @@ class TestSysrepoConnector(unittest.TestCase):
         test(["SPEED_10G"])
         test(["SPEED_40G", "SPEED_100G"])
 
+    def test_session_pool(self):
+        conn = SRConnector(pool_sizes={"running": 1})
+        conn.delete_all("goldstone-interfaces")
+        conn.apply()
+        prefix = "/goldstone-interfaces:interfaces/interface[name='pool0']"
+
+        a = conn.new_session(pooled=True)
+        b = conn.new_session(pooled=True)
+        a.set(prefix + "/config/name", "pool0")
+        a.stop()
+        b.stop()
+        self.assertEqual(
+            conn.pool.stats()["running"],
+            {"created": 2, "reused": 0, "discarded": 1, "in-use": 0, "idle": 1},
+        )
+
+        # returned session is reused without the pending changes
+        c = conn.new_session(pooled=True)
+        self.assertIs(c, a)
+        c.apply()
+        self.assertEqual(conn.get(prefix + "/config/name"), None)
+        c.stop()
+        self.assertEqual(conn.pool.stats()["running"]["reused"], 1)
+
+        conn.stop()
+
+    def test_async_connector(self):
+        conn = SRConnector()
+        conn.delete_all("goldstone-interfaces")
+        conn.apply()
+        prefix = "/goldstone-interfaces:interfaces/interface[name='async0']"
+
+        async def test():
+            aconn = conn.aio
+            await aconn.set(prefix + "/config/name", "async0")
+            await aconn.set(prefix + "/config/admin-status", "UP")
+            await aconn.apply()
+            results = await asyncio.gather(
+                *(aconn.get(prefix + "/config/admin-status") for _ in range(8))
+            )
+            self.assertEqual(results, ["UP"] * 8)
+            self.assertEqual(await aconn.get(prefix + "/config/mtu", 1500), 1500)
+
+        asyncio.run(test())
+        self.assertEqual(conn.get(prefix + "/config/admin-status"), "UP")
+        conn.stop()
+
 
 class TestCLI(unittest.TestCase):
     def test_sysrepo_connector_notification(self):
@@ -0,0 +1,55 @@
+import unittest
+
+from goldstone.lib.batch import WriteBatch
+
+
+class TestWriteBatch(unittest.TestCase):
+    def test_add(self):
+        batch = WriteBatch()
+        batch.add("CONFIG_DB", ("PORT|Ethernet1_1", "mtu"), "9000")
+        batch.add("CONFIG_DB", ("PORT|Ethernet2_1", "mtu"), "9000")
+        batch.add("APPL_DB", ("PORT_TABLE:Ethernet1_1", "mtu"), "9000")
+        # later write overwrites the value
+        batch.add("CONFIG_DB", ("PORT|Ethernet1_1", "mtu"), "1500")
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(
+            batch.targets(),
+            [
+                (
+                    "CONFIG_DB",
+                    [
+                        (("PORT|Ethernet2_1", "mtu"), "9000"),
+                        (("PORT|Ethernet1_1", "mtu"), "1500"),
+                    ],
+                ),
+                ("APPL_DB", [(("PORT_TABLE:Ethernet1_1", "mtu"), "9000")]),
+            ],
+        )
+        batch.clear()
+        self.assertEqual(len(batch), 0)
+
+    def test_take(self):
+        batch = WriteBatch()
+        batch.add("CONFIG_DB", ("PORT|Ethernet1_1", "mtu"), "9000")
+        self.assertEqual(
+            batch.take(), [("CONFIG_DB", [(("PORT|Ethernet1_1", "mtu"), "9000")])]
+        )
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.take(), [])
+
+    def test_target_id(self):
+        class Obj:
+            def __init__(self, oid):
+                self.oid = oid
+
+        a, b = Obj(1), Obj(1)
+        batch = WriteBatch()
+        batch.add(a, "admin-status", "up", target_id=a.oid)
+        batch.add(b, "tx-dis", "false", target_id=b.oid)
+        self.assertEqual(
+            batch.targets(), [(a, [("admin-status", "up"), ("tx-dis", "false")])]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
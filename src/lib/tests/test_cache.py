@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+from goldstone.lib.cache import OperDataCache, overlaps, covers
+
+
+IF = "/goldstone-interfaces:interfaces/interface"
+
+
+class TestOperDataCache(unittest.TestCase):
+    def test_disabled_by_default(self):
+        cache = OperDataCache()
+        cache.set(IF, {"foo": "bar"})
+        self.assertEqual(cache.get(IF), (False, None))
+
+    def test_ttl(self):
+        cache = OperDataCache(
+            {
+                "/goldstone-interfaces:interfaces": 10,
+                IF + "/state/counters": 1,
+            }
+        )
+        self.assertEqual(cache.ttl(IF + "[name='Ethernet1_1']/config"), 10)
+        self.assertEqual(cache.ttl(IF + "[name='Ethernet1_1']/state/counters"), 1)
+        # the requested subtree includes counters
+        self.assertEqual(cache.ttl(IF + "[name='Ethernet1_1']"), 1)
+        self.assertEqual(cache.ttl("/goldstone-interfaces:*"), 1)
+        self.assertEqual(cache.ttl("/goldstone-transponder:modules"), 0)
+
+    def test_expire(self):
+        cache = OperDataCache({"/goldstone-interfaces:interfaces": 1})
+        with mock.patch("time.monotonic", return_value=100.0):
+            cache.set(IF, {"foo": "bar"})
+            self.assertEqual(cache.get(IF), (True, {"foo": "bar"}))
+        with mock.patch("time.monotonic", return_value=101.5):
+            self.assertEqual(cache.get(IF), (False, None))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru(self):
+        cache = OperDataCache({"/goldstone-interfaces:interfaces": 10}, maxsize=2)
+        for i in range(3):
+            cache.set(f"{IF}[name='Ethernet{i}_1']", i)
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.get(f"{IF}[name='Ethernet0_1']")[0])
+        self.assertTrue(cache.get(f"{IF}[name='Ethernet1_1']")[0])
+
+    def test_invalidate(self):
+        cache = OperDataCache({"/goldstone-interfaces:interfaces": 10})
+        xpaths = [
+            "/goldstone-interfaces:interfaces",
+            IF,
+            IF + "[name='Ethernet1_1']/state",
+            IF + "[name='Ethernet2_1']/state",
+        ]
+        for xpath in xpaths:
+            cache.set(xpath, xpath)
+        cache.invalidate(IF + "[name='Ethernet1_1']")
+        self.assertEqual([cache.get(x)[0] for x in xpaths], [False, False, False, True])
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_overlaps(self):
+        self.assertTrue(overlaps("/goldstone-interfaces:*", IF + "[name='1']"))
+        self.assertTrue(overlaps(IF, IF + "[name='1']/state"))
+        self.assertFalse(overlaps(IF + "[name='1']", IF + "[name='2']"))
+        self.assertFalse(overlaps(IF, "/goldstone-transponder:modules"))
+        self.assertFalse(overlaps(IF + "/config", IF + "/state"))
+
+    def test_covers(self):
+        self.assertTrue(covers(IF, IF))
+        self.assertTrue(covers(IF, IF + "[name='1']/state"))
+        self.assertTrue(covers(IF + "[name='1']", IF + "[name='1']/state"))
+        self.assertTrue(covers("/goldstone-interfaces:*", IF + "[name='1']"))
+        self.assertFalse(covers(IF + "[name='1']", IF))
+        self.assertFalse(covers(IF + "[name='1']", IF + "[name='2']/state"))
+        self.assertFalse(covers(IF + "/state", IF))
+        self.assertFalse(covers(IF, "/goldstone-transponder:modules/module"))
+
+
+if __name__ == "__main__":
+    unittest.main()
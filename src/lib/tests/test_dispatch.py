@@ -0,0 +1,75 @@
+import unittest
+
+from goldstone.lib.core import ChangeHandler, NoOp
+from goldstone.lib.dispatch import HandlerTable, schema_path
+
+
+class AdminStatusHandler(ChangeHandler):
+    pass
+
+
+class EthernetHandler(ChangeHandler):
+    pass
+
+
+HANDLERS = {
+    "interfaces": {
+        "interface": {
+            "name": NoOp,
+            "config": {"name": NoOp, "admin-status": AdminStatusHandler},
+            "ethernet": EthernetHandler,
+        }
+    }
+}
+
+IF = "/goldstone-interfaces:interfaces/interface"
+
+
+class TestHandlerTable(unittest.TestCase):
+    def test_schema_path(self):
+        self.assertEqual(schema_path(IF), IF)
+        self.assertEqual(
+            schema_path(IF + "[name='Ethernet1_1']/config"), IF + "/config"
+        )
+        self.assertEqual(schema_path(IF + "[name='a]/[b']/name"), IF + "/name")
+        self.assertEqual(schema_path(IF + '[name="it\'s"]/name'), IF + "/name")
+
+    def test_lookup(self):
+        table = HandlerTable(HANDLERS, NoOp)
+        self.assertEqual(
+            table.lookup(IF + "[name='1']/config/admin-status"), AdminStatusHandler
+        )
+        # intermediate node
+        self.assertEqual(table.lookup(IF + "[name='1']/config"), NoOp)
+        # handler for an intermediate node handles all changes under the node
+        self.assertEqual(
+            table.lookup(IF + "[name='1']/ethernet/fec/config/fec"), EthernetHandler
+        )
+        self.assertEqual(table.lookup(IF + "[name='1']/config/description"), None)
+
+    def test_memo(self):
+        table = HandlerTable(HANDLERS, NoOp)
+        memo = {}
+        for i in range(3):
+            self.assertEqual(
+                table.lookup(IF + f"[name='{i}']/config/admin-status", memo),
+                AdminStatusHandler,
+            )
+        self.assertEqual(memo, {IF + "/config/admin-status": AdminStatusHandler})
+
+    def test_dump(self):
+        table = HandlerTable(HANDLERS, NoOp)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(
+            table.dump().split("\n"),
+            [
+                "/interfaces/interface/name: ChangeHandler",
+                "/interfaces/interface/config/name: ChangeHandler",
+                "/interfaces/interface/config/admin-status: AdminStatusHandler",
+                "/interfaces/interface/ethernet: EthernetHandler",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+import libyang as ly
+
+from goldstone.lib.connector.base import Connector
+
+
+SCHEMA = """module a {
+    namespace "a";
+    prefix "a";
+
+    container top {
+        list item {
+            key "name";
+            leaf name {
+                type string;
+            }
+            leaf value {
+                type string;
+            }
+        }
+    }
+}"""
+
+
+class MockConnector(Connector):
+    def __init__(self):
+        super().__init__()
+        self.ctx = ly.Context()
+        self.ctx.parse_module_str(SCHEMA)
+
+
+class TestNodeCache(unittest.TestCase):
+    def setUp(self):
+        self.conn = MockConnector()
+
+    def test_keys_are_ignored(self):
+        with mock.patch.object(
+            self.conn.ctx, "find_path", wraps=self.conn.ctx.find_path
+        ) as find_path:
+            node = self.conn.find_node("/a:top/item")
+            self.assertEqual(node.name(), "item")
+            self.assertEqual([k.name() for k in node.keys()], ["name"])
+            self.assertEqual([c.name() for c in node.children()], ["name", "value"])
+            self.assertEqual(node.child("value").name(), "value")
+            self.assertEqual(node.child("unknown"), None)
+            # the first lookup misses the cache. the others hit it regardless of the keys and prefixes
+            self.assertIs(self.conn.find_node("/a:top/item[name='foo']"), node)
+            self.assertIs(self.conn.find_node("/a:top/a:item"), node)
+            self.assertEqual(find_path.call_count, 1)
+
+    def test_not_found(self):
+        self.assertEqual(self.conn.find_node("/a:top/unknown"), None)
+        self.assertEqual(self.conn.find_node("/a:top/unknown"), None)
+
+    def test_invalidate(self):
+        node = self.conn.find_node("/a:top")
+        self.conn.clear_node_cache()
+        self.assertIsNot(self.conn.find_node("/a:top"), node)
+
+        node = self.conn.find_node("/a:top")
+        self.conn.ctx = ly.Context()
+        self.conn.ctx.parse_module_str(SCHEMA)
+        self.assertIsNot(self.conn.find_node("/a:top"), node)
+
+    def test_bounded(self):
+        self.conn.node_cache_size = 1
+        top = self.conn.find_node("/a:top")
+        self.conn.find_node("/a:top/item")
+        self.assertIsNot(self.conn.find_node("/a:top"), top)
@@ -1,9 +1,13 @@
 import unittest
 import logging
 import asyncio
+import libyang
+from unittest import mock
 
 from goldstone.lib.core import ServerBase, ChangeHandler, NoOp
+from goldstone.lib.batch import WriteBatch
 from goldstone.lib.connector.sysrepo import Connector
+from goldstone.lib.server_connector.sysrepo import _normalize
 from goldstone.lib.errors import *
 
 
@@ -12,6 +16,11 @@ class Handler(ChangeHandler):
         self.server.handled_changes.append(self.change)
 
 
+class CacheHandler(ChangeHandler):
+    def validate(self, user):
+        self.server.caches.append(self.setup_cache(user))
+
+
 class Server(ServerBase):
     def __init__(self, conn):
         super().__init__(conn, "goldstone-interfaces")
@@ -33,6 +42,20 @@ class Server(ServerBase):
         self.handled_changes = []
 
 
+class KeyedHandler(ChangeHandler):
+    def resource_key(self):
+        return self.change.key
+
+    async def apply(self, user):
+        await asyncio.sleep(self.change.delay)
+        if self.change.fail:
+            raise InvalArgError("failed")
+        user["log"].append(("apply", self.change.xpath))
+
+    def revert(self, user):
+        user["log"].append(("revert", self.change.xpath))
+
+
 class TestServerBase(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         logging.basicConfig(level=logging.DEBUG)
@@ -81,3 +104,220 @@ class TestServerBase(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(len(self.server.handled_changes), 0)
 
         await asyncio.create_task(asyncio.to_thread(t))
+
+    async def test_oper_cb_single_flight(self):
+        calls = []
+
+        async def oper_cb(xpath, priv):
+            calls.append(xpath)
+            await asyncio.sleep(0.1)
+            return {"goldstone-interfaces:interfaces": {"interface": []}}
+
+        self.server.oper_cb = oper_cb
+
+        xpath = "/goldstone-interfaces:interfaces/interface"
+        results = await asyncio.gather(
+            self.server._oper_cb(xpath, None),
+            self.server._oper_cb(xpath, None),
+            self.server._oper_cb(xpath + "[name='1']/state", None),
+            self.server._oper_cb("/goldstone-interfaces:interfaces", None),
+        )
+        # the last one is not covered by the in-flight request
+        self.assertEqual(calls, [xpath, "/goldstone-interfaces:interfaces"])
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(self.server._oper_inflight, {})
+
+    async def test_notify_oper_data_changed(self):
+        sent = []
+        self.server.send_notification = lambda name, notif: sent.append(notif["path"])
+        self.server.oper_cache.default_ttl = 10
+        prefix = "/goldstone-interfaces:interfaces/interface"
+        self.server.oper_cache.set(f"{prefix}[name='1']", "1")
+        self.server.oper_cache.set(f"{prefix}[name='2']", "2")
+
+        # nothing is sent without ON_CHANGE subscriptions, but the cache is invalidated
+        self.assertEqual(self.server._on_change_paths, [])
+        self.server.notify_oper_data_changed(f"{prefix}[name='1']/state")
+        self.assertEqual(sent, [])
+        self.assertEqual(
+            self.server.oper_cache.get(f"{prefix}[name='1']"), (False, None)
+        )
+        self.assertEqual(self.server.oper_cache.get(f"{prefix}[name='2']"), (True, "2"))
+
+        self.server._on_change_paths = [f"{prefix}/state/oper-status"]
+        self.server.notify_oper_data_changed(
+            [
+                f"{prefix}[name='1']",
+                f"{prefix}[name='1']/config/mtu",
+                f"{prefix}[name='2']/config",
+            ]
+        )
+        self.assertEqual(sent, [f"{prefix}[name='1']"])
+
+        # committed changes are notified by the changed list entries
+        sent.clear()
+        self.server._on_change_paths = [f"{prefix}/config"]
+
+        def t():
+            conn = Connector()
+            conn.set(f"{prefix}[name='1']/config/name", "1")
+            conn.set(f"{prefix}[name='1']/config/admin-status", "UP")
+            conn.apply()
+
+        await asyncio.create_task(asyncio.to_thread(t))
+        await asyncio.sleep(0.1)
+        self.assertEqual(sent, [f"{prefix}[name='1']"])
+
+    async def test_apply_parallel(self):
+        def handler(xpath, key, delay=0, fail=False):
+            change = mock.Mock(xpath=xpath, key=key, delay=delay, fail=fail)
+            return KeyedHandler(self.server, change)
+
+        handlers = [
+            handler("a1", "a", 0.1),
+            handler("a2", "a"),
+            handler("b1", "b"),
+            handler("barrier", None),
+            handler("c1", "c"),
+        ]
+        user = {"log": []}
+        await self.server.apply_parallel(handlers, user)
+        self.assertEqual(
+            user["log"],
+            [
+                ("apply", "b1"),
+                ("apply", "a1"),
+                ("apply", "a2"),
+                ("apply", "barrier"),
+                ("apply", "c1"),
+            ],
+        )
+
+        handlers = [
+            handler("a1", "a"),
+            handler("a2", "a", 0.1, fail=True),
+            handler("a3", "a"),
+            handler("b1", "b", 0.1),
+            handler("c1", "c"),
+        ]
+        user = {"log": []}
+        with self.assertRaises(InvalArgError):
+            await self.server.apply_parallel(handlers, user)
+        # applied handlers are reverted in the reverse order of the changes
+        self.assertEqual(
+            [v for v in user["log"] if v[0] == "revert"],
+            [("revert", "c1"), ("revert", "b1"), ("revert", "a1")],
+        )
+
+    async def test_apply_parallel_noop(self):
+        def handler(xpath, key, delay=0):
+            change = mock.Mock(xpath=xpath, key=key, delay=delay, fail=False)
+            return KeyedHandler(self.server, change)
+
+        # config of two modules with their list keys
+        handlers = [
+            NoOp(self.server, mock.Mock(xpath="module[name='1']/name")),
+            NoOp(self.server, mock.Mock(xpath="module[name='1']/config/name")),
+            handler("module[name='1']/config/admin-status", "1", 0.1),
+            handler("module[name='1']/config/description", "1"),
+            NoOp(self.server, mock.Mock(xpath="module[name='2']/name")),
+            NoOp(self.server, mock.Mock(xpath="module[name='2']/config/name")),
+            handler("module[name='2']/config/admin-status", "2"),
+        ]
+        user = {"log": []}
+        await self.server.apply_parallel(handlers, user)
+        # the handlers of the modules are applied concurrently
+        self.assertEqual(
+            user["log"],
+            [
+                ("apply", "module[name='2']/config/admin-status"),
+                ("apply", "module[name='1']/config/admin-status"),
+                ("apply", "module[name='1']/config/description"),
+            ],
+        )
+
+    async def test_flush_batch(self):
+        db = {"a": 1, "b": 2}
+
+        def flush(target, writes):
+            if target == "fail":
+                raise InvalArgError("failed")
+            original = [(k, db.get(k)) for k, _ in writes]
+            db.update(writes)
+            return original
+
+        self.server.flush = flush
+
+        batch = WriteBatch()
+        batch.add("db", "a", 10)
+        batch.add("db", "b", 20)
+        await self.server.flush_batch(batch)
+        self.assertEqual(db, {"a": 10, "b": 20})
+        await self.server.revert_batch(batch)
+        self.assertEqual(db, {"a": 1, "b": 2})
+
+        batch = WriteBatch()
+        batch.add("db", "a", 10)
+        batch.add("fail", "b", 20)
+        with self.assertRaises(InvalArgError):
+            await self.server.flush_batch(batch)
+        # the flushed target is reverted
+        self.assertEqual(db, {"a": 1, "b": 2})
+
+        # writes flushed in the middle of a transaction are not written again, and are reverted with the rest
+        user = {"batch": WriteBatch()}
+        user["batch"].add("db", "a", 10)
+        await self.server.flush_pending(user)
+        self.assertEqual(db, {"a": 10, "b": 2})
+        db["a"] = 100  # a direct write after the flush
+        user["batch"].add("db", "b", 20)
+        await self.server.flush_batch(user["batch"])
+        self.assertEqual(db, {"a": 100, "b": 20})
+        await self.server.revert_batch(user["batch"])
+        self.assertEqual(db, {"a": 1, "b": 2})
+
+    async def test_config_cache(self):
+        self.server.caches = []
+        self.server.handlers["interfaces"]["interface"]["config"][
+            "description"
+        ] = CacheHandler
+        self.server.compile_handlers()
+
+        sc = self.server.conn
+        prefix = "/goldstone-interfaces:interfaces/interface"
+
+        def t():
+            conn = Connector()
+            for name in ["1", "2"]:
+                conn.set(f"{prefix}[name='{name}']/config/name", name)
+                conn.set(f"{prefix}[name='{name}']/config/description", name)
+                conn.apply()
+
+        await asyncio.create_task(asyncio.to_thread(t))
+        # the cache is maintained from the changes, and must be identical to the running datastore
+        self.assertNotEqual(sc.config_cache, None)
+        self.assertEqual(_normalize(sc.config_cache), _normalize(sc._read_config()))
+
+        def t():
+            conn = Connector()
+            conn.delete(f"{prefix}[name='1']")
+            conn.set(f"{prefix}[name='2']/config/description", "foo")
+            conn.apply()
+
+        await asyncio.create_task(asyncio.to_thread(t))
+
+        # description of interface 1 and 2 are changed in the last transaction
+        self.assertEqual(len(self.server.caches), 4)
+        # the cache includes the changes of the transaction
+        self.assertEqual(
+            libyang.xpath_get(
+                self.server.caches[-1],
+                "/goldstone-interfaces:interfaces/interface[name='2']/config/description",
+            ),
+            "foo",
+        )
+        # the cache is read again after a transaction which deletes nodes
+        self.assertEqual(sc.config_cache, None)
+        self.assertEqual(
+            _normalize(sc.get_config_cache([])), _normalize(sc._read_config())
+        )
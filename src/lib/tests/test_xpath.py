@@ -0,0 +1,42 @@
+import unittest
+
+from goldstone.lib.xpath import split, to_xpath, schema_path, cache_info
+
+
+IF = "/goldstone-interfaces:interfaces/interface"
+
+
+class TestXPath(unittest.TestCase):
+    def test_split(self):
+        self.assertEqual(
+            split(IF + "[name='Ethernet1_1']/config/name"),
+            (
+                ("goldstone-interfaces", "interfaces", ()),
+                (None, "interface", (("name", "Ethernet1_1"),)),
+                (None, "config", ()),
+                (None, "name", ()),
+            ),
+        )
+
+    def test_memoised(self):
+        xpath = IF + "[name='Ethernet1_2']/config/admin-status"
+        v = split(xpath)
+        hits = cache_info().hits
+        self.assertIs(split(xpath), v)
+        self.assertEqual(cache_info().hits, hits + 1)
+
+    def test_to_xpath(self):
+        for xpath in [
+            IF,
+            IF + "[name='Ethernet1_1']/config/name",
+            IF + '[name="it\'s"]/config/name',
+            "/goldstone-vlan:vlans/vlan[vlan-id='10']/members/member[.='Ethernet1_1']",
+        ]:
+            self.assertEqual(to_xpath(split(xpath)), xpath)
+
+    def test_schema_path(self):
+        self.assertEqual(schema_path(IF), IF)
+        self.assertEqual(
+            schema_path(IF + "[name='Ethernet1_1']/config"), IF + "/config"
+        )
+        self.assertEqual(schema_path(IF + "[name='a]/[b']/name"), IF + "/name")
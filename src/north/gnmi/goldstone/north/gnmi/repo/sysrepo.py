@@ -1,18 +1,22 @@
 """Repository inmplementation for the sysrepo datastore."""
 
 
+import os
 import logging
-import libyang
+import threading
 from goldstone.lib.connector.sysrepo import (
     Connector,
     NotFoundError as ConnectorNotFound,
     Error as ConnectorError,
 )
+from goldstone.lib.xpath import split as xpath_split
 from .repo import Repository, NotFoundError, ApplyFailedError
 
 
 logger = logging.getLogger(__name__)
 
+CONNECTOR_POOL_SIZE = int(os.getenv("GOLDSTONE_GNMI_CONNECTOR_POOL_SIZE", 2))
+
 
 def parse_xpath(xpath):
     """Parse xpath into a list of nodes.
@@ -29,7 +33,79 @@ def parse_xpath(xpath):
                     key: Name of the key node.
                     value: Value of the key.
     """
-    return list(libyang.xpath_split(xpath))
+    return list(xpath_split(xpath))
+
+
+class ConnectorPool:
+    """Long-lived sysrepo connectors shared by gNMI requests.
+
+    Connecting to sysrepo and acquiring its libyang context costs much more than serving a typical Get request. The
+    gNMI server handles each RPC in a worker thread of a gRPC thread pool, so the connectors are created once and
+    shared by all the workers. Each request checks out its own sessions from the session pool of a connector since
+    sysrepo sessions must not be shared between threads.
+
+    Args:
+        size (int): Number of connectors. Requests are distributed to them in round-robin order.
+
+    Attributes:
+        size (int): Number of connectors.
+    """
+
+    def __init__(self, size=CONNECTOR_POOL_SIZE):
+        self.size = max(size, 1)
+        self._connectors = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get a connector.
+
+        Connectors are created on demand until the pool has `size` connectors.
+
+        Returns:
+            Connector: Shared connector. Callers must not stop it.
+        """
+        with self._lock:
+            if len(self._connectors) < self.size:
+                self._connectors.append(Connector())
+            connector = self._connectors[self._next % len(self._connectors)]
+            self._next += 1
+            return connector
+
+    def stats(self):
+        """Get session pool metrics of the connectors.
+
+        Returns:
+            list: SessionPool.stats() of each connector.
+        """
+        with self._lock:
+            connectors = list(self._connectors)
+        return [c.pool.stats() for c in connectors]
+
+    def close(self):
+        """Stop all the connectors."""
+        with self._lock:
+            connectors = self._connectors
+            self._connectors = []
+        for c in connectors:
+            c.stop()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Get the connector pool shared in the process.
+
+    Returns:
+        ConnectorPool: Connector pool.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ConnectorPool()
+        return _shared_pool
 
 
 class Sysrepo(Repository):
@@ -41,10 +117,20 @@ class Sysrepo(Repository):
             repo.start()
             # something to do
         # repo.stop() will be called automatically
+
+    start() checks out sessions from a connector in the connector pool and stop() returns them. The connector itself
+    is kept open for following requests.
+
+    Args:
+        pool (ConnectorPool): Connector pool to use. Defaults to the pool shared in the process.
     """
 
-    def __init__(self):
+    def __init__(self, pool=None):
+        self._pool = pool
         self._connector = None
+        self._running = None
+        self._operational = None
+        self._notif_session = None
 
     def __enter__(self):
         return self
@@ -53,18 +139,27 @@ class Sysrepo(Repository):
         self.stop()
 
     def start(self):
-        self._connector = Connector()
+        if self._pool is None:
+            self._pool = shared_pool()
+        self._connector = self._pool.get()
+        self._running = self._connector.new_session("running", pooled=True)
+        self._operational = self._connector.new_session("operational", pooled=True)
 
     def stop(self):
-        self._connector.stop()
+        # Pooled sessions discard uncommitted changes when they are returned.
+        for sess in (self._running, self._operational, self._notif_session):
+            if sess is not None:
+                sess.stop()
+        self._running = None
+        self._operational = None
+        self._notif_session = None
+        self._connector = None
 
     def _find_node(self, path):
         return self._connector.find_node(path)
 
     def _next_node(self, node, target_name):
-        for c in node.children():
-            if c.name() == target_name:
-                return c
+        return node.child(target_name)
 
     def _expect_single_result_when_path_includes_list_node(self, path):
         # If all keys defined by the data schema are specified in the provided path, return True.
@@ -101,7 +196,7 @@ class Sysrepo(Repository):
             # Goldstone xlate/south daemons enable the datastore layering.
             # When you get data from the operational datastore, you may get data from the running datastore too.
             # It means that you can get operational state and configuration state at same time.
-            r = self._connector.get(xpath, strip=strip, one=one, ds="operational")
+            r = self._operational.get(xpath, strip=strip, one=one)
         except ConnectorNotFound as e:
             logger.error("%s not found. %s", xpath, e)
             raise NotFoundError(xpath) from e
@@ -116,7 +211,7 @@ class Sysrepo(Repository):
 
     def set(self, xpath, data):
         try:
-            self._connector.set(xpath, data)
+            self._running.set(xpath, data)
         except ConnectorError as e:
             msg = f"failed to set. xpath: {xpath}, value: {data}. {e}"
             logger.debug(msg)
@@ -124,7 +219,7 @@ class Sysrepo(Repository):
 
     def delete(self, xpath):
         try:
-            self._connector.delete(xpath)
+            self._running.delete(xpath)
         except ConnectorNotFound as e:
             logger.error("%s not found. %s", xpath, e)
             raise NotFoundError(xpath) from e
@@ -135,7 +230,7 @@ class Sysrepo(Repository):
 
     def apply(self):
         try:
-            self._connector.apply()
+            self._running.apply()
         except ConnectorError as e:
             # TODO: can split into detailed exceptions?
             msg = f"apply failed. {e}"
@@ -143,7 +238,7 @@ class Sysrepo(Repository):
             raise ApplyFailedError(msg) from e
 
     def discard(self):
-        self._connector.discard_changes()
+        self._running.discard_changes()
 
     def get_list_keys(self, path):
         elements = parse_xpath(path)
@@ -164,7 +259,10 @@ class Sysrepo(Repository):
         return keys
 
     def subscribe_notification(self, xpath, callback):
-        self._connector.operational_session.subscribe_notification(xpath, callback)
+        # Subscriptions live as long as the session. Use a dedicated session not to leave them in the session pool.
+        if self._notif_session is None:
+            self._notif_session = self._connector.new_session("operational")
+        self._notif_session.subscribe_notification(xpath, callback)
 
     def exec_rpc(self, xpath, params):
-        self._connector.operational_session.rpc(xpath, params)
+        self._operational.rpc(xpath, params)
@@ -8,7 +8,7 @@ import json
 import time
 import grpc
 import random
-import libyang
+from goldstone.lib.xpath import split as xpath_split
 from .proto import gnmi_pb2_grpc, gnmi_pb2
 from .repo.repo import NotFoundError, ApplyFailedError
 
@@ -42,7 +42,7 @@ def _parse_gnmi_path(gnmi_path):
 
 def _build_gnmi_path(xpath):
     gnmi_path = gnmi_pb2.Path()
-    elements = list(libyang.xpath_split(xpath))
+    elements = xpath_split(xpath)
     for elem in elements:
         prefix = elem[0]
         name = elem[1]
@@ -452,6 +452,21 @@ class SubscribeRequest:
                     ],
                 )
             )
+        elif notif["type"] == "BATCH":
+            batch = json.loads(notif["json-data"])
+            sr = gnmi_pb2.SubscribeResponse(
+                update=gnmi_pb2.Notification(
+                    timestamp=notif.get("timestamp", timestamp),
+                    update=[
+                        gnmi_pb2.Update(
+                            path=_build_gnmi_path(path),
+                            val=gnmi_pb2.TypedValue(json_val=json.dumps(v).encode()),
+                        )
+                        for path, v in batch["update"].items()
+                    ],
+                    delete=[_build_gnmi_path(path) for path in batch["delete"]],
+                )
+            )
         if sr is not None:
             self._notifs.insert(0, sr)
 
@@ -17,7 +17,7 @@ from goldstone.north.gnmi.server import (
 )
 from goldstone.north.gnmi.proto import gnmi_pb2
 from goldstone.north.gnmi.repo.repo import NotFoundError
-from goldstone.north.gnmi.repo.sysrepo import Sysrepo
+from goldstone.north.gnmi.repo.sysrepo import Sysrepo, ConnectorPool
 
 
 def append_path_element(path: gnmi_pb2.Path, name, key=None, val=None):
@@ -505,6 +505,39 @@ class TestUpdateRequest(unittest.TestCase):
         self.assertEqual(request.status, expected_status)
 
 
+class TestSysrepo(unittest.TestCase):
+    """Tests for Sysrepo repository."""
+
+    def test_connector_pool(self):
+        pool = ConnectorPool(size=2)
+        try:
+            connectors = []
+            for _ in range(3):
+                with Sysrepo(pool) as repo:
+                    repo.start()
+                    connectors.append(repo._connector)
+                    repo.set(
+                        "/openconfig-interfaces:interfaces/interface[name='pool0']/config/name",
+                        "pool0",
+                    )
+            # connectors are created once and shared in round-robin order
+            self.assertIsNot(connectors[0], connectors[1])
+            self.assertIs(connectors[0], connectors[2])
+            stats = pool.stats()
+            self.assertEqual(stats[0]["running"]["created"], 1)
+            self.assertEqual(stats[0]["running"]["reused"], 1)
+            self.assertEqual(stats[0]["running"]["in-use"], 0)
+            # uncommitted changes are not left in returned sessions
+            with Sysrepo(pool) as repo:
+                repo.start()
+                with self.assertRaises(NotFoundError):
+                    repo.get(
+                        "/openconfig-interfaces:interfaces/interface[name='pool0']/config/name"
+                    )
+        finally:
+            pool.close()
+
+
 class TestCapabilities(gNMIServerTestCase):
     """Tests for gNMI Capabilities service."""
 
@@ -5344,6 +5377,99 @@ class TestSubscribe(gNMIServerTestCase):
 
         await self.run_gnmi_server_test(test)
 
+    async def test_subscribe_batch(self):
+        def test():
+            # Create a Subscribe RPC session.
+            path = gnmi_pb2.Path()
+            append_path_element(path, "openconfig-interfaces:interfaces")
+            append_path_element(path, "interface", "name", "Interface1/0/1")
+            append_path_element(path, "config")
+            s1 = gnmi_pb2.Subscription(path=path, mode="ON_CHANGE")
+            subscriptions = [s1]
+            request = gnmi_pb2.SubscribeRequest(
+                subscribe=gnmi_pb2.SubscriptionList(
+                    mode=gnmi_pb2.SubscriptionList.Mode.STREAM,
+                    subscription=subscriptions,
+                ),
+            )
+            self.rpc = self.gnmi_subscribe(request)
+
+            time.sleep(self.WAIT_CREATION)
+
+            # Get generated request-id.
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    sess.switch_datastore("running")
+                    subscribe_requests = sess.get_data(
+                        "/goldstone-telemetry:subscribe-requests/subscribe-request"
+                    )
+                    srs = list(
+                        subscribe_requests["subscribe-requests"]["subscribe-request"]
+                    )
+                    self.assertEqual(len(srs), 1)
+                    sr = srs[0]
+                    generated_id = sr["id"]
+
+            # Send mocked events.
+            prefix = "/openconfig-interfaces:interfaces/interface[name='Interface1/0/1']/config"
+            timestamp = time.time_ns()
+            notifs = [
+                {
+                    "type": "BATCH",
+                    "request-id": generated_id,
+                    "subscription-id": 0,
+                    "json-data": json.dumps(
+                        {
+                            "update": {
+                                prefix + "/enabled": True,
+                                prefix + "/mtu": 1500,
+                            },
+                            "delete": [prefix + "/description"],
+                        }
+                    ),
+                    "timestamp": timestamp,
+                },
+                {
+                    "type": "SYNC_RESPONSE",
+                    "request-id": generated_id,
+                    "subscription-id": 0,
+                },
+            ]
+            self.set_mock_notifs_data(self.NOTIF_SERVER, self.NOTIF_PATH, notifs)
+            self.send_mock_notifs(self.NOTIF_SERVER)
+
+            time.sleep(self.WAIT_NOTIFICATION)
+
+            # Receive updates in a notification.
+            actual = self.rpc.take_response()
+            self.assertEqual(actual.update.timestamp, timestamp)
+            self.assertEqual(len(actual.update.update), 2)
+            enabled = gnmi_pb2.Path()
+            enabled.CopyFrom(path)
+            append_path_element(enabled, "enabled")
+            self.assertEqual(actual.update.update[0].path, enabled)
+            act = json.loads(actual.update.update[0].val.json_val.decode("utf-8"))
+            self.assertEqual(act, True)
+            mtu = gnmi_pb2.Path()
+            mtu.CopyFrom(path)
+            append_path_element(mtu, "mtu")
+            self.assertEqual(actual.update.update[1].path, mtu)
+            act = json.loads(actual.update.update[1].val.json_val.decode("utf-8"))
+            self.assertEqual(act, 1500)
+            description = gnmi_pb2.Path()
+            description.CopyFrom(path)
+            append_path_element(description, "description")
+            self.assertEqual(list(actual.update.delete), [description])
+
+            # Receive the sync-response of the initial updates.
+            actual = self.rpc.take_response()
+            self.assertEqual(actual.sync_response, True)
+
+            # Close the RPC session.
+            self.rpc.requests_closed()
+
+        await self.run_gnmi_server_test(test)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,3 @@
-import libyang
 import taish
 import asyncio
 import logging
@@ -6,6 +5,7 @@ import json
 
 from goldstone.lib.core import ServerBase, ChangeHandler, NoOp
 from goldstone.lib.errors import *
+from goldstone.lib.xpath import split as xpath_split
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +14,7 @@ class DPLLChangeHandler(ChangeHandler):
     async def _init(self, user):
         xpath = self.change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-dpll"
         assert xpath[0][1] == "dplls"
         assert xpath[1][1] == "dpll"
@@ -198,7 +198,7 @@ class DPLLServer(ServerBase):
             return "freerun"
 
     async def oper_cb(self, xpath, priv):
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         modules = await self.taish.list()
 
         if len(xpath) < 2 or len(xpath[1][2]) < 1:
@@ -6,6 +6,7 @@ from .interfaces import IfChangeHandler
 
 from goldstone.lib.core import ServerBase, NoOp
 from goldstone.lib.errors import *
+from goldstone.lib.xpath import split as xpath_split
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,7 @@ class GearboxChangeHandler(IfChangeHandler):
     async def _init(self, user):
         xpath = self.change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-gearbox"
         assert xpath[0][1] == "gearboxes"
         assert xpath[1][1] == "gearbox"
@@ -30,6 +31,9 @@ class GearboxChangeHandler(IfChangeHandler):
         self.tai_attr_name = None
         self.ifname = None
 
+    def resource_key(self):
+        return self.obj.location
+
 
 class AdminStatusHandler(GearboxChangeHandler):
     async def _init(self, user):
@@ -81,7 +85,7 @@ class ReferenceInterfaceHandler(GearboxChangeHandler):
 
 class GearboxServer(ServerBase):
     def __init__(self, conn, interface_server):
-        super().__init__(conn, "goldstone-gearbox")
+        super().__init__(conn, "goldstone-gearbox", parallel_apply=True)
         self.ifserver = interface_server
         self.taish = self.ifserver.taish
         self.handlers = {
@@ -220,7 +224,7 @@ class GearboxServer(ServerBase):
 
     async def oper_cb(self, xpath, priv):
         logger.debug(f"xpath: {xpath}")
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         logger.debug(f"xpath: {xpath}")
 
         if len(xpath) < 2 or len(xpath[1][2]) < 1:
@@ -13,6 +13,7 @@ from goldstone.lib.errors import (
     NotFoundError,
     CallbackFailedError,
 )
+from goldstone.lib.xpath import split as xpath_split
 
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,7 @@ class IfChangeHandler(ChangeHandler):
     async def _init(self, user):
         xpath = self.change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-interfaces"
         assert xpath[0][1] == "interfaces"
         assert xpath[1][1] == "interface"
@@ -30,13 +31,20 @@ class IfChangeHandler(ChangeHandler):
         self.xpath = xpath
         ifname = xpath[1][2][0][1]
 
-        self.obj = await self.server.ifname2taiobj(ifname)
+        self.obj, self.module = await self.server.ifname2taiobj(
+            ifname, with_module=True
+        )
         if self.obj == None:
             raise InvalArgError("Invalid Interface name")
 
         self.ifname = ifname
         self.tai_attr_name = None
 
+    # changes for interfaces of different gearboxes are applied concurrently
+    # pin-mode changes modify other interfaces of the same gearbox
+    def resource_key(self):
+        return self.module.location
+
     async def validate(self, user):
         if not self.tai_attr_name:
             return
@@ -583,7 +591,7 @@ def parse_macsec_counters(attrs):
 
 class InterfaceServer(ServerBase):
     def __init__(self, conn, taish_server, platform_info):
-        super().__init__(conn, "goldstone-interfaces")
+        super().__init__(conn, "goldstone-interfaces", parallel_apply=True)
         ifinfo = {}
         clkinfo = {}
         for i in platform_info:
@@ -1194,7 +1202,7 @@ class InterfaceServer(ServerBase):
         return new_mapping
 
     async def oper_cb(self, xpath, priv):
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         counter_only = False
 
         if len(xpath) < 2 or len(xpath[1][2]) < 1:
@@ -3,6 +3,7 @@ import sysrepo
 import ncclient
 from ncclient.xml_ import *
 import libyang
+from goldstone.lib.xpath import split as xpath_split
 from lxml import etree
 from .util import *
 
@@ -14,7 +15,7 @@ class IfChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath_list = list(libyang.xpath_split(xpath))
+        xpath_list = xpath_split(xpath)
 
         assert xpath_list[0][0] == "goldstone-interfaces"
         assert xpath_list[0][1] == "interfaces"
@@ -501,7 +502,7 @@ class TrunkVlansHandler(IfChangeHandler):
             include_implicit_defaults=True,
         )
         candidate = self.setup_cache(user)
-        xpath_list = list(libyang.xpath_split(self.change.xpath))
+        xpath_list = xpath_split(self.change.xpath)
         assert xpath_list[4][1] == "trunk-vlans"
         value = xpath_list[4][2][0][1]
 
@@ -772,7 +773,7 @@ class InterfaceServer(ServerBase):
 
     async def oper_cb(self, xpath, priv):
         logger.info(f"oper_cb xpath: {xpath}")
-        req_xpath = list(libyang.xpath_split(xpath))
+        req_xpath = xpath_split(xpath)
 
         ifnames = self.ocnos_conn.get(
             "/ipi-interface:interfaces/interface/name", ds="operational"
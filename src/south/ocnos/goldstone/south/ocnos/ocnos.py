@@ -10,7 +10,7 @@ from pathlib import Path
 from lxml import etree
 from ncclient.xml_ import *
 import xmltodict
-import libyang
+from goldstone.lib.xpath import split as xpath_split
 import pkgutil
 import re
 
@@ -19,6 +19,8 @@ logger = logging.getLogger(__name__)
 
 class OcNOSConnector(NETCONFConnector):
     def __init__(self, **kwargs):
+        # NETCONFConnector.__init__() is replaced. Only the base connector is initialized.
+        super(NETCONFConnector, self).__init__()
         if "host" not in kwargs:
             raise Error("missing host option")
         schema_dir = kwargs.pop("schema_dir", None)
@@ -88,7 +90,7 @@ class OcNOSConnector(NETCONFConnector):
 
     # Overwritten xpath2xml function for ocnos.
     def xpath2xml(self, xpath, value=None, delete_oper=False):
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         if len(xpath) == 0:
             return None
         node = xpath[0][1]
@@ -3,6 +3,7 @@ import sysrepo
 import ncclient
 from ncclient.xml_ import *
 import libyang
+from goldstone.lib.xpath import split as xpath_split
 import re
 from lxml import etree
 from .util import *
@@ -15,7 +16,7 @@ class VlanChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath_list = list(libyang.xpath_split(xpath))
+        xpath_list = xpath_split(xpath)
 
         assert xpath_list[0][0] == "goldstone-vlan"
         assert xpath_list[0][1] == "vlans"
@@ -163,7 +164,7 @@ class VlanNameHandler(VlanChangeHandler):
         # It's necessary because the sysrepo try to remove the vlan-name also, when the
         # vlan-id is being removed. If vlan-id is not present it is not necessary
         # to send the name removal to the OcNOS.
-        xpath_list = list(libyang.xpath_split(self.change.xpath))
+        xpath_list = xpath_split(self.change.xpath)
         assert xpath_list[1][1] == "vlan"
         vlan_id = xpath_list[1][2][0][1]
         xpath_gs_vlan = GS_VLAN.format(vlan_id)
@@ -283,7 +284,7 @@ class VlanServer(ServerBase):
 
     async def oper_cb(self, xpath, priv):
         logger.info(f"oper_cb xpath: {xpath}")
-        req_xpath = list(libyang.xpath_split(xpath))
+        req_xpath = xpath_split(xpath)
 
         vlan_ids = self.ocnos_conn.get(
             IPI_BRIDGE_VLAN_VLAN_ID.format(
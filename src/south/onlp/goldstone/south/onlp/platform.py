@@ -1,10 +1,10 @@
 import sysrepo
-import libyang
 import logging
 import asyncio
 import ctypes
 import onlp.onlp
 from goldstone.lib.core import ServerBase
+from goldstone.lib.xpath import split as xpath_split
 
 libonlp = onlp.onlp.libonlp
 
@@ -80,7 +80,7 @@ class PlatformServer(ServerBase):
         if xpath == "/goldstone-platform:*":
             return None
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         if (
             len(xpath) < 2
             or xpath[0][0] != "goldstone-platform"
@@ -11,11 +11,13 @@ from goldstone.lib.errors import (
     NotFoundError,
     CallbackFailedError,
 )
+from goldstone.lib.xpath import split as xpath_split
 
 logger = logging.getLogger(__name__)
 
 REDIS_SERVICE_HOST = os.getenv("REDIS_SERVICE_HOST")
 REDIS_SERVICE_PORT = os.getenv("REDIS_SERVICE_PORT")
+OPER_CACHE_TTL = float(os.getenv("GOLDSTONE_SONIC_OPER_CACHE_TTL", 1))
 
 SINGLE_LANE_INTERFACE_TYPES = ["CR", "LR", "SR", "KR"]
 DOUBLE_LANE_INTERFACE_TYPES = ["CR2", "LR2", "SR2", "KR2"]
@@ -27,7 +29,7 @@ class IfChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-interfaces"
         assert xpath[0][1] == "interfaces"
         assert xpath[1][1] == "interface"
@@ -49,6 +51,8 @@ class IfChangeHandler(ChangeHandler):
             return valid_speeds
 
 
+# admin-status, mtu and fec are written to CONFIG_DB with user["batch"].
+# handlers which write to the backend directly call ServerBase.flush_pending() first to keep the writes in order
 class AdminStatusHandler(IfChangeHandler):
     def apply(self, user):
         if self.type in ["created", "modified"]:
@@ -56,11 +60,10 @@ class AdminStatusHandler(IfChangeHandler):
         else:
             value = self.server.get_default("admin-status")
         logger.debug(f"set {self.ifname}'s admin-status to {value}")
-        self.server.sonic.set_config_db(self.ifname, "admin-status", value)
-
-    def revert(self, user):
-        # TODO
-        pass
+        key, value = self.server.sonic.config_db_entry(
+            self.ifname, "admin-status", value
+        )
+        user["batch"].add("CONFIG_DB", key, value)
 
 
 class MTUHandler(IfChangeHandler):
@@ -70,7 +73,8 @@ class MTUHandler(IfChangeHandler):
         else:
             value = self.server.get_default("mtu")
         logger.debug(f"set {self.ifname}'s mtu to {value}")
-        self.server.sonic.set_config_db(self.ifname, "mtu", value)
+        key, value = self.server.sonic.config_db_entry(self.ifname, "mtu", value)
+        user["batch"].add("CONFIG_DB", key, value)
 
 
 class FECHandler(IfChangeHandler):
@@ -80,7 +84,8 @@ class FECHandler(IfChangeHandler):
         else:
             value = self.server.get_default("fec")
         logger.debug(f"set {self.ifname}'s fec to {value}")
-        self.server.sonic.set_config_db(self.ifname, "fec", value)
+        key, value = self.server.sonic.config_db_entry(self.ifname, "fec", value)
+        user["batch"].add("CONFIG_DB", key, value)
 
 
 class IfTypeHandler(IfChangeHandler):
@@ -114,6 +119,7 @@ class EthernetIfTypeHandler(IfChangeHandler):
             value = self.change.value
         else:
             value = self.server.sonic.k8s.get_default_iftype(self.ifname)
+        await self.server.flush_pending(user)
         await self.server.sonic.k8s.run_bcmcmd_port(self.ifname, "if=" + value)
 
 
@@ -133,6 +139,7 @@ class SpeedHandler(IfChangeHandler):
             value = self.change.value
         else:
             value = "100G"
+        await self.server.flush_pending(user)
         self.server.sonic.set_config_db(self.ifname, "speed", value)
         await self.server.sonic.k8s.update_bcm_portmap()
 
@@ -170,7 +177,8 @@ class VLANIfModeHandler(IfChangeHandler):
 
 
 class AccessVLANHandler(IfChangeHandler):
-    def apply(self, user):
+    async def apply(self, user):
+        await self.server.flush_pending(user)
         for key in self.server.sonic.get_keys(f"VLAN_MEMBER|*|{self.ifname}"):
             v = self.server.sonic.hgetall("CONFIG_DB", key)
             if v.get("tagging_mode") == "untagged":
@@ -184,7 +192,8 @@ class AccessVLANHandler(IfChangeHandler):
 
 
 class TrunkVLANsHandler(IfChangeHandler):
-    def apply(self, user):
+    async def apply(self, user):
+        await self.server.flush_pending(user)
         if self.type == "created":
             self.server.sonic.set_vlan_member(self.ifname, self.change.value, "tagged")
         elif self.type == "modified":
@@ -206,6 +215,7 @@ class AutoNegotiateHandler(IfChangeHandler):
             v = self.server.get_default("enabled")
         value = "yes" if v else "no"
 
+        await self.server.flush_pending(user)
         await self.server.sonic.k8s.run_bcmcmd_port(self.ifname, "an=" + value)
 
 
@@ -260,7 +270,11 @@ class BreakoutHandler(IfChangeHandler):
 
 class InterfaceServer(ServerBase):
     def __init__(self, conn, sonic, servers, platform_info):
-        super().__init__(conn, "goldstone-interfaces")
+        super().__init__(
+            conn,
+            "goldstone-interfaces",
+            oper_cache_ttls={"/goldstone-interfaces:interfaces": OPER_CACHE_TTL},
+        )
         info = {}
         for i in platform_info:
             if "interface" in i:
@@ -335,6 +349,9 @@ class InterfaceServer(ServerBase):
         if self.sonic.is_rebooting:
             raise LockedError("uSONiC is rebooting")
 
+    def flush(self, target, writes):
+        return self.sonic.set_multiple(target, writes)
+
     async def post(self, user):
         logger.info(f"post: {user}")
         if user.get("update-sonic"):
@@ -354,8 +371,11 @@ class InterfaceServer(ServerBase):
 
     async def reconcile(self):
         self.sonic.is_rebooting = True
+        self.invalidate_oper_cache()
 
-        config = self.get_running_data(self.conn.top, default={}, strip=False)
+        config = await self.get_running_data_async(
+            self.conn.top, default={}, strip=False
+        )
         is_updated = self.breakout_update_usonic(config)
         if is_updated:
             await self.sonic.wait()
@@ -365,7 +385,7 @@ class InterfaceServer(ServerBase):
         prefix = "/goldstone-interfaces:interfaces/interface"
         for ifname in self.sonic.get_ifnames():
             xpath = f"{prefix}[name='{ifname}']"
-            data = self.get_running_data(xpath, {})
+            data = await self.get_running_data_async(xpath, {})
             logger.debug(f"{ifname} interface config: {data}")
 
             autoneg = (
@@ -462,6 +482,11 @@ class InterfaceServer(ServerBase):
                 continue
 
             ifname = msg["channel"].decode().split(":")[-1]
+            # PORT_TABLE has the state of the interface, e.g. oper-status, speed and MTU
+            interface = f"/goldstone-interfaces:interfaces/interface[name='{ifname}']"
+            self.notify_oper_data_changed(
+                [f"{interface}/state", f"{interface}/ethernet/state"]
+            )
             oper_status = self.sonic.get_oper_status(ifname)
             curr_oper_status = self.sonic.notif_if.get(ifname, "unknown")
 
@@ -507,6 +532,7 @@ class InterfaceServer(ServerBase):
             f"clear_counters: xpath: {xpath}, input: {input}, event: {event}, priv: {priv}"
         )
         self.sonic.cache_counters()
+        self.invalidate_oper_cache()
 
     def stop(self):
         super().stop()
@@ -616,7 +642,7 @@ class InterfaceServer(ServerBase):
 
         counter_only = "counters" in xpath
 
-        req_xpath = list(libyang.xpath_split(xpath))
+        req_xpath = xpath_split(xpath)
         ifnames = self.sonic.get_ifnames()
 
         if (
@@ -5,6 +5,7 @@ from goldstone.lib.errors import (
     InvalArgError,
     CallbackFailedError,
 )
+from goldstone.lib.xpath import split as xpath_split
 
 
 class PortChannelChangeHandler(ChangeHandler):
@@ -12,7 +13,7 @@ class PortChannelChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-portchannel"
         assert xpath[0][1] == "portchannel"
         assert xpath[1][1] == "portchannel-group"
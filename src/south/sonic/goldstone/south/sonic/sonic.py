@@ -215,15 +215,35 @@ class SONiC(object):
         self.sonic_db.set(db, f"VLAN|Vlan{vid}", "members@", ifs)
         self.sonic_db.delete(db, f"VLAN_MEMBER|Vlan{vid}|{ifname}")
 
-    def set_config_db(self, name, key, value, table="PORT"):
+    # returns ((redis key, field), value) to write a goldstone leaf value to CONFIG_DB
+    def config_db_entry(self, name, key, value, table="PORT"):
         if key == "speed":
             value = speed_yang_to_redis(value)
         if type(value) == str and value != "NULL":
             value = value.lower()
         key = key.replace("-", "_")
-        return self.sonic_db.set(
-            self.sonic_db.CONFIG_DB, f"{table}|{name}", key, str(value)
-        )
+        return (f"{table}|{name}", key), str(value)
+
+    def set_config_db(self, name, key, value, table="PORT"):
+        (k, field), value = self.config_db_entry(name, key, value, table)
+        return self.sonic_db.set(self.sonic_db.CONFIG_DB, k, field, value)
+
+    # write fields with one redis pipeline
+    # writes: [((redis key, field), value)]. None value deletes the field
+    # returns the original values in the same format
+    def set_multiple(self, db, writes):
+        client = self.sonic_db.get_redis_client(getattr(self.sonic_db, db))
+        pipe = client.pipeline()
+        for (key, field), _ in writes:
+            pipe.hget(key, field)
+        original = [(k, _decode(v)) for (k, _), v in zip(writes, pipe.execute())]
+        for (key, field), value in writes:
+            if value == None:
+                pipe.hdel(key, field)
+            else:
+                pipe.hset(key, field, value)
+        pipe.execute()
+        return original
 
     def get_oper_status(self, ifname):
         v = _decode(
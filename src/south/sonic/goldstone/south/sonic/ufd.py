@@ -1,5 +1,6 @@
 from goldstone.lib.core import *
 from goldstone.lib.errors import InvalArgError, CallbackFailedError
+from goldstone.lib.xpath import split as xpath_split
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +10,7 @@ class UFDChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-uplink-failure-detection"
         assert xpath[0][1] == "ufd-groups"
         assert xpath[1][1] == "ufd-group"
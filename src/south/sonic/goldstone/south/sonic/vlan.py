@@ -5,6 +5,7 @@ from goldstone.lib.errors import (
     NotFoundError,
     CallbackFailedError,
 )
+from goldstone.lib.xpath import split as xpath_split
 
 
 class VLANChangeHandler(ChangeHandler):
@@ -12,7 +13,7 @@ class VLANChangeHandler(ChangeHandler):
         super().__init__(server, change)
         xpath = change.xpath
 
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "goldstone-vlan"
         assert xpath[0][1] == "vlans"
         assert xpath[1][1] == "vlan"
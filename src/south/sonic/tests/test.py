@@ -16,6 +16,9 @@ class MockK8S(object):
     async def run_bcmcmd_port(self, ifname, cmd):
         pass
 
+    async def update_bcm_portmap(self):
+        pass
+
     def get_default_iftype(self, ifname):
         return "KR4"
 
@@ -43,6 +46,14 @@ class MockSONiC(object):
     def set_config_db(self, ifname, key, value):
         self.logs.append((ifname, key, value))
 
+    def config_db_entry(self, ifname, key, value):
+        return (ifname, key), value
+
+    def set_multiple(self, db, writes):
+        for (ifname, key), value in writes:
+            self.logs.append((ifname, key, value))
+        return []
+
     def get_counters(self, ifname):
         return {}
 
@@ -121,6 +132,28 @@ class TestInterfaceServer(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(admin_status, "UP")
 
+    async def test_write_order(self):
+        def test():
+            conn = Connector()
+            name = "Ethernet1_1"
+            prefix = f"/goldstone-interfaces:interfaces/interface[name='{name}']"
+            conn.set(f"{prefix}/config/name", name)
+            conn.set(f"{prefix}/config/admin-status", "UP")
+            conn.set(f"{prefix}/ethernet/config/speed", "SPEED_40G")
+            conn.apply()
+
+        self.tasks.append(asyncio.create_task(asyncio.to_thread(test)))
+
+        done, _ = await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            e = task.exception()
+            if e:
+                raise e
+
+        # the batched admin-status is written before speed which is written directly, in the order of the changes
+        keys = [event[1] for event in self.sonic.logs if event[0] == "Ethernet1_1"]
+        self.assertEqual(keys, ["admin-status", "speed"])
+
     async def test_clear_ds(self):
         def test():
             conn = Connector()
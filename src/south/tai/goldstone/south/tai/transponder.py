@@ -1,4 +1,5 @@
 import logging
+import os
 import taish
 import asyncio
 import json
@@ -7,12 +8,15 @@ import base64
 import libyang
 from goldstone.lib.core import ServerBase, ChangeHandler, NoOp
 from goldstone.lib.errors import InvalArgError, LockedError, NotFoundError
+from goldstone.lib.xpath import split as xpath_split
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_ADMIN_STATUS = "down"
 IGNORE_LEAVES = ["name", "enable-notify", "enable-alarm-notification"]
 
+OPER_CACHE_TTL = float(os.getenv("GOLDSTONE_TAI_OPER_CACHE_TTL", 1))
+
 TAI_STATUS_NOT_SUPPORTED = -0x00000002
 TAI_STATUS_ATTR_NOT_SUPPORTED_0 = -0x00050000
 TAI_STATUS_ATTR_NOT_SUPPORTED_MAX = -0x0005FFFF
@@ -25,6 +29,13 @@ def is_not_supported(code):
     )
 
 
+# convert a TAIException raised for an attribute to an error which tells the attribute
+def attr_error(name, e):
+    if is_not_supported(e.code):
+        return InvalArgError(f"unsupported attribute: {name}")
+    return InvalArgError(f"{name}: {e.msg}")
+
+
 async def cancel_notification_task(task):
     task.cancel()
     try:
@@ -45,7 +56,10 @@ class TAIHandler(ChangeHandler):
         self.attr_name = None
         self.obj = None
         self.value = None
-        self.original_value = None
+
+    # changes for different modules are applied concurrently
+    def resource_key(self):
+        return self.module.location
 
     async def validate(self, user):
         if not self.attr_name:
@@ -90,29 +104,12 @@ class TAIHandler(ChangeHandler):
 
             self.value = v
 
-    async def apply(self, user):
+    # attributes are set by TransponderServer.flush() with one set_multiple() per TAI object
+    # and reverted by ServerBase
+    def apply(self, user):
         if not self.attr_name:
             return
-        self.original_value = await self.obj.get(self.attr_name)
-        try:
-            await self.obj.set(self.attr_name, self.value)
-        except taish.TAIException as e:
-            if is_not_supported(e.code):
-                raise InvalArgError(f"unsupported attribute: {self.attr_name}")
-            raise InvalArgError(e.msg)
-
-    async def revert(self, user):
-        if not self.attr_name:
-            return
-        logger.warning(
-            f"reverting: {self.attr_name} {self.value} => {self.original_value}"
-        )
-        try:
-            await self.obj.set(self.attr_name, self.original_value)
-        except taish.TAIException as e:
-            if is_not_supported(e.code):
-                raise InvalArgError(f"unsupported attribute: {self.attr_name}")
-            raise InvalArgError(e.msg)
+        user["batch"].add(self.obj, self.attr_name, self.value, target_id=self.obj.oid)
 
 
 class ModuleHandler(TAIHandler):
@@ -169,37 +166,55 @@ class InterfaceHandler(TAIHandler):
                         f"host-interface({index}) has configuration that conflicts with line-rate: {self.value}"
                     )
 
+    # the hostifs must match the line-rate. the line-rate is not batched but written right after the hostif changes,
+    # following the writes batched so far, and reverted together with them
     async def apply(self, user):
-        if self.attr_name == "line-rate":
-            self.created = []
-            self.removed = []
-            num_hostifs = int(await self.module.get("num-host-interfaces"))
-            modules = self.server.modules[self.module.location]
-            async with modules["lock"]:
-                for index in range(self.num_hostifs):
-                    must_exists = index in self.hostifs
-                    try:
-                        hostif = self.module.get_hostif(index)
-                        if not must_exists:
-                            task = modules["hostifs"][index]
-                            await cancel_notification_task(task)
-                            logger.debug(f"removing hostif({index})")
-                            await self.server.taish.remove(hostif.oid)
-                            self.removed.append(index)
-                    except taish.TAIException:
-                        if must_exists:
-                            logger.debug(f"creating hostif({index})")
-                            hostif = await self.module.create_hostif(index)
-                            self.created.append(hostif)
-                            task = await self.server.create_tai_notif_task(hostif)
-                            modules["hostifs"][index] = task
+        if self.attr_name != "line-rate":
+            super().apply(user)
+            return
+
+        await self.server.flush_pending(user)
+        self.created = []
+        self.removed = []
+        self.original_value = None
+        original_value = await self.obj.get(self.attr_name)
+        num_hostifs = int(await self.module.get("num-host-interfaces"))
+        modules = self.server.modules[self.module.location]
+        async with modules["lock"]:
+            for index in range(self.num_hostifs):
+                must_exists = index in self.hostifs
+                try:
+                    hostif = self.module.get_hostif(index)
+                    if not must_exists:
+                        task = modules["hostifs"][index]
+                        await cancel_notification_task(task)
+                        logger.debug(f"removing hostif({index})")
+                        await self.server.taish.remove(hostif.oid)
+                        self.removed.append(index)
+                except taish.TAIException:
+                    if must_exists:
+                        logger.debug(f"creating hostif({index})")
+                        hostif = await self.module.create_hostif(index)
+                        self.created.append(hostif)
+                        task = await self.server.create_tai_notif_task(hostif)
+                        modules["hostifs"][index] = task
 
-        await super().apply(user)
+        try:
+            await self.obj.set(self.attr_name, self.value)
+        except taish.TAIException as e:
+            # ServerBase doesn't revert the handler which failed
+            await self.revert(user)
+            raise attr_error(self.attr_name, e)
+        self.original_value = original_value
 
     async def revert(self, user):
-        await super().revert(user)
-
         if self.attr_name == "line-rate":
+            if self.original_value != None:
+                logger.warning(
+                    f"reverting: {self.attr_name} {self.value} => {self.original_value}"
+                )
+                await self.obj.set(self.attr_name, self.original_value)
+                self.original_value = None
             modules = self.server.modules[self.module.location]
             async with modules["lock"]:
                 for obj in self.created:
@@ -235,7 +250,12 @@ def attr_tai2yang(attr, meta, schema):
 
 class TransponderServer(ServerBase):
     def __init__(self, conn, taish_server, platform_info):
-        super().__init__(conn, "goldstone-transponder")
+        super().__init__(
+            conn,
+            "goldstone-transponder",
+            oper_cache_ttls={"/goldstone-transponder:modules": OPER_CACHE_TTL},
+            parallel_apply=True,
+        )
         info = {}
         rate_info = {}
         for i in platform_info:
@@ -323,6 +343,10 @@ class TransponderServer(ServerBase):
             index = await obj.get("index")
             xpath = f"/goldstone-transponder:modules/module[name='{key}']/{type_}[name='{index}']/config/enable-{attr_meta.short_name}"
 
+        self.invalidate_oper_cache(
+            f"/goldstone-transponder:modules/module[name='{key}']"
+        )
+
         eventname = f"goldstone-transponder:{type_}-{attr_meta.short_name}-event"
 
         v = {"module-name": key}
@@ -514,6 +538,8 @@ class TransponderServer(ServerBase):
         logger.info(f"{xpath=}, {notif_type=}, {data=}, {timestamp=}, {priv=}")
         assert "piu-notify-event" in xpath
 
+        self.invalidate_oper_cache()
+
         name = data["name"]
         location = await self.name2location(name)
         status = [v for v in data.get("status", [])]
@@ -560,6 +586,37 @@ class TransponderServer(ServerBase):
         if self.is_initializing:
             raise LockedError("initializing")
 
+    async def flush(self, obj, writes):
+        names = [name for name, _ in writes]
+        try:
+            original = await obj.get_multiple(names)
+        except taish.TAIException:
+            # get one by one to tell which attribute failed
+            original = []
+            for name in names:
+                try:
+                    original.append(await obj.get(name))
+                except taish.TAIException as e:
+                    raise attr_error(name, e)
+
+        try:
+            await obj.set_multiple(writes)
+        except taish.TAIException:
+            # set one by one to tell which attribute failed. the attributes set before it are written back
+            written = []
+            for (name, value), v in zip(writes, original):
+                try:
+                    await obj.set(name, value)
+                except taish.TAIException as e:
+                    for n, o in reversed(written):
+                        try:
+                            await obj.set(n, o)
+                        except taish.TAIException as e2:
+                            logger.error(f"failed to write back {n}: {e2.msg}")
+                    raise attr_error(name, e)
+                written.append((name, v))
+        return list(zip(names, original))
+
     async def start(self):
         # get hardware configuration from platform datastore ( ONLP south must be running )
         xpath = "/goldstone-platform:components/component[state/type='PIU']"
@@ -669,7 +726,7 @@ class TransponderServer(ServerBase):
         super().stop()
 
     async def get_module_from_xpath(self, xpath):
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         logger.debug(f"xpath: {xpath}")
         if (
             len(xpath) < 2
@@ -465,6 +465,38 @@ class TestTransponderServerAttributeHandling(TestBase):
 
         await asyncio.to_thread(test)
 
+    async def test_set_line_rate_failure(self):
+        def test():
+            conn = Connector()
+            self.init(conn)
+
+            netif = self.objects["netif(0)"]
+            netif.set = mock.AsyncMock(side_effect=TAIException(-1, "fail"))
+
+            name = "piu1"
+            conn.set(
+                f"/goldstone-transponder:modules/module[name='{name}']/config/name",
+                name,
+            )
+            conn.set(
+                f"/goldstone-transponder:modules/module[name='{name}']/network-interface[name='0']/config/name",
+                "0",
+            )
+            conn.set(
+                f"/goldstone-transponder:modules/module[name='{name}']/network-interface[name='0']/config/line-rate",
+                "100g",
+            )
+            with self.assertRaisesRegex(CallbackFailedError, "line-rate: fail"):
+                conn.apply()
+
+            # the hostifs removed for the line-rate are created again
+            v = list(sorted(self.objects.keys()))
+            self.assertEqual(
+                v, ["hostif(0)", "hostif(1)", "hostif(2)", "hostif(3)", "netif(0)"]
+            )
+
+        await asyncio.to_thread(test)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,183 @@
+"""Change sources for ON_CHANGE subscriptions."""
+
+
+import logging
+import sysrepo
+from goldstone.lib.cache import covers, overlaps
+from goldstone.lib.xpath import split as xpath_split
+
+
+logger = logging.getLogger(__name__)
+
+
+def _interface_path(notif):
+    name = notif.get("if-name")
+    if name is None:
+        return "/goldstone-interfaces:interfaces"
+    return f"/goldstone-interfaces:interfaces/interface[name='{name}']"
+
+
+def _component_path(notif):
+    name = notif.get("name")
+    if name is None:
+        return "/goldstone-platform:components"
+    return f"/goldstone-platform:components/component[name='{name}']"
+
+
+def _module_path(notif):
+    name = notif.get("module-name")
+    if name is None:
+        return "/goldstone-transponder:modules"
+    return f"/goldstone-transponder:modules/module[name='{name}']"
+
+
+def _changed_path(notif):
+    return notif.get("path")
+
+
+def _is_config(path):
+    try:
+        return any(name == "config" for _, name, _ in xpath_split(path))
+    except ValueError:
+        return False
+
+
+class ChangeMonitor:
+    """Monitor of operational state changes.
+
+    It subscribes notifications which south daemons send when operational state data have changed and tells ON_CHANGE
+    subscriptions which data to sample. Subscriptions for paths without a change source should poll the data.
+
+    Args:
+        conn (ServerConnector): Connection with the central datastore.
+
+    Attributes:
+        SOURCES (list): Change sources. Tuples of the module name, the notification path, a function to get the path
+            to the changed data from a notification and the subtrees whose every change is notified. Other data in the
+            same module, e.g. counters, change without notifications.
+        GENERIC_SOURCE (tuple): Change source that any daemon may send. Daemons send it for the list entries changed
+            by every commit, so it covers all config data too, and SONiC sends it when PORT_TABLE changes.
+
+    TAI notifications are sent only for modules and interfaces with enable-notify or enable-alarm-notification set.
+    Changes which are not notified are caught by the periodic resync of ON_CHANGE subscriptions.
+    """
+
+    SOURCES = [
+        (
+            "goldstone-interfaces",
+            "/goldstone-interfaces:interface-link-state-notify-event",
+            _interface_path,
+            ["/goldstone-interfaces:interfaces/interface/state/oper-status"],
+        ),
+        (
+            "goldstone-platform",
+            "/goldstone-platform:piu-notify-event",
+            _component_path,
+            [
+                "/goldstone-platform:components/component/piu/state/piu-type",
+                "/goldstone-platform:components/component/piu/state/cfp2-presence",
+            ],
+        ),
+        (
+            "goldstone-platform",
+            "/goldstone-platform:transceiver-notify-event",
+            _component_path,
+            ["/goldstone-platform:components/component/transceiver/state/presence"],
+        ),
+        # TAI attribute notifications. e.g. "goldstone-transponder:network-interface-alarm-notification-event"
+        (
+            "goldstone-transponder",
+            "/goldstone-transponder:*",
+            _module_path,
+            [
+                "/goldstone-transponder:modules/module/state/oper-status",
+                "/goldstone-transponder:modules/module/network-interface/state/tx-align-status",
+                "/goldstone-transponder:modules/module/network-interface/state/rx-align-status",
+                "/goldstone-transponder:modules/module/host-interface/state/tx-align-status",
+                "/goldstone-transponder:modules/module/host-interface/state/tx-pcs-alarm",
+                "/goldstone-transponder:modules/module/host-interface/state/rx-pcs-alarm",
+            ],
+        ),
+    ]
+
+    GENERIC_SOURCE = (
+        "goldstone-telemetry",
+        "/goldstone-telemetry:oper-data-changed-event",
+        _changed_path,
+        [
+            "/goldstone-interfaces:interfaces/interface/state/admin-status",
+            "/goldstone-interfaces:interfaces/interface/state/oper-status",
+            "/goldstone-interfaces:interfaces/interface/state/alias",
+            "/goldstone-interfaces:interfaces/interface/state/lanes",
+            "/goldstone-interfaces:interfaces/interface/ethernet/state/speed",
+            "/goldstone-interfaces:interfaces/interface/ethernet/state/mtu",
+        ],
+    )
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._subtrees = []
+        self._config_notified = False
+        self._listeners = {}
+
+    def start(self):
+        """Subscribe change sources."""
+        for module, xpath, to_path, subtrees in self.SOURCES + [self.GENERIC_SOURCE]:
+            try:
+                self._conn.subscribe_notification(
+                    module, xpath, self._notification_cb, to_path
+                )
+            except sysrepo.SysrepoError as e:
+                logger.warning("Change source %s is not available. %s", xpath, e)
+                continue
+            self._subtrees += subtrees
+            if xpath == self.GENERIC_SOURCE[1]:
+                self._config_notified = True
+
+    def has_source(self, path):
+        """Check whether all changes of the data are notified.
+
+        Args:
+            path (str): Path to the data.
+
+        Returns:
+            bool: True if a change source covers the data.
+        """
+        if self._config_notified and _is_config(path):
+            return True
+        return any(covers(subtree, path) for subtree in self._subtrees)
+
+    def add(self, key, path, callback):
+        """Add a listener of changes.
+
+        Args:
+            key (any): Identifier of the listener.
+            path (str): Path to the data to monitor.
+            callback (func): Function to call with the path to the changed data.
+        """
+        self._listeners[key] = (path, callback)
+
+    def remove(self, key):
+        """Remove a listener of changes.
+
+        Args:
+            key (any): Identifier of the listener.
+        """
+        self._listeners.pop(key, None)
+
+    def notify(self, xpath):
+        """Tell listeners that the data have changed.
+
+        Args:
+            xpath (str): Path to the changed data.
+        """
+        for path, callback in list(self._listeners.values()):
+            if overlaps(path, xpath):
+                callback(xpath)
+
+    async def _notification_cb(self, xpath, notif_type, value, timestamp, priv):
+        changed = priv(value)
+        if changed is None:
+            return
+        logger.debug("Change notification %s: %s", xpath, changed)
+        self.notify(changed)
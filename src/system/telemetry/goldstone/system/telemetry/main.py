@@ -6,25 +6,42 @@ import asyncio
 import argparse
 import signal
 import itertools
+import os
 from goldstone.lib.util import start_probe, call
 from goldstone.lib.connector.sysrepo import Connector
-from .store import InMemorySubscriptionStore, InMemoryTelemetryStore
+from .store import (
+    InMemorySubscriptionStore,
+    InMemoryTelemetryStore,
+    ColumnarTelemetryStore,
+    PersistentSubscriptionStore,
+    PersistentTelemetryStore,
+)
 from .telemetry import TelemetryServer
 
 
 logger = logging.getLogger(__name__)
 
 
+TELEMETRY_STORES = {
+    "memory": InMemoryTelemetryStore,
+    "columnar": ColumnarTelemetryStore,
+}
+
+
 def main():
-    async def _main():
+    async def _main(telemetry_store_type, state_dir):
         loop = asyncio.get_event_loop()
         stop_event = asyncio.Event()
         loop.add_signal_handler(signal.SIGINT, stop_event.set)
         loop.add_signal_handler(signal.SIGTERM, stop_event.set)
 
         conn = Connector()
-        subscription_store = InMemorySubscriptionStore()
-        telemetry_store = InMemoryTelemetryStore()
+        if state_dir:
+            subscription_store = PersistentSubscriptionStore(state_dir)
+            telemetry_store = PersistentTelemetryStore(state_dir)
+        else:
+            subscription_store = InMemorySubscriptionStore()
+            telemetry_store = TELEMETRY_STORES[telemetry_store_type]()
         gsserver = TelemetryServer(conn, subscription_store, telemetry_store)
         servers = [gsserver]
 
@@ -54,8 +71,29 @@ def main():
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable detailed output"
     )
+    parser.add_argument(
+        "--telemetry-store",
+        choices=TELEMETRY_STORES.keys(),
+        help="datastore for telemetry data (default: columnar). "
+        "only columnar can be used with --state-dir",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=os.getenv("GOLDSTONE_TELEMETRY_STATE_DIR"),
+        help="directory to keep subscriptions and telemetry data across restarts. "
+        "telemetry data are kept in a columnar datastore backed by a file in it "
+        "(env: GOLDSTONE_TELEMETRY_STATE_DIR)",
+    )
     args = parser.parse_args()
 
+    # the persistent telemetry datastore is a columnar one
+    if args.state_dir and args.telemetry_store not in [None, "columnar"]:
+        parser.error(
+            f"--telemetry-store {args.telemetry_store} cannot be used with --state-dir"
+        )
+    if args.telemetry_store is None:
+        args.telemetry_store = "columnar"
+
     fmt = "%(levelname)s %(module)s %(funcName)s l.%(lineno)d | %(message)s"
     if args.verbose:
         logging.basicConfig(level=logging.DEBUG, format=fmt)
@@ -69,7 +107,7 @@ def main():
     else:
         logging.basicConfig(level=logging.INFO, format=fmt)
 
-    asyncio.run(_main())
+    asyncio.run(_main(args.telemetry_store, args.state_dir))
 
 
 if __name__ == "__main__":
@@ -4,21 +4,26 @@
 import logging
 import re
 import libyang
+from goldstone.lib.xpath import split as xpath_split
 
 
 logger = logging.getLogger(__name__)
 
 
 class PathParser:
-    """A path parser."""
+    """A path parser.
+
+    Args:
+        ctx (libyang.Context): Context to look up schema nodes.
+        conn (Connector): Connector to look up schema nodes. If given, its schema node cache is used instead of ctx.
+    """
 
     REGEX_PTN_LIST_KEY = re.compile(r"\[.*.*\]")
 
-    def __init__(self, ctx):
+    def __init__(self, ctx, conn=None):
         self._ctx = ctx
-
-    def _is_container(self, data):
-        return isinstance(data, dict)
+        self._conn = conn
+        self._list_keys = {}  # key: schema path, value: names of list keys
 
     def _is_container_list(self, data):
         if isinstance(data, list):
@@ -39,6 +44,8 @@ class PathParser:
         return re.sub(self.REGEX_PTN_LIST_KEY, "", path)
 
     def _find_node(self, path):
+        if self._conn is not None:
+            return self._conn.find_node(path)
         path = self._remove_list_keys(path)
         path_elems = path.split("/")[1:]
         node = next(self._find_head_node("/" + path_elems[0]))
@@ -48,74 +55,40 @@ class PathParser:
         return node
 
     def _get_list_keys(self, path):
-        node = self._find_node(path)
-        keys = []
-        for key in node.keys():
-            keys.append(key.name())
+        keys = self._list_keys.get(path)
+        if keys is None:
+            node = self._find_node(path)
+            keys = [key.name() for key in node.keys()]
+            self._list_keys[path] = keys
         return keys
 
-    def _path_with_keys(self, container, path):
-        keys_str = ""
-        keys = self._get_list_keys(path)
-        for key in keys:
-            val = container[key]
-            keys_str = f"{keys_str}[{key}='{val}']"
-        return f"{path}{keys_str}"
-
-    def _get_leaves(self, data, path, leaves):
-        if self._is_container(data):
-            for next_node, next_data in data.items():
-                next_path = f"{path}/{next_node}"
-                self._get_leaves(next_data, next_path, leaves)
-        elif self._is_container_list(data):
-            for container in data:
-                next_path = self._path_with_keys(container, path)
-                self._get_leaves(container, next_path, leaves)
-        else:
-            leaves[path] = data
+    def compile(self, path):
+        """Compile a plan to parse data trees of a path.
+
+        Args:
+            path (str): Path to the target node.
+
+        Returns:
+            LeafPlan: Plan to parse data trees of the path.
+        """
+        return LeafPlan(self, path)
 
-    def _get_path_elems(self, path):
-        return self._remove_list_keys(path).split("/")[1:]
-
-    def _prune_leaves(self, leaves, path):
-        path_elems = self._get_path_elems(path)
-        sub_paths_to_delete = []
-        for sub_path in leaves:
-            sub_path_elems = self._get_path_elems(sub_path)
-            if len(sub_path_elems) < len(path_elems):
-                sub_paths_to_delete.append(sub_path)
-                continue
-            for index in range(len(path_elems)):
-                if path_elems[index] != sub_path_elems[index]:
-                    sub_paths_to_delete.append(sub_path)
-                    break
-        for sub_path in sub_paths_to_delete:
-            try:
-                del leaves[sub_path]
-            except KeyError:
-                continue
-
-    def parse_dict_into_leaves(self, data, path):
+    def parse_dict_into_leaves(self, data, path, plan=None):
         """Parse a data tree dictionaly into path to leaves.
 
         Args:
             data (dict): Data tree in dictionaly to parse.
             path (str): Path to the target node. It will be used to prune unnecessary leaves.
+            plan (LeafPlan): Plan compiled for the path. If None, it is compiled for this call.
 
         Returns:
             dict: Parsed data.
               key: Path to a leaf node.
               value: Data of a leaf node.
         """
-        dict_to_parse = {}
-        top_prefix = self._get_path_elems(path)[0].split(":")[0]
-        for key, value in data.items():
-            new_key = top_prefix + ":" + key
-            dict_to_parse[new_key] = value
-        leaves = {}
-        self._get_leaves(dict_to_parse, "", leaves)
-        self._prune_leaves(leaves, path)
-        return leaves
+        if plan is None:
+            plan = self.compile(path)
+        return plan.parse(data)
 
     def is_valid_path(self, path):
         """Validate a schema path.
@@ -132,3 +105,70 @@ class PathParser:
         except libyang.LibyangError:
             return False
         return True
+
+
+class LeafPlan:
+    """A plan to parse data trees of a path into leaves.
+
+    It is compiled once for a path and used for every sample of the path. Names of list keys are looked up in the
+    schema once per list and cached by the parser. Nodes out of the path are pruned while parsing.
+
+    Args:
+        parser (PathParser): Parser to look up list keys.
+        path (str): Path to the target node.
+    """
+
+    def __init__(self, parser, path):
+        self._parser = parser
+        self.path = path
+        self._path_elems = [
+            f"{prefix}:{name}" if prefix else name
+            for prefix, name, _ in xpath_split(path)
+        ]
+        self._top_prefix = self._path_elems[0].split(":")[0]
+
+    def parse(self, data):
+        """Parse a data tree dictionaly into path to leaves.
+
+        Args:
+            data (dict): Data tree in dictionaly to parse.
+
+        Returns:
+            dict: Parsed data.
+              key: Path to a leaf node.
+              value: Data of a leaf node.
+        """
+        leaves = {}
+        prefix = self._top_prefix
+        self._get_leaves(
+            {f"{prefix}:{name}": value for name, value in data.items()},
+            "",
+            "",
+            0,
+            leaves,
+        )
+        return leaves
+
+    def _get_leaves(self, data, path, schema_path, depth, leaves):
+        path_elems = self._path_elems
+        if isinstance(data, dict):
+            prune = depth < len(path_elems)
+            for name, child in data.items():
+                if prune and name != path_elems[depth]:
+                    continue
+                self._get_leaves(
+                    child,
+                    f"{path}/{name}",
+                    f"{schema_path}/{name}",
+                    depth + 1,
+                    leaves,
+                )
+        elif self._parser._is_container_list(data):
+            keys = self._parser._get_list_keys(schema_path)
+            for container in data:
+                keys_str = "".join(f"[{key}='{container[key]}']" for key in keys)
+                self._get_leaves(
+                    container, f"{path}{keys_str}", schema_path, depth, leaves
+                )
+        elif depth >= len(path_elems):
+            leaves[path] = data
@@ -0,0 +1,245 @@
+"""Sampling scheduler shared by telemetry subscriptions."""
+
+
+import logging
+import asyncio
+import time
+from .path import PathParser
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Member:
+    """A subscription in a sampling group."""
+
+    def __init__(self, interval, deadline, callback, stats):
+        self.interval = interval
+        self.deadline = deadline  # time of the next sample. time.monotonic_ns()
+        self.callback = callback
+        self.stats = stats
+
+
+class Sampler:
+    """Sampling scheduler shared by telemetry subscriptions.
+
+    Subscriptions with the same path are grouped. A subscription is due at every multiple of its interval since the
+    group was created, so subscriptions whose intervals are multiples of each other, e.g. 1 and 2 seconds, are due at
+    the same ticks. A group fetches the data once per tick and gives the sampled leaves to every subscription due.
+
+    Data are fetched, parsed and given to the subscriptions by the worker threads of the connector (conn.aio) so that
+    large samples don't block the event loop. Callbacks are called by a worker thread. If the last sample of a group
+    is still in flight when the next tick comes, the tick is skipped and counted instead of being queued. The next
+    sample gets the latest data anyway.
+
+    Args:
+        conn (SysrepoConnection): Connection with the central datastore.
+
+    Attributes:
+        fetches (int): Number of data fetches.
+        samples (int): Number of samples given to subscriptions.
+        skips (int): Number of ticks skipped because the last sample was in flight.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._aio = conn.aio
+        self._path_parser = PathParser(self._conn.ctx, self._conn)
+        self._groups = {}  # key: path, value: {subscription key: _Member}
+        self._epochs = {}  # key: path, value: time when the group was created
+        self._wakeups = {}  # key: path, value: asyncio.Event to reschedule the group
+        self._tasks = {}  # key: path, value: sampling task
+        self._keys = {}  # key: subscription key, value: path
+        self._plans = {}  # key: path, value: path.LeafPlan
+        self._skipped = {}  # key: subscription key, value: number of skipped ticks
+        self.fetches = 0
+        self.samples = 0
+        self.skips = 0
+
+    async def get(self, xpath):
+        """Get leaves of the data.
+
+        Args:
+            xpath (str): Path to the data.
+
+        Returns:
+            dict: Parsed data.
+              key: Path to a leaf node.
+              value: Data of a leaf node.
+        """
+        data = await self._aio.get_operational(xpath, strip=False)
+        return await self._aio.run(self._parse, xpath, data)
+
+    def _parse(self, xpath, data):
+        # NOTE: Connector returns a value None instead of raising an exception if the data was not found.
+        if data is None:
+            logger.info("data for path %s is not found.", xpath)
+            data = {}
+        return self._path_parser.parse_dict_into_leaves(
+            data, xpath, self._plans.get(xpath)
+        )
+
+    def _next_deadline(self, path, interval, now):
+        epoch = self._epochs[path]
+        return epoch + ((now - epoch) // interval + 1) * interval
+
+    def add(self, key, path, interval, callback, stats=None):
+        """Add a subscription to sample.
+
+        Args:
+            key (any): Identifier of the subscription.
+            path (str): Path to the data to sample.
+            interval (int): Sampling interval in nanoseconds.
+            callback (func): Function to call with the sampled leaves. It is called by a worker thread.
+            stats (stats.SubscriptionStats): Statistics to record samples and errors of the subscription.
+        """
+        self.remove(key)
+        now = time.monotonic_ns()
+        if path not in self._groups:
+            self._groups[path] = {}
+            self._epochs[path] = now
+            self._wakeups[path] = asyncio.Event()
+            self._plans[path] = self._path_parser.compile(path)
+            self._tasks[path] = asyncio.create_task(self._loop(path))
+        self._groups[path][key] = _Member(
+            interval, self._next_deadline(path, interval, now), callback, stats
+        )
+        self._keys[key] = path
+        self._wakeups[path].set()
+
+    def remove(self, key):
+        """Remove a subscription.
+
+        Args:
+            key (any): Identifier of the subscription.
+        """
+        path = self._keys.pop(key, None)
+        self._skipped.pop(key, None)
+        if path is None:
+            return
+        members = self._groups[path]
+        del members[key]
+        if len(members) == 0:
+            del self._groups[path]
+            del self._epochs[path]
+            del self._wakeups[path]
+            del self._plans[path]
+            self._tasks.pop(path).cancel()
+
+    def stop(self):
+        """Stop all sampling."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._groups = {}
+        self._epochs = {}
+        self._wakeups = {}
+        self._tasks = {}
+        self._keys = {}
+        self._plans = {}
+        self._skipped = {}
+
+    def skipped(self, key):
+        """Get the number of ticks skipped for a subscription.
+
+        Args:
+            key (any): Identifier of the subscription.
+
+        Returns:
+            int: Number of ticks skipped because the last sample was in flight.
+        """
+        return self._skipped.get(key, 0)
+
+    def stats(self):
+        """Get counters of the sampler.
+
+        Returns:
+            dict: "groups", "fetches", "samples", "fetches-saved" and "skips".
+        """
+        return {
+            "groups": len(self._groups),
+            "fetches": self.fetches,
+            "samples": self.samples,
+            "fetches-saved": self.samples - self.fetches,
+            "skips": self.skips,
+        }
+
+    async def _loop(self, path):
+        members = self._groups[path]
+        wakeup = self._wakeups[path]
+        task = None
+        try:
+            while members:
+                now = time.monotonic_ns()
+                deadline = min(member.deadline for member in members.values())
+                if deadline > now:
+                    # Sleep until the next tick. Added subscriptions may bring it forward.
+                    wakeup.clear()
+                    try:
+                        await asyncio.wait_for(
+                            wakeup.wait(), (deadline - now) / 1000 / 1000 / 1000
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                due = {}
+                for key, member in members.items():
+                    if member.deadline > now:
+                        continue
+                    due[key] = member
+                    member.deadline = self._next_deadline(path, member.interval, now)
+                if task is not None and not task.done():
+                    self.skips += 1
+                    for key in due:
+                        self._skipped[key] = self._skipped.get(key, 0) + 1
+                    logger.debug(
+                        "Skipped a tick of %s. The last sample is in flight.", path
+                    )
+                    continue
+                task = asyncio.create_task(self._sample(path, list(due.values())))
+        finally:
+            if task is not None:
+                task.cancel()
+
+    def _deliver(self, path, data, callbacks):
+        data = self._parse(path, data)
+        parsed = time.monotonic_ns()
+        errors = []
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+        return len(data), parsed, errors
+
+    async def _sample(self, path, members):
+        start = time.monotonic_ns()
+        try:
+            data = await self._aio.get_operational(path, strip=False)
+            # The sampled leaves are diffed and notified in the same worker step as they are parsed.
+            leaves, parsed, errors = await self._aio.run(
+                self._deliver, path, data, [member.callback for member in members]
+            )
+        except Exception as e:
+            logger.error("Failed to sample %s. %s: %s", path, type(e).__name__, e)
+            for member in members:
+                if member.stats is not None:
+                    member.stats.record_error(e)
+            return
+        duration = parsed - start
+        self.fetches += 1
+        shared = len(members) > 1
+        for member, e in zip(members, errors):
+            self.samples += 1
+            if member.stats is not None:
+                member.stats.record_sample(duration, leaves, shared)
+            if e is None:
+                continue
+            logger.error(
+                "Failed to update current state and send notification. %s: %s",
+                type(e).__name__,
+                e,
+            )
+            if member.stats is not None:
+                member.stats.record_error(e)
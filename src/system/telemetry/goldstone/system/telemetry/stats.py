@@ -0,0 +1,96 @@
+"""Statistics of telemetry subscriptions."""
+
+
+import bisect
+
+
+class SubscriptionStats:
+    """Statistics of a subscription.
+
+    Attributes:
+        DURATION_BUCKETS (list of int): Upper bounds of the buckets of the sample duration histogram in nanoseconds.
+            Samples longer than the last bound are counted in the bucket with NO_UPPER_BOUND.
+        NO_UPPER_BOUND (int): Upper bound of the last bucket. The maximum value of uint64.
+        samples (int): Number of samples.
+        shared_samples (int): Number of samples taken by a fetch shared with other subscriptions.
+        sampled_leaves (int): Total number of leaves in the samples.
+        last_sampled_leaves (int): Number of leaves in the last sample.
+        sample_duration_total (int): Total time to fetch and parse the samples in nanoseconds.
+        sample_durations (list of int): Number of samples in each bucket of the sample duration histogram.
+        notifications (int): Number of notifications sent.
+        last_error (str): Last error. None if no error has happened.
+    """
+
+    DURATION_BUCKETS = [
+        1 * 1000 * 1000,
+        10 * 1000 * 1000,
+        100 * 1000 * 1000,
+        1000 * 1000 * 1000,
+        10 * 1000 * 1000 * 1000,
+    ]
+    NO_UPPER_BOUND = 2**64 - 1
+
+    def __init__(self):
+        self.samples = 0
+        self.shared_samples = 0
+        self.sampled_leaves = 0
+        self.last_sampled_leaves = 0
+        self.sample_duration_total = 0
+        self.sample_durations = [0] * (len(self.DURATION_BUCKETS) + 1)
+        self.notifications = 0
+        self.last_error = None
+
+    def record_sample(self, duration, leaves, shared=False):
+        """Record a sample.
+
+        Args:
+            duration (int): Time to fetch and parse the sample in nanoseconds.
+            leaves (int): Number of leaves in the sample.
+            shared (bool): True if the fetch was shared with other subscriptions.
+        """
+        self.samples += 1
+        if shared:
+            self.shared_samples += 1
+        self.sampled_leaves += leaves
+        self.last_sampled_leaves = leaves
+        self.sample_duration_total += duration
+        self.sample_durations[bisect.bisect_left(self.DURATION_BUCKETS, duration)] += 1
+
+    def record_notification(self):
+        """Record a notification sent."""
+        self.notifications += 1
+
+    def record_error(self, error):
+        """Record an error.
+
+        Args:
+            error (Exception): The error.
+        """
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self, skipped_ticks=0):
+        """Get the statistics as goldstone-telemetry subscription statistics.
+
+        Args:
+            skipped_ticks (int): Number of sampling ticks skipped.
+
+        Returns:
+            dict: The statistics.
+        """
+        bounds = self.DURATION_BUCKETS + [self.NO_UPPER_BOUND]
+        data = {
+            "samples": self.samples,
+            "shared-samples": self.shared_samples,
+            "sampled-leaves": self.sampled_leaves,
+            "last-sampled-leaves": self.last_sampled_leaves,
+            "sample-duration-total": self.sample_duration_total,
+            "sample-duration": [
+                {"upper-bound": bound, "count": count}
+                for bound, count in zip(bounds, self.sample_durations)
+            ],
+            "notifications": self.notifications,
+            "skipped-ticks": skipped_ticks,
+        }
+        if self.last_error is not None:
+            data["last-error"] = self.last_error
+        return data
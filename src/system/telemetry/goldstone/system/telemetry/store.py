@@ -2,7 +2,14 @@
 
 
 from abc import abstractmethod
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import array
+import functools
+import json
+import os
+import threading
+import time
 import logging
 
 
@@ -13,12 +20,26 @@ class TelemetryNotExistError(Exception):
     pass
 
 
+def _synchronized(f):
+    @functools.wraps(f)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return f(self, *args, **kwargs)
+
+    return wrapper
+
+
 class TelemetryStore:
     """Base class for telemetry datastore.
 
-    Users should depend on this interface instead of subclass implementations.
+    Users should depend on this interface instead of subclass implementations. Datastores are used by the sampling
+    worker threads and the event loop; implementations must be thread-safe. Methods of the base class hold the lock
+    of the datastore.
     """
 
+    def __init__(self):
+        self._lock = threading.RLock()
+
     @abstractmethod
     def set(self, ids, path, value):
         """Set a telemetry data.
@@ -83,6 +104,99 @@ class TelemetryStore:
         """
         pass
 
+    @abstractmethod
+    def discard(self, outer_id):
+        """Delete all telemetry data of a request.
+
+        Args:
+            outer_id (int): Outer ID. Request ID.
+        """
+        pass
+
+    def close(self):
+        """Release resources of the datastore."""
+        pass
+
+    def persist(self, ids):
+        """Keep telemetry data of a subscription across restarts of the application.
+
+        Only subscriptions which compare samples with the last sent values need it. Datastores which don't survive
+        restarts ignore it.
+
+        Args:
+            ids (tupple of int): Identifier of the subscription
+                0: Outer ID. Request ID.
+                1: Inner ID. Subscription ID.
+        """
+        pass
+
+    @_synchronized
+    def items(self, ids):
+        """Get all telemetry data of a subscription.
+
+        Args:
+            ids (tupple of int): Identifier of the subscription
+                0: Outer ID. Request ID.
+                1: Inner ID. Subscription ID.
+
+        Returns:
+            dict: The telemetry data.
+                key: Path to a leaf node.
+                value: The telemetry data.
+        """
+        return {path: self.get(ids, path)["value"] for path in self.list(ids)}
+
+    @_synchronized
+    def update(
+        self, ids, data, suppress_redundant=False, heartbeat_interval=0, prefix=None
+    ):
+        """Update telemetry data of a subscription with a sample.
+
+        It sets the sampled values and deletes telemetry data which are not in the sample.
+
+        Args:
+            ids (tupple of int): Identifier of the subscription
+                0: Outer ID. Request ID.
+                1: Inner ID. Subscription ID.
+            data (dict): Sampled telemetry data.
+                key: Path to a leaf node.
+                value: The telemetry data.
+            suppress_redundant (bool): If True, values which have not changed are not updated.
+            heartbeat_interval (int): Interval in nanoseconds to update values even if they have not changed. 0
+                disables it.
+            prefix (str): Path to the sampled data. Telemetry data out of it are not deleted. None if all data of the
+                subscription were sampled.
+
+        Returns:
+            tuple: (updates, deletes).
+                updates (dict): Updated telemetry data. key: path to a leaf node, value: the telemetry data.
+                deletes (list of str): Paths to deleted leaf nodes.
+        """
+        hb = timedelta(microseconds=heartbeat_interval / 1000)
+        now = datetime.now()
+        updates = {}
+        for path, value in data.items():
+            if suppress_redundant:
+                try:
+                    prev = self.get(ids, path)
+                except TelemetryNotExistError:
+                    # The data node of the path is created.
+                    prev = None
+                if prev is not None and value == prev["value"]:
+                    if hb <= timedelta(0) or now - prev["update-time"] <= hb:
+                        continue
+            self.set(ids, path, value)
+            updates[path] = value
+        deletes = [
+            path
+            for path in self.list(ids)
+            if path not in data
+            and (prefix is None or path == prefix or path.startswith(prefix + "/"))
+        ]
+        for path in deletes:
+            self.delete(ids, path)
+        return updates, deletes
+
 
 class InMemoryTelemetryStore(TelemetryStore):
     """A telemetry datastore implementation using volatile memory.
@@ -91,8 +205,10 @@ class InMemoryTelemetryStore(TelemetryStore):
     """
 
     def __init__(self):
+        super().__init__()
         self._data = {}
 
+    @_synchronized
     def set(self, ids, path, value):
         outer_id, inner_id = ids
         if outer_id not in self._data.keys():
@@ -105,6 +221,7 @@ class InMemoryTelemetryStore(TelemetryStore):
         }
         self._data[outer_id][inner_id][path] = data
 
+    @_synchronized
     def delete(self, ids, path):
         outer_id, inner_id = ids
         try:
@@ -116,6 +233,7 @@ class InMemoryTelemetryStore(TelemetryStore):
         except KeyError as e:
             raise TelemetryNotExistError() from e
 
+    @_synchronized
     def get(self, ids, path):
         outer_id, inner_id = ids
         try:
@@ -123,6 +241,7 @@ class InMemoryTelemetryStore(TelemetryStore):
         except KeyError as e:
             raise TelemetryNotExistError() from e
 
+    @_synchronized
     def list(self, ids):
         outer_id, inner_id = ids
         outer = self._data.get(outer_id)
@@ -131,7 +250,399 @@ class InMemoryTelemetryStore(TelemetryStore):
         inner = outer.get(inner_id)
         if inner is None:
             return []
-        return inner.keys()
+        return list(inner)
+
+    @_synchronized
+    def discard(self, outer_id):
+        self._data.pop(outer_id, None)
+
+
+class _Columns:
+    """Telemetry data of a subscription in parallel arrays."""
+
+    def __init__(self):
+        self.slots = {}  # key: path ID, value: index of the arrays
+        self.path_ids = array.array("q")
+        self.values = []
+        self.times = array.array("q")  # update time. time.monotonic_ns()
+        self.marks = array.array(
+            "q"
+        )  # generation of the last sample which had the path
+        self.generation = 0
+
+    def append(self, path_id, value, now):
+        self.slots[path_id] = len(self.values)
+        self.path_ids.append(path_id)
+        self.values.append(value)
+        self.times.append(now)
+        self.marks.append(self.generation)
+
+    def remove(self, slot):
+        # Move the last entry to the slot.
+        last = len(self.values) - 1
+        del self.slots[self.path_ids[slot]]
+        if slot != last:
+            self.slots[self.path_ids[last]] = slot
+            self.path_ids[slot] = self.path_ids[last]
+            self.values[slot] = self.values[last]
+            self.times[slot] = self.times[last]
+            self.marks[slot] = self.marks[last]
+        self.path_ids.pop()
+        self.values.pop()
+        self.times.pop()
+        self.marks.pop()
+
+
+class ColumnarTelemetryStore(TelemetryStore):
+    """A compact telemetry datastore implementation using volatile memory.
+
+    Paths are interned into integer IDs shared by all subscriptions. Values and update times of a subscription are
+    kept in parallel arrays. Use items() and update() to handle a sample in one pass.
+
+    If you want to keep telemetry data after rebooting your application, you should not use this.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._path_ids = {}  # key: path, value: path ID
+        self._paths = []  # index: path ID, value: path
+        self._refs = (
+            []
+        )  # index: path ID, value: number of subscriptions which have the path
+        self._free_ids = []
+        self._columns = {}  # key: ids, value: _Columns
+
+    def _intern(self, path):
+        path_id = self._path_ids.get(path)
+        if path_id is None:
+            if self._free_ids:
+                path_id = self._free_ids.pop()
+                self._paths[path_id] = path
+                self._refs[path_id] = 0
+            else:
+                path_id = len(self._paths)
+                self._paths.append(path)
+                self._refs.append(0)
+            self._path_ids[path] = path_id
+        return path_id
+
+    def _release(self, path_id):
+        self._refs[path_id] -= 1
+        if self._refs[path_id] <= 0:
+            del self._path_ids[self._paths[path_id]]
+            self._paths[path_id] = None
+            self._free_ids.append(path_id)
+
+    def _append(self, columns, path, value, now):
+        path_id = self._intern(path)
+        self._refs[path_id] += 1
+        columns.append(path_id, value, now)
+
+    def _remove(self, ids, columns, slot):
+        path_id = columns.path_ids[slot]
+        columns.remove(slot)
+        self._release(path_id)
+        if len(columns.values) == 0:
+            del self._columns[ids]
+
+    def _find(self, ids, path):
+        columns = self._columns.get(ids)
+        path_id = self._path_ids.get(path)
+        if columns is None or path_id is None:
+            raise TelemetryNotExistError()
+        slot = columns.slots.get(path_id)
+        if slot is None:
+            raise TelemetryNotExistError()
+        return columns, slot
+
+    @_synchronized
+    def set(self, ids, path, value):
+        now = time.monotonic_ns()
+        try:
+            columns, slot = self._find(ids, path)
+        except TelemetryNotExistError:
+            columns = self._columns.setdefault(ids, _Columns())
+            self._append(columns, path, value, now)
+            return
+        columns.values[slot] = value
+        columns.times[slot] = now
+
+    @_synchronized
+    def delete(self, ids, path):
+        columns, slot = self._find(ids, path)
+        self._remove(ids, columns, slot)
+
+    @_synchronized
+    def get(self, ids, path):
+        columns, slot = self._find(ids, path)
+        elapsed = time.monotonic_ns() - columns.times[slot]
+        return {
+            "value": columns.values[slot],
+            "update-time": datetime.now() - timedelta(microseconds=elapsed / 1000),
+        }
+
+    @_synchronized
+    def list(self, ids):
+        columns = self._columns.get(ids)
+        if columns is None:
+            return []
+        return [self._paths[path_id] for path_id in columns.path_ids]
+
+    @_synchronized
+    def discard(self, outer_id):
+        for ids in [ids for ids in self._columns if ids[0] == outer_id]:
+            columns = self._columns.pop(ids)
+            for path_id in columns.path_ids:
+                self._release(path_id)
+
+    @_synchronized
+    def items(self, ids):
+        columns = self._columns.get(ids)
+        if columns is None:
+            return {}
+        return dict(zip(self.list(ids), columns.values))
+
+    @_synchronized
+    def update(
+        self, ids, data, suppress_redundant=False, heartbeat_interval=0, prefix=None
+    ):
+        now = time.monotonic_ns()
+        columns = self._columns.setdefault(ids, _Columns())
+        columns.generation += 1
+        generation = columns.generation
+        slots = columns.slots
+        values = columns.values
+        times = columns.times
+        marks = columns.marks
+        path_ids = self._path_ids
+        updates = {}
+        for path, value in data.items():
+            path_id = path_ids.get(path)
+            slot = None if path_id is None else slots.get(path_id)
+            if slot is None:
+                # The data node of the path is created.
+                self._append(columns, path, value, now)
+                updates[path] = value
+                continue
+            marks[slot] = generation
+            if (
+                suppress_redundant
+                and value == values[slot]
+                and (heartbeat_interval <= 0 or now - times[slot] <= heartbeat_interval)
+            ):
+                continue
+            values[slot] = value
+            times[slot] = now
+            updates[path] = value
+        deletes = []
+        for slot in reversed(range(len(values))):
+            if marks[slot] == generation:
+                continue
+            path = self._paths[columns.path_ids[slot]]
+            if prefix is None or path == prefix or path.startswith(prefix + "/"):
+                deletes.append(path)
+                self._remove(ids, columns, slot)
+        if len(values) == 0:
+            self._columns.pop(ids, None)
+        return updates, deletes
+
+
+class PersistentTelemetryStore(ColumnarTelemetryStore):
+    """A telemetry datastore implementation which keeps telemetry data in a file.
+
+    Telemetry data are kept in memory as ColumnarTelemetryStore does. Changes of the subscriptions given to persist()
+    are appended to a log file in the directory and replayed when the datastore is created, so the last sent values
+    survive restarts of the application. Only the last change of each leaf is written, at most every FLUSH_INTERVAL
+    seconds. The log is rewritten with the current data when it has grown much larger than the data.
+
+    The file is written by a dedicated thread not to block the event loop. Values must be JSON types, i.e. str, int,
+    float, bool, None or lists of them, so that they are restored with the same types.
+
+    Args:
+        directory (str): Directory to keep the log file in.
+
+    Attributes:
+        FLUSH_INTERVAL (float): Interval in seconds to write changes to the log file.
+        COMPACT_THRESHOLD (int): Minimum number of records in the log file to rewrite it.
+    """
+
+    LOG_FILE = "telemetry.log"
+    FLUSH_INTERVAL = float(os.getenv("GOLDSTONE_TELEMETRY_STORE_FLUSH_INTERVAL", 1))
+    COMPACT_THRESHOLD = 10000
+    VALUE_TYPES = (str, int, float, bool, type(None))
+
+    def __init__(self, directory):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, self.LOG_FILE)
+        self._log = None  # written by the writer thread only
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="goldstone-telemetry-store"
+        )
+        self._persistent = set()  # identifiers of the subscriptions to persist
+        self._records = 0
+        self._dirty = {}  # key: (ids, path), value: record to write
+        self._last_flush = time.monotonic()
+        self._load()
+        self._compact()
+
+    def _load(self):
+        try:
+            f = open(self._log_path)
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    op, *args = json.loads(line)
+                    if op == "s":
+                        rid, sid, path, value = args
+                        super().set((rid, sid), path, value)
+                        self._persistent.add((rid, sid))
+                    elif op == "d":
+                        rid, sid, path = args
+                        super().delete((rid, sid), path)
+                    elif op == "c":
+                        super().discard(args[0])
+                except TelemetryNotExistError:
+                    continue
+                except ValueError as e:
+                    # The last record may be written partially.
+                    logger.warning(
+                        "Ignored a broken record in %s. %s", self._log_path, e
+                    )
+        logger.info("Restored telemetry data from %s", self._log_path)
+
+    def _submit(self, f, *args):
+        def done(future):
+            e = future.exception()
+            if e is not None:
+                logger.error(
+                    "Failed to write %s. %s: %s", self._log_path, type(e).__name__, e
+                )
+
+        self._writer.submit(f, *args).add_done_callback(done)
+
+    def _write(self, records):
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        self._log.write(lines)
+        self._log.flush()
+
+    def _rewrite(self, records):
+        tmp_path = self._log_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        if self._log is not None:
+            self._log.close()
+        os.replace(tmp_path, self._log_path)
+        self._log = open(self._log_path, "a")
+
+    def _compact(self):
+        records = []
+        for ids in self._persistent:
+            columns = self._columns.get(ids)
+            if columns is None:
+                continue
+            for path_id, value in zip(columns.path_ids, columns.values):
+                records.append(["s", ids[0], ids[1], self._paths[path_id], value])
+        self._submit(self._rewrite, records)
+        self._records = len(records)
+
+    def _check_value(self, path, value):
+        if isinstance(value, list):
+            for v in value:
+                self._check_value(path, v)
+        elif not isinstance(value, self.VALUE_TYPES):
+            raise TypeError(
+                f"{type(value).__name__} value of {path} can not be persisted"
+            )
+
+    @_synchronized
+    def flush(self):
+        """Write changes to the log file."""
+        if self._writer is None:
+            return
+        if self._dirty:
+            records = list(self._dirty.values())
+            self._dirty = {}
+            self._submit(self._write, records)
+            self._records += len(records)
+        self._last_flush = time.monotonic()
+        live = sum(
+            len(self._columns[ids].values)
+            for ids in self._persistent
+            if ids in self._columns
+        )
+        if self._records > max(self.COMPACT_THRESHOLD, live * 2):
+            self._compact()
+
+    def _flush_if_expired(self):
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    @_synchronized
+    def persist(self, ids):
+        self._persistent.add(ids)
+
+    @_synchronized
+    def set(self, ids, path, value):
+        if ids not in self._persistent:
+            super().set(ids, path, value)
+            return
+        self._check_value(path, value)
+        super().set(ids, path, value)
+        self._dirty[(ids, path)] = ["s", ids[0], ids[1], path, value]
+        self._flush_if_expired()
+
+    @_synchronized
+    def delete(self, ids, path):
+        super().delete(ids, path)
+        if ids not in self._persistent:
+            return
+        self._dirty[(ids, path)] = ["d", ids[0], ids[1], path]
+        self._flush_if_expired()
+
+    @_synchronized
+    def discard(self, outer_id):
+        super().discard(outer_id)
+        self._persistent = {ids for ids in self._persistent if ids[0] != outer_id}
+        self._dirty = {k: v for k, v in self._dirty.items() if k[0][0] != outer_id}
+        self.flush()
+        if self._writer is not None:
+            self._submit(self._write, [["c", outer_id]])
+            self._records += 1
+
+    @_synchronized
+    def update(
+        self, ids, data, suppress_redundant=False, heartbeat_interval=0, prefix=None
+    ):
+        if ids not in self._persistent:
+            return super().update(
+                ids, data, suppress_redundant, heartbeat_interval, prefix
+            )
+        for path, value in data.items():
+            self._check_value(path, value)
+        updates, deletes = super().update(
+            ids, data, suppress_redundant, heartbeat_interval, prefix
+        )
+        for path, value in updates.items():
+            self._dirty[(ids, path)] = ["s", ids[0], ids[1], path, value]
+        for path in deletes:
+            self._dirty[(ids, path)] = ["d", ids[0], ids[1], path]
+        self._flush_if_expired()
+        return updates, deletes
+
+    @_synchronized
+    def close(self):
+        self.flush()
+        if self._writer is None:
+            return
+        self._writer.shutdown(wait=True)
+        self._writer = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
 
 
 class SubscriptionExistError(Exception):
@@ -197,6 +708,16 @@ class SubscriptionStore:
         """
         pass
 
+    def restore(self):
+        """Get configurations of subscriptions saved before the application restarted.
+
+        Returns:
+            dict: Configurations of the subscriptions.
+                key: Identifier of the subscription.
+                value: Configuration data of the subscription.
+        """
+        return {}
+
 
 class InMemorySubscriptionStore(SubscriptionStore):
     """A subscription datastore implementation using volatile memory.
@@ -226,3 +747,51 @@ class InMemorySubscriptionStore(SubscriptionStore):
 
     def list(self):
         return list(self._subscriptions.keys())
+
+
+class PersistentSubscriptionStore(InMemorySubscriptionStore):
+    """A subscription datastore implementation which keeps configurations of subscriptions in a file.
+
+    Subscriptions are kept in memory as InMemorySubscriptionStore does. Their configurations are written to a file in
+    the directory, and restore() returns them after the application restarted.
+
+    Args:
+        directory (str): Directory to keep the file in.
+    """
+
+    FILE = "subscriptions.json"
+
+    def __init__(self, directory):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self._file_path = os.path.join(directory, self.FILE)
+        self._configs = {}
+
+    def _save(self):
+        tmp_path = self._file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({str(id_): config for id_, config in self._configs.items()}, f)
+        os.replace(tmp_path, self._file_path)
+
+    def add(self, id_, subscription):
+        super().add(id_, subscription)
+        self._configs[id_] = subscription.config
+        self._save()
+
+    def delete(self, id_):
+        super().delete(id_)
+        self._configs.pop(id_, None)
+        self._save()
+
+    def restore(self):
+        try:
+            with open(self._file_path) as f:
+                configs = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(
+                "Failed to restore subscriptions from %s. %s", self._file_path, e
+            )
+            return {}
+        return {int(id_): config for id_, config in configs.items()}
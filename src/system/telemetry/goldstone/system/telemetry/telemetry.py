@@ -4,12 +4,19 @@
 import logging
 import asyncio
 import json
-from datetime import datetime, timedelta
+import os
+import threading
+import time
 import sysrepo
-import libyang
 from goldstone.lib.core import ServerBase, ChangeHandler
+from goldstone.lib.cache import covers
+from goldstone.lib.xpath import split as xpath_split, to_xpath
 from .store import SubscriptionNotExistError, TelemetryNotExistError
 from .path import PathParser
+from .change import ChangeMonitor
+from .sampler import Sampler
+from .timer import TimerWheel
+from .stats import SubscriptionStats
 
 
 logger = logging.getLogger(__name__)
@@ -34,21 +41,48 @@ class Subscription:
         config (dict): Configuration data of the subscription.
         store (store.TelemetryStore): Datastore for telemetry data.
         update_interval (int): Telemetry data update interval in nanoseconds.
+        change_monitor (change.ChangeMonitor): Monitor of operational state changes. None to poll the data for
+            ON_CHANGE subscriptions.
+        sampler (sampler.Sampler): Sampling scheduler shared by STREAM subscriptions. None to use a dedicated one,
+            which is stopped with the subscription.
     """
 
     NOTIF_PATH = "goldstone-telemetry:telemetry-notify-event"
 
-    def __init__(self, conn, config, store, update_interval):
+    def __init__(
+        self, conn, config, store, update_interval, change_monitor=None, sampler=None
+    ):
         self._conn = conn
         self._config = config
         self._store = store
         self._update_interval = update_interval
-        self._path_parser = PathParser(self._conn.ctx)
+        self._change_monitor = change_monitor
+        self._sampler = sampler
+        self._path_parser = PathParser(self._conn.ctx, self._conn)
         self._id = self._config["id"]
         self._updates_only = False
         self._subscriptions = {}
         self._parse_config()
         self._validate_config()
+        self._stats = {sid: SubscriptionStats() for sid in self._subscriptions}
+        for sid, subscription in self._subscriptions.items():
+            # Samples are compared with the last sent values, which must survive restarts.
+            if (
+                self._updates_only
+                or subscription["suppress-redundant"]
+                or subscription["mode"] == "ON_CHANGE"
+            ):
+                self._store.persist((self._id, sid))
+        # Plans to parse sampled data of subscription paths. Paths narrowed by changes are compiled on demand.
+        self._plans = {
+            config["path"]: self._path_parser.compile(config["path"])
+            for config in self._subscriptions.values()
+        }
+
+    @property
+    def config(self):
+        """dict: Configuration data of the subscription."""
+        return self._config
 
     def _parse_config(self):
         request_config = self._config.get("config")
@@ -89,21 +123,56 @@ class Subscription:
                 logger.error("Subscription config validation failed: %s", msg)
                 raise ValidationFailedError(msg)
 
-    def _get_data(self, xpath):
-        data = self._conn.get_operational(xpath, strip=False)
+    async def _get_data(self, xpath):
+        # NOTE: Sysrepo and libyang calls are run by the worker threads of the connector not to block the event loop.
+        aio = self._conn.aio
+        data = await aio.get_operational(xpath, strip=False)
         # NOTE: Connector returns a value None instead of raising an exception if the data was not found.
         if data is None:
             logger.info("data for path %s is not found.", xpath)
             data = {}
-        return self._path_parser.parse_dict_into_leaves(data, xpath)
+        return await aio.run(
+            self._path_parser.parse_dict_into_leaves,
+            data,
+            xpath,
+            self._plans.get(xpath),
+        )
 
     def _send_notification(self, notif):
         """Send a notification.
 
+        It may be called by the worker threads of the connector. A pooled session is used not to share a session
+        between threads.
+
         Args:
             notif (dict): Notification to send.
         """
-        self._conn.send_notification(self.NOTIF_PATH, notif)
+        sess = self._conn.new_session(pooled=True)
+        try:
+            sess.send_notification(self.NOTIF_PATH, notif)
+        finally:
+            sess.stop()
+
+    def _send_batch(self, sid, updates, deletes, timestamp):
+        """Send updated and deleted leaves of a subscription in a notification.
+
+        Args:
+            sid (int): Subscription ID.
+            updates (dict): Updated leaves. key: path to a leaf node, value: data of a leaf node.
+            deletes (list of str): Paths to deleted leaf nodes.
+            timestamp (int): Time when the data were sampled in nanoseconds since the Unix epoch.
+        """
+        if len(updates) == 0 and len(deletes) == 0:
+            return
+        notif = {
+            "type": "BATCH",
+            "request-id": self._id,
+            "subscription-id": sid,
+            "json-data": json.dumps({"update": updates, "delete": deletes}),
+            "timestamp": timestamp,
+        }
+        self._send_notification(notif)
+        self._stats[sid].record_notification()
 
     def _send_sync_response(self):
         notif = {
@@ -112,36 +181,36 @@ class Subscription:
         }
         self._send_notification(notif)
 
-    def _retrieve_current_data(self):
+    async def _retrieve_current_data(self):
         for sid, subscription in self._subscriptions.items():
             path = subscription["path"]
-            data = self._get_data(path)
-            for sub_path, value in data.items():
-                self._store.set((self._id, sid), sub_path, value)
+            start = time.monotonic_ns()
+            data = await self._get_data(path)
+            self._stats[sid].record_sample(time.monotonic_ns() - start, len(data))
+            self._store.update((self._id, sid), data)
 
     def _send_current_data(self):
+        timestamp = time.time_ns()
         for sid, _ in self._subscriptions.items():
-            ids = (self._id, sid)
-            sub_paths = self._store.list(ids)
-            for sub_path in sub_paths:
-                data = self._store.get(ids, sub_path)
-                notif = {
-                    "type": "UPDATE",
-                    "request-id": self._id,
-                    "subscription-id": sid,
-                    "path": sub_path,
-                    "json-data": json.dumps(data["value"]),
-                }
-                self._send_notification(notif)
+            updates = self._store.items((self._id, sid))
+            self._send_batch(sid, updates, [], timestamp)
 
     async def start(self):
         """Start the subscription."""
         # Start session in __init__() because it will be used to parse and validate configuration parameters.
-        self._retrieve_current_data()
+        await self._retrieve_current_data()
         if not self._updates_only:
             self._send_current_data()
         self._send_sync_response()
 
+    async def resume(self):
+        """Resume the subscription restored after the application restarted.
+
+        The subscriber has already received the current data and the telemetry store keeps what was sent, so they are
+        not sent again.
+        """
+        pass
+
     async def stop(self):
         """Stop the subscription."""
         pass
@@ -154,6 +223,9 @@ class Subscription:
         """
         subscriptions = []
         for sid, subscription in self._subscriptions.items():
+            skipped_ticks = 0
+            if self._sampler is not None:
+                skipped_ticks = self._sampler.skipped((self._id, sid))
             subscriptions.append(
                 {
                     "id": sid,
@@ -162,6 +234,7 @@ class Subscription:
                     "sample-interval": subscription["sample-interval"],
                     "suppress-redundant": subscription["suppress-redundant"],
                     "heartbeat-interval": subscription["heartbeat-interval"],
+                    "statistics": self._stats[sid].to_dict(skipped_ticks),
                 }
             )
         return {
@@ -173,14 +246,46 @@ class Subscription:
 
 
 class StreamSubscription(Subscription):
-    """Subscription for the STREAM mode."""
+    """Subscription for the STREAM mode.
+
+    SAMPLE subscriptions, and ON_CHANGE subscriptions which poll the data, are sampled by the sampler. Subscriptions
+    with the same path and interval share samples.
+
+    An ON_CHANGE subscription samples the data when the change monitor tells that the data have changed. Data which
+    change without notifications, e.g. counters, are sampled every ON_CHANGE_RESYNC_INTERVAL seconds. If the data have
+    no change source, the subscription polls the data every update interval.
+
+    Samples are compared with the sent values only. Heartbeats of suppressed leaves are scheduled on a timer wheel and
+    sent when they expire, regardless of sampling ticks.
+
+    Samples are diffed with the sent values and notified by the worker threads of the connector, not by the event
+    loop. The lock of the subscription serializes them with heartbeats.
+    """
 
     HEARTBEAT_DISABLED = 0
+    HEARTBEAT_RESOLUTION = int(
+        os.getenv("GOLDSTONE_TELEMETRY_HEARTBEAT_RESOLUTION", 100 * 1000 * 1000)
+    )
+    ON_CHANGE_RESYNC_INTERVAL = int(
+        os.getenv("GOLDSTONE_TELEMETRY_ON_CHANGE_RESYNC_INTERVAL", 60)
+    )
 
-    def __init__(self, conn, config, store, update_interval):
+    def __init__(
+        self, conn, config, store, update_interval, change_monitor=None, sampler=None
+    ):
         self._default_sampling_interval = update_interval * 2
-        super().__init__(conn, config, store, update_interval)
+        super().__init__(conn, config, store, update_interval, change_monitor, sampler)
+        self._own_sampler = self._sampler is None
+        if self._own_sampler:
+            self._sampler = Sampler(conn)
         self._loop_tasks = {}
+        self._lock = (
+            threading.Lock()
+        )  # for the sent values, heartbeats and notifications
+        self._heartbeats = TimerWheel(self.HEARTBEAT_RESOLUTION, time.monotonic_ns())
+        self._heartbeat_task = None
+        self._changes = {}  # key: subscription id, value: paths to the changed data
+        self._change_events = {}  # key: subscription id, value: asyncio.Event
 
     def _target_defined_mode(self, path):
         # NOTE: Select the mode by provided path.
@@ -218,107 +323,227 @@ class StreamSubscription(Subscription):
                     logger.error("Subscription config validation failed: %s", msg)
                     raise ValidationFailedError(msg)
 
+    def _has_change_source(self, config):
+        return self._change_monitor is not None and self._change_monitor.has_source(
+            config["path"]
+        )
+
     async def start(self):
+        # Listen to changes before retrieving the current data not to miss changes in between.
+        self._listen_changes()
         await super().start()
-        loops = {
-            "ON_CHANGE": self._on_change_loop,
-            "SAMPLE": self._sample_loop,
-        }
-        for _, subscription in self._subscriptions.items():
-            try:
-                self._loop_tasks[subscription["id"]] = asyncio.create_task(
-                    loops[subscription["mode"]](subscription)
+        self._start_heartbeats()
+        self._start_sampling()
+
+    async def resume(self):
+        self._listen_changes()
+        # Sample data of event-driven subscriptions once not to miss changes while the application was stopped.
+        for sid, subscription in self._subscriptions.items():
+            if sid in self._change_events:
+                self._on_change_cb(subscription, subscription["path"])
+        self._start_heartbeats()
+        self._start_sampling()
+
+    def _listen_changes(self):
+        for sid, subscription in self._subscriptions.items():
+            if subscription["mode"] == "ON_CHANGE" and self._has_change_source(
+                subscription
+            ):
+                self._changes[sid] = set()
+                self._change_events[sid] = asyncio.Event()
+                self._change_monitor.add(
+                    (self._id, sid),
+                    subscription["path"],
+                    lambda x, c=subscription: self._on_change_cb(c, x),
                 )
-            except KeyError:
-                continue
+
+    def _heartbeat_enabled(self, config):
+        # Leaves which are not suppressed are sent every sample.
+        return config["heartbeat-interval"] != self.HEARTBEAT_DISABLED and (
+            config["suppress-redundant"] or config["mode"] == "ON_CHANGE"
+        )
+
+    def _start_heartbeats(self):
+        now = time.monotonic_ns()
+        with self._lock:
+            for sid, subscription in self._subscriptions.items():
+                if not self._heartbeat_enabled(subscription):
+                    continue
+                deadline = now + subscription["heartbeat-interval"]
+                for sub_path in self._store.list((self._id, sid)):
+                    self._heartbeats.add((sid, sub_path), deadline)
+                if self._heartbeat_task is None:
+                    self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.HEARTBEAT_RESOLUTION / 1000 / 1000 / 1000)
+            # NOTE: Heartbeats are sent by a worker thread not to wait for samples being notified.
+            await self._conn.aio.run(self._send_heartbeats)
+
+    def _send_heartbeats(self):
+        with self._lock:
+            now = time.monotonic_ns()
+            expired = self._heartbeats.advance(now)
+            if len(expired) == 0:
+                return
+            timestamp = time.time_ns()
+            updates = {}  # key: subscription id, value: leaves to send
+            for sid, sub_path in expired:
+                try:
+                    value = self._store.get((self._id, sid), sub_path)["value"]
+                except TelemetryNotExistError:
+                    continue
+                updates.setdefault(sid, {})[sub_path] = value
+                config = self._subscriptions[sid]
+                self._heartbeats.add(
+                    (sid, sub_path), now + config["heartbeat-interval"]
+                )
+            for sid, leaves in updates.items():
+                try:
+                    self._send_batch(sid, leaves, [], timestamp)
+                except Exception as e:
+                    logger.error(
+                        "Failed to send heartbeat notification. %s: %s",
+                        type(e).__name__,
+                        e,
+                    )
+                    self._stats[sid].record_error(e)
+
+    def _start_sampling(self):
+        for sid, subscription in self._subscriptions.items():
+            if sid in self._change_events:
+                self._loop_tasks[sid] = asyncio.create_task(
+                    self._on_change_event_loop(subscription)
+                )
+            elif subscription["mode"] == "ON_CHANGE":
+                # NOTE: Polling is used for data which have no change source. See ChangeMonitor.
+                self._add_to_sampler(subscription, self._update_interval)
+            elif subscription["mode"] == "SAMPLE":
+                self._add_to_sampler(subscription, subscription["sample-interval"])
+
+    def _add_to_sampler(self, config, interval):
+        self._sampler.add(
+            (self._id, config["id"]),
+            config["path"],
+            interval,
+            lambda data: self._notify(config, data),
+            self._stats[config["id"]],
+        )
 
     async def stop(self):
-        for _, loop_task in self._loop_tasks.items():
+        for sid in self._subscriptions:
+            self._sampler.remove((self._id, sid))
+        if self._change_monitor is not None:
+            for sid in self._change_events:
+                self._change_monitor.remove((self._id, sid))
+        with self._lock:
+            self._heartbeats.clear()
+        loop_tasks = list(self._loop_tasks.values())
+        if self._heartbeat_task is not None:
+            loop_tasks.append(self._heartbeat_task)
+            self._heartbeat_task = None
+        for loop_task in loop_tasks:
             loop_task.cancel()
-        for _, loop_task in self._loop_tasks.items():
+        for loop_task in loop_tasks:
             while True:
                 if loop_task.done():
                     break
                 await asyncio.sleep(0.1)
+        if self._own_sampler:
+            self._sampler.stop()
         await super().stop()
 
-    def _should_send_notif(self, config, ids, sub_path, value):
-        send_notif = True
-        suppress_redundant = (
-            config["suppress-redundant"] or config["mode"] == "ON_CHANGE"
-        )
-        hb = timedelta(microseconds=config["heartbeat-interval"] / 1000)
-        if suppress_redundant:
-            try:
-                prev_data = self._store.get(ids, sub_path)
-                hb_expired = False
-                if hb > timedelta(0):
-                    hb_expired = (datetime.now() - prev_data["update-time"]) > hb
-                if value == prev_data["value"] and not hb_expired:
-                    send_notif = False
-            except TelemetryNotExistError:
-                # The data node of the sub_path is created.
-                pass
-        return send_notif
-
-    def _sample_and_notify(self, config):
-        ids = (self._id, config["id"])
-        data = self._get_data(config["path"])
-        currents = set(self._store.list(ids))
-        exists = set()
-        # Created or updated data nodes.
-        for sub_path, value in data.items():
-            exists.add(sub_path)
-            if self._should_send_notif(config, ids, sub_path, value):
-                self._store.set(ids, sub_path, value)
-                notif = {
-                    "type": "UPDATE",
-                    "request-id": self._id,
-                    "subscription-id": config["id"],
-                    "path": sub_path,
-                    "json-data": json.dumps(value),
-                }
-                self._send_notification(notif)
-        # Deleted data nodes.
-        for sub_path in currents - exists:
-            try:
-                self._store.delete(ids, sub_path)
-            except TelemetryNotExistError:
-                pass
-            notif = {
-                "type": "DELETE",
-                "request-id": self._id,
-                "subscription-id": config["id"],
-                "path": sub_path,
-            }
-            self._send_notification(notif)
+    async def _sample_and_notify(self, config, xpath=None):
+        """Sample the data and send notifications of the changed leaves.
 
-    async def _on_change_loop(self, config):
-        while True:
-            # NOTE: We should subscribe state change notifications with the central datastore if it is possible. To do
-            #   it, we need to design the archtecture and implement it into the model server daemons. Until then, we
-            #   will use this polling implementation.
-            await asyncio.sleep(self._update_interval / 1000 / 1000 / 1000)
-            try:
-                self._sample_and_notify(config)
-            except Exception as e:
-                logger.error(
-                    "Failed to update current state and send notification. %s: %s",
-                    type(e).__name__,
-                    e,
-                )
+        Args:
+            config (dict): Configuration of the subscription.
+            xpath (str): Path to the data to sample. It should be a part of the subscription path. None to sample
+                all data of the subscription.
+        """
+        start = time.monotonic_ns()
+        if xpath is None:
+            data = await self._sampler.get(config["path"])
+        else:
+            data = await self._sampler.get(xpath)
+        self._stats[config["id"]].record_sample(time.monotonic_ns() - start, len(data))
+        await self._conn.aio.run(self._notify, config, data, xpath)
+
+    def _notify(self, config, data, xpath=None):
+        """Send notifications of the changed leaves.
 
-    async def _sample_loop(self, config):
+        It is called by the worker threads of the connector.
+
+        Args:
+            config (dict): Configuration of the subscription.
+            data (dict): Sampled leaves. key: path to a leaf node, value: data of a leaf node.
+            xpath (str): Path to the sampled data. None if all data of the subscription were sampled.
+        """
+        timestamp = time.time_ns()
+        prefix = None
+        if xpath is not None:
+            # Leaf paths have a module prefix only on the top node. See PathParser.
+            prefix = to_xpath(
+                (p if i == 0 else None, n, k)
+                for i, (p, n, k) in enumerate(xpath_split(xpath))
+            )
+        sid = config["id"]
+        with self._lock:
+            updates, deletes = self._store.update(
+                (self._id, sid),
+                data,
+                suppress_redundant=(
+                    config["suppress-redundant"] or config["mode"] == "ON_CHANGE"
+                ),
+                prefix=prefix,
+            )
+            if self._heartbeat_enabled(config):
+                deadline = time.monotonic_ns() + config["heartbeat-interval"]
+                for sub_path in updates:
+                    self._heartbeats.add((sid, sub_path), deadline)
+                for sub_path in deletes:
+                    self._heartbeats.cancel((sid, sub_path))
+            self._send_batch(sid, updates, deletes, timestamp)
+
+    def _on_change_cb(self, config, xpath):
+        self._changes[config["id"]].add(xpath)
+        self._change_events[config["id"]].set()
+
+    def _paths_to_sample(self, config, changes):
+        paths = set()
+        for xpath in changes:
+            if not covers(config["path"], xpath):
+                # The change may affect any data of the subscription.
+                return [None]
+            paths.add(xpath)
+        return [p for p in paths if not any(q != p and covers(q, p) for q in paths)]
+
+    async def _on_change_event_loop(self, config):
+        sid = config["id"]
+        timeout = self.ON_CHANGE_RESYNC_INTERVAL
         while True:
-            await asyncio.sleep(config["sample-interval"] / 1000 / 1000 / 1000)
             try:
-                self._sample_and_notify(config)
-            except Exception as e:
-                logger.error(
-                    "Failed to update current state and send notification. %s: %s",
-                    type(e).__name__,
-                    e,
+                await asyncio.wait_for(
+                    self._change_events[sid].wait(),
+                    timeout=timeout if timeout > 0 else None,
                 )
+            except asyncio.TimeoutError:
+                paths = [None]
+            else:
+                paths = self._paths_to_sample(config, self._changes[sid])
+            self._changes[sid] = set()
+            self._change_events[sid].clear()
+            for xpath in paths:
+                try:
+                    await self._sample_and_notify(config, xpath)
+                except Exception as e:
+                    logger.error(
+                        "Failed to update current state and send notification. %s: %s",
+                        type(e).__name__,
+                        e,
+                    )
+                    self._stats[sid].record_error(e)
 
 
 class OnceSubscription(Subscription):
@@ -339,7 +564,7 @@ class PollSubscription(Subscription):
             event (str): Event type of the callback. It is always "rpc". Don't care.
             priv (any): Private data from the request subscribing.
         """
-        self._retrieve_current_data()
+        await self._retrieve_current_data()
         self._send_current_data()
         self._send_sync_response()
 
@@ -407,6 +632,8 @@ class SubscribeRequestCreatedHandler(SubscribeRequestTypedHandler):
                 self._config,
                 user["telemetry-store"],
                 user["update-interval"],
+                user["change-monitor"],
+                user["sampler"],
             )
         except KeyError as e:
             msg = f"invalid mode {mode}"
@@ -450,6 +677,7 @@ class SubscribeRequestDeletedHandler(SubscribeRequestTypedHandler):
     async def apply(self, user):
         await self._subscription.stop()
         user["subscription-store"].delete(self._id)
+        user["telemetry-store"].discard(self._id)
 
     async def revert(self, user):
         user["subscription-store"].add(self._id, self._subscription)
@@ -467,7 +695,7 @@ class SubscribeRequestChangeHandler(ChangeHandler):
 
     def __init__(self, server, change):
         super().__init__(server, change)
-        self.xpath = list(libyang.xpath_split(change.xpath))
+        self.xpath = xpath_split(change.xpath)
         self._noop = False
         if not (
             len(self.xpath) == 2
@@ -521,6 +749,8 @@ class TelemetryServer(ServerBase):
         self._subscription_store = subscription_store
         self._telemetry_store = telemetry_store
         self._update_interval = update_interval * 1000 * 1000 * 1000
+        self._change_monitor = ChangeMonitor(self.conn)
+        self._sampler = Sampler(self.conn.conn)
         self.handlers = {
             "subscribe-requests": {"subscribe-request": SubscribeRequestChangeHandler}
         }
@@ -537,12 +767,53 @@ class TelemetryServer(ServerBase):
         #   - https://github.com/sysrepo/sysrepo/issues/1438
         xpath = "/goldstone-telemetry:poll"
         self.conn.subscribe_rpc_call(xpath, self.poll_cb)
+        self._change_monitor.start()
+        await self._restore_subscriptions()
         return tasks
 
+    async def _restore_subscriptions(self):
+        configs = self._subscription_store.restore()
+        if len(configs) == 0:
+            return
+        requests = self.get_running_data(
+            "/goldstone-telemetry:subscribe-requests/subscribe-request", []
+        )
+        rids = {request["id"] for request in requests}
+        for rid, config in configs.items():
+            if rid not in rids:
+                logger.info("Subscription %s has been deleted while stopped.", rid)
+                self._telemetry_store.discard(rid)
+                continue
+            try:
+                subscription = SubscribeRequestCreatedHandler.SUBSCRIPTIONS[
+                    config["config"]["mode"]
+                ](
+                    self.conn.conn,
+                    config,
+                    self._telemetry_store,
+                    self._update_interval,
+                    self._change_monitor,
+                    self._sampler,
+                )
+            except KeyError as e:
+                logger.error("Failed to restore subscription %s. no %s", rid, e)
+                self._telemetry_store.discard(rid)
+                continue
+            except ValidationFailedError as e:
+                logger.error("Failed to restore subscription %s. %s", rid, e.msg)
+                self._telemetry_store.discard(rid)
+                continue
+            self._subscription_store.add(rid, subscription)
+            await subscription.resume()
+            logger.info("Subscription %s is restored.", rid)
+
     async def stop(self):
         """Stop a service."""
         for rid in self._subscription_store.list():
             await self._subscription_store.get(rid).stop()
+        logger.info("Sampler stats: %s", self._sampler.stats())
+        self._sampler.stop()
+        self._telemetry_store.close()
         super().stop()
 
     def pre(self, user):
@@ -551,6 +822,8 @@ class TelemetryServer(ServerBase):
         user["subscription-store"] = self._subscription_store
         user["telemetry-store"] = self._telemetry_store
         user["update-interval"] = self._update_interval
+        user["change-monitor"] = self._change_monitor
+        user["sampler"] = self._sampler
 
     async def poll_cb(self, xpath, inputs, event, priv):
         """Callback function for a poll request.
@@ -606,17 +879,20 @@ class TelemetryServer(ServerBase):
                         "mode"
                     ]
                 if internal_subscription_data["sample-interval"] is not None:
-                    internal_subscription["state"][
-                        "sample-interval"
-                    ] = internal_subscription_data["sample-interval"]
+                    internal_subscription["state"]["sample-interval"] = (
+                        internal_subscription_data["sample-interval"]
+                    )
                 if internal_subscription_data["suppress-redundant"] is not None:
-                    internal_subscription["state"][
-                        "suppress-redundant"
-                    ] = internal_subscription_data["suppress-redundant"]
+                    internal_subscription["state"]["suppress-redundant"] = (
+                        internal_subscription_data["suppress-redundant"]
+                    )
                 if internal_subscription_data["heartbeat-interval"] is not None:
-                    internal_subscription["state"][
-                        "heartbeat-interval"
-                    ] = internal_subscription_data["heartbeat-interval"]
+                    internal_subscription["state"]["heartbeat-interval"] = (
+                        internal_subscription_data["heartbeat-interval"]
+                    )
+                internal_subscription["state"]["statistics"] = (
+                    internal_subscription_data["statistics"]
+                )
                 internal_subscriptions.append(internal_subscription)
             if len(internal_subscriptions) > 0:
                 subscribe_request["subscriptions"] = {
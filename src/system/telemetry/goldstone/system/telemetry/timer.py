@@ -0,0 +1,117 @@
+"""Timer utilities."""
+
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """A hierarchical timer wheel.
+
+    Timers are kept in slots of wheels. Each wheel has SLOTS slots, and a slot of a wheel covers all slots of the wheel
+    below. Adding and cancelling a timer takes constant time. Timers in a slot of an upper wheel are moved to lower
+    wheels when the time reaches the slot.
+
+    Args:
+        resolution (int): Length of a tick in nanoseconds. Deadlines are rounded up to ticks.
+        now (int): Current time in nanoseconds.
+
+    Attributes:
+        SLOTS (int): Number of slots of a wheel.
+        LEVELS (int): Number of wheels. Timers later than SLOTS ** LEVELS ticks are kept in the last slot of the top
+            wheel until the time reaches it.
+    """
+
+    SLOTS = 64
+    LEVELS = 4
+
+    def __init__(self, resolution, now=0):
+        self._resolution = resolution
+        self._tick = now // resolution
+        self._wheels = [
+            [{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)
+        ]  # value: {key: deadline tick}
+        self._slots = {}  # key: timer key, value: (level, slot)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def _insert(self, key, tick):
+        tick = max(tick, self._tick + 1)
+        position = min(tick, self._tick + self.SLOTS**self.LEVELS - 1)
+        delta = position - self._tick
+        for level in range(self.LEVELS):
+            if delta < self.SLOTS ** (level + 1):
+                break
+        slot = (position // self.SLOTS**level) % self.SLOTS
+        self._wheels[level][slot][key] = tick
+        self._slots[key] = (level, slot)
+
+    def add(self, key, deadline):
+        """Add a timer. If a timer of the key exists, its deadline is replaced.
+
+        Args:
+            key (any): Identifier of the timer.
+            deadline (int): Time in nanoseconds to expire the timer.
+        """
+        self.cancel(key)
+        self._insert(key, -(-deadline // self._resolution))
+
+    def cancel(self, key):
+        """Cancel a timer. Nothing happens if the timer does not exist.
+
+        Args:
+            key (any): Identifier of the timer.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            del self._wheels[slot[0]][slot[1]][key]
+
+    def clear(self):
+        """Cancel all timers."""
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._slots = {}
+
+    def advance(self, now):
+        """Advance the time and expire timers.
+
+        Args:
+            now (int): Current time in nanoseconds.
+
+        Returns:
+            list: Keys of expired timers.
+        """
+        target = now // self._resolution
+        expired = []
+        while self._tick < target:
+            if len(self._slots) == 0:
+                self._tick = target
+                break
+            self._tick += 1
+            # Move timers of upper wheels down from the top.
+            for level in reversed(range(1, self.LEVELS)):
+                span = self.SLOTS**level
+                if self._tick % span != 0:
+                    continue
+                timers = self._wheels[level][(self._tick // span) % self.SLOTS]
+                moved = list(timers.items())
+                timers.clear()
+                for key, tick in moved:
+                    self._insert(key, tick)
+            timers = self._wheels[0][self._tick % self.SLOTS]
+            due = list(timers.items())
+            timers.clear()
+            for key, tick in due:
+                if tick <= self._tick:
+                    del self._slots[key]
+                    expired.append(key)
+                else:
+                    self._insert(key, tick)
+        return expired
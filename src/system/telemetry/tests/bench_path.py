@@ -0,0 +1,121 @@
+"""Benchmark of PathParser.parse_dict_into_leaves().
+
+Parses a sample of the counters of 128 interfaces with a plan compiled once, as a subscription does, and compares it
+with a parser which flattens the whole tree, looks up list keys in the schema for every list entry and prunes leaves
+with regular expressions afterwards, as it used to.
+
+    cd src/system/telemetry && python -m tests.bench_path
+"""
+
+import logging
+import os
+import re
+import timeit
+import libyang
+
+from goldstone.system.telemetry.path import PathParser
+
+logger = logging.getLogger(__name__)
+
+
+YANG_DIR = os.path.join(os.path.dirname(__file__), "../../../../yang")
+
+COUNTERS = [
+    "in-octets",
+    "in-unicast-pkts",
+    "in-broadcast-pkts",
+    "in-multicast-pkts",
+    "in-discards",
+    "in-errors",
+    "in-unknown-protos",
+    "out-octets",
+    "out-unicast-pkts",
+    "out-broadcast-pkts",
+    "out-multicast-pkts",
+    "out-discards",
+]
+
+PATH = "/goldstone-interfaces:interfaces/interface/state/counters"
+
+DATA = {
+    "interfaces": {
+        "interface": [
+            {
+                "name": f"Ethernet{i}_1",
+                "config": {"name": f"Ethernet{i}_1", "admin-status": "UP"},
+                "state": {
+                    "name": f"Ethernet{i}_1",
+                    "admin-status": "UP",
+                    "oper-status": "UP",
+                    "counters": {c: i * 1000 + n for n, c in enumerate(COUNTERS)},
+                },
+            }
+            for i in range(1, 129)
+        ]
+    }
+}
+
+
+class LegacyPathParser(PathParser):
+    REGEX_PTN_LIST_KEY = re.compile(r"\[.*.*\]")
+
+    def _get_list_keys(self, path):
+        node = self._find_node(path)
+        return [key.name() for key in node.keys()]
+
+    def _get_path_elems(self, path):
+        return self._remove_list_keys(path).split("/")[1:]
+
+    def _get_leaves(self, data, path, leaves):
+        if isinstance(data, dict):
+            for next_node, next_data in data.items():
+                self._get_leaves(next_data, f"{path}/{next_node}", leaves)
+        elif self._is_container_list(data):
+            for container in data:
+                keys_str = ""
+                for key in self._get_list_keys(path):
+                    keys_str = f"{keys_str}[{key}='{container[key]}']"
+                self._get_leaves(container, f"{path}{keys_str}", leaves)
+        else:
+            leaves[path] = data
+
+    def parse_dict_into_leaves(self, data, path, plan=None):
+        top_prefix = self._get_path_elems(path)[0].split(":")[0]
+        leaves = {}
+        self._get_leaves({f"{top_prefix}:{k}": v for k, v in data.items()}, "", leaves)
+        path_elems = self._get_path_elems(path)
+        for sub_path in list(leaves):
+            sub_path_elems = self._get_path_elems(sub_path)
+            if sub_path_elems[: len(path_elems)] != path_elems:
+                del leaves[sub_path]
+        return leaves
+
+
+def main():
+    ctx = libyang.Context(YANG_DIR)
+    ctx.load_module("goldstone-interfaces")
+
+    parser = PathParser(ctx)
+    plan = parser.compile(PATH)
+    legacy = LegacyPathParser(ctx)
+    leaves = parser.parse_dict_into_leaves(DATA, PATH, plan)
+    assert leaves == legacy.parse_dict_into_leaves(DATA, PATH)
+    assert len(leaves) == 128 * len(COUNTERS)
+
+    n = 20
+    results = {
+        "legacy": lambda: legacy.parse_dict_into_leaves(DATA, PATH),
+        "plan": lambda: parser.parse_dict_into_leaves(DATA, PATH, plan),
+    }
+    logger.info(f"{len(leaves)} leaves per sample, {n} samples")
+    for name, f in results.items():
+        elapsed = min(timeit.repeat(f, number=n, repeat=3)) / n
+        logger.info(
+            f"{name:>8}: {elapsed * 1000:.3f} msec/sample, {len(leaves) / elapsed:.0f} leaves/sec"
+        )
+    ctx.destroy()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,121 @@
+"""Tests for change sources."""
+
+
+import unittest
+from unittest import mock
+import sysrepo
+from goldstone.system.telemetry.change import ChangeMonitor
+
+
+class TestChangeMonitor(unittest.IsolatedAsyncioTestCase):
+    """Tests for ChangeMonitor."""
+
+    def setUp(self):
+        self.conn = mock.MagicMock()
+        self.callbacks = {}
+
+        def subscribe_notification(module, xpath, cb, priv=None):
+            if xpath == "/goldstone-platform:transceiver-notify-event":
+                raise sysrepo.SysrepoNotFoundError("not installed")
+            self.callbacks[xpath] = lambda notif: cb(xpath, "realtime", notif, 0, priv)
+
+        self.conn.subscribe_notification = subscribe_notification
+        self.monitor = ChangeMonitor(self.conn)
+        self.monitor.start()
+
+    def test_has_source(self):
+        interface = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        self.assertTrue(self.monitor.has_source(interface + "/state/oper-status"))
+        self.assertTrue(
+            self.monitor.has_source(
+                "/goldstone-interfaces:interfaces/interface/state/oper-status"
+            )
+        )
+        # Counters are in a module with a change source, but their changes are not notified.
+        self.assertFalse(
+            self.monitor.has_source(interface + "/state/counters/in-octets")
+        )
+        self.assertFalse(self.monitor.has_source(interface + "/state"))
+        self.assertFalse(self.monitor.has_source("/goldstone-interfaces:interfaces"))
+        self.assertTrue(
+            self.monitor.has_source(
+                "/goldstone-platform:components/component[name='piu1']/piu/state/piu-type"
+            )
+        )
+        # The change source is not available.
+        self.assertFalse(
+            self.monitor.has_source(
+                "/goldstone-platform:components/component[name='port1']/transceiver/state/presence"
+            )
+        )
+        module = "/goldstone-transponder:modules/module[name='piu1']"
+        self.assertTrue(self.monitor.has_source(module + "/state/oper-status"))
+        self.assertTrue(
+            self.monitor.has_source(
+                module + "/network-interface[name='0']/state/rx-align-status"
+            )
+        )
+        self.assertFalse(
+            self.monitor.has_source(
+                module + "/network-interface[name='0']/state/current-snr"
+            )
+        )
+        self.assertFalse(self.monitor.has_source("/goldstone-transponder:modules"))
+        self.assertFalse(self.monitor.has_source("/goldstone-system:system"))
+
+    def test_has_source_generic(self):
+        interface = "/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']"
+        # Commits are notified.
+        self.assertTrue(self.monitor.has_source(interface + "/config/mtu"))
+        self.assertTrue(self.monitor.has_source("/goldstone-system:system/aaa/config"))
+        # PORT_TABLE changes are notified.
+        self.assertTrue(self.monitor.has_source(interface + "/state/admin-status"))
+        self.assertTrue(self.monitor.has_source(interface + "/ethernet/state/speed"))
+        self.assertFalse(self.monitor.has_source(interface + "/ethernet/state/fec"))
+
+        monitor = ChangeMonitor(mock.MagicMock())
+        self.assertFalse(monitor.has_source(interface + "/config/mtu"))
+
+    async def test_notify(self):
+        changes = []
+        self.monitor.add(
+            1,
+            "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']",
+            changes.append,
+        )
+        self.monitor.add(2, "/goldstone-platform:components", changes.append)
+
+        notify = self.callbacks[
+            "/goldstone-interfaces:interface-link-state-notify-event"
+        ]
+        await notify({"if-name": "Interface1/0/1", "oper-status": "UP"})
+        await notify({"if-name": "Interface1/0/2", "oper-status": "UP"})
+        self.assertEqual(
+            changes,
+            ["/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"],
+        )
+
+        changes.clear()
+        notify = self.callbacks["/goldstone-transponder:*"]
+        await notify({"module-name": "piu1", "keys": ["oper-status"]})
+        self.assertEqual(changes, [])
+        self.monitor.add(3, "/goldstone-transponder:modules", changes.append)
+        await notify({"module-name": "piu1", "keys": ["oper-status"]})
+        self.assertEqual(
+            changes, ["/goldstone-transponder:modules/module[name='piu1']"]
+        )
+
+        changes.clear()
+        self.monitor.remove(3)
+        notify = self.callbacks["/goldstone-telemetry:oper-data-changed-event"]
+        await notify({"path": "/goldstone-interfaces:interfaces"})
+        self.assertEqual(changes, ["/goldstone-interfaces:interfaces"])
+
+        changes.clear()
+        self.monitor.remove(1)
+        await notify({"path": "/goldstone-interfaces:interfaces"})
+        self.assertEqual(changes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -52,6 +52,32 @@ class TestPathParser(unittest.TestCase):
         expected = {path + "/name": "Interface1/0/1", path + "/admin-status": "UP"}
         self.assertEqual(parsed_data, expected)
 
+    def test_parse_dict_plan(self):
+        def data(mtu):
+            return {
+                "interfaces": {
+                    "interface": [
+                        {
+                            "name": name,
+                            "config": {"name": name},
+                            "ethernet": {"state": {"mtu": mtu}},
+                        }
+                        for name in ["Interface1/0/1", "Interface1/0/2"]
+                    ]
+                }
+            }
+
+        path = "/goldstone-interfaces:interfaces/interface/ethernet/state"
+        p = PathParser(self.ctx)
+        plan = p.compile(path)
+        for mtu in [1500, 9000]:
+            parsed_data = p.parse_dict_into_leaves(data(mtu), path, plan)
+            expected = {
+                "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/ethernet/state/mtu": mtu,
+                "/goldstone-interfaces:interfaces/interface[name='Interface1/0/2']/ethernet/state/mtu": mtu,
+            }
+            self.assertEqual(parsed_data, expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for the sampling scheduler."""
+
+import unittest
+import asyncio
+import threading
+from unittest import mock
+from goldstone.system.telemetry.sampler import Sampler
+from goldstone.system.telemetry.stats import SubscriptionStats
+
+PATH = "/goldstone-interfaces:interfaces/interface/state/oper-status"
+INTERVAL = 10 * 1000 * 1000
+
+
+class TestSampler(unittest.IsolatedAsyncioTestCase):
+    """Tests for Sampler."""
+
+    def setUp(self):
+        conn = mock.MagicMock()
+        self.fetched = []
+        self.delay = 0
+
+        async def get_operational(xpath, strip=True):
+            self.fetched.append(xpath)
+            await asyncio.sleep(self.delay)
+            return {xpath: "UP"}
+
+        async def run(f, *args):
+            return await asyncio.to_thread(f, *args)
+
+        conn.aio.get_operational = get_operational
+        conn.aio.run = run
+        self.sampler = Sampler(conn)
+        self.sampler._parse = lambda xpath, data: data
+
+    def tearDown(self):
+        self.sampler.stop()
+
+    async def test_shared_fetch(self):
+        samples = {1: [], 2: [], 3: []}
+        self.sampler.add(1, PATH, INTERVAL, samples[1].append)
+        self.sampler.add(2, PATH, INTERVAL, samples[2].append)
+        self.sampler.add(3, PATH, INTERVAL * 1000, samples[3].append)
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 1.5)
+        self.assertEqual(self.fetched, [PATH])
+        self.assertEqual(samples[1], [{PATH: "UP"}])
+        self.assertEqual(samples[2], [{PATH: "UP"}])
+        self.assertEqual(samples[3], [])
+        stats = self.sampler.stats()
+        self.assertEqual(stats["groups"], 1)
+        self.assertEqual(stats["fetches"], 1)
+        self.assertEqual(stats["fetches-saved"], 1)
+
+    async def test_multiple_intervals(self):
+        samples = {1: [], 2: [], 3: []}
+        stats = {1: SubscriptionStats(), 2: SubscriptionStats()}
+        self.sampler.add(1, PATH, INTERVAL, samples[1].append, stats[1])
+        self.sampler.add(2, PATH, INTERVAL * 2, samples[2].append, stats[2])
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 4.5)
+        # The subscription with the double interval shares every other fetch.
+        self.assertEqual(len(samples[1]), 4)
+        self.assertEqual(len(samples[2]), 2)
+        self.assertEqual(len(self.fetched), 4)
+        self.assertEqual(stats[1].shared_samples, 2)
+        self.assertEqual(stats[2].shared_samples, 2)
+        self.assertEqual(self.sampler.stats()["fetches-saved"], 2)
+
+    async def test_callback_thread(self):
+        threads = []
+        self.sampler.add(
+            1, PATH, INTERVAL, lambda data: threads.append(threading.get_ident())
+        )
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 1.5)
+        # Samples are given to subscriptions off the event loop.
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    async def test_remove(self):
+        samples = []
+        self.sampler.add(1, PATH, INTERVAL, samples.append)
+        self.sampler.remove(1)
+        self.assertEqual(self.sampler.stats()["groups"], 0)
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 1.5)
+        self.assertEqual(samples, [])
+        self.assertEqual(self.fetched, [])
+
+    async def test_callback_error(self):
+        samples = []
+
+        def fail(data):
+            raise Exception("failed")
+
+        stats = {1: SubscriptionStats(), 2: SubscriptionStats()}
+        self.sampler.add(1, PATH, INTERVAL, fail, stats[1])
+        self.sampler.add(2, PATH, INTERVAL, samples.append, stats[2])
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 1.5)
+        self.assertEqual(samples, [{PATH: "UP"}])
+        self.assertEqual(stats[1].samples, 1)
+        self.assertEqual(stats[1].last_error, "Exception: failed")
+        self.assertEqual(stats[2].samples, 1)
+        self.assertEqual(stats[2].last_sampled_leaves, 1)
+        self.assertIsNone(stats[2].last_error)
+
+    async def test_skip_in_flight(self):
+        samples = []
+        self.delay = INTERVAL / 1000 / 1000 / 1000 * 10
+        self.sampler.add(1, PATH, INTERVAL, samples.append)
+        await asyncio.sleep(INTERVAL / 1000 / 1000 / 1000 * 4.5)
+        # Ticks are skipped while the 1st sample is in flight.
+        self.assertEqual(self.fetched, [PATH])
+        self.assertEqual(samples, [])
+        self.assertGreaterEqual(self.sampler.skipped(1), 2)
+        self.assertEqual(self.sampler.stats()["skips"], self.sampler.skipped(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
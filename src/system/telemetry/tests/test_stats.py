@@ -0,0 +1,64 @@
+"""Tests for subscription statistics."""
+
+import unittest
+from goldstone.system.telemetry.stats import SubscriptionStats
+
+
+class TestSubscriptionStats(unittest.TestCase):
+    """Tests for SubscriptionStats."""
+
+    def test_empty(self):
+        stats = SubscriptionStats()
+        data = stats.to_dict()
+        self.assertEqual(data["samples"], 0)
+        self.assertEqual(data["shared-samples"], 0)
+        self.assertEqual(data["notifications"], 0)
+        self.assertEqual(data["skipped-ticks"], 0)
+        self.assertEqual(
+            [b["count"] for b in data["sample-duration"]],
+            [0] * (len(SubscriptionStats.DURATION_BUCKETS) + 1),
+        )
+        self.assertNotIn("last-error", data)
+
+    def test_record_sample(self):
+        stats = SubscriptionStats()
+        ms = 1000 * 1000
+        stats.record_sample(500 * 1000, 10)
+        stats.record_sample(1 * ms, 20, True)
+        stats.record_sample(50 * ms, 30)
+        stats.record_sample(60 * 1000 * ms, 5)
+        data = stats.to_dict(skipped_ticks=3)
+        self.assertEqual(data["samples"], 4)
+        self.assertEqual(data["shared-samples"], 1)
+        self.assertEqual(data["sampled-leaves"], 65)
+        self.assertEqual(data["last-sampled-leaves"], 5)
+        self.assertEqual(
+            data["sample-duration-total"],
+            500 * 1000 + 1 * ms + 50 * ms + 60 * 1000 * ms,
+        )
+        self.assertEqual(
+            data["sample-duration"],
+            [
+                {"upper-bound": 1 * ms, "count": 2},
+                {"upper-bound": 10 * ms, "count": 0},
+                {"upper-bound": 100 * ms, "count": 1},
+                {"upper-bound": 1000 * ms, "count": 0},
+                {"upper-bound": 10 * 1000 * ms, "count": 0},
+                {"upper-bound": SubscriptionStats.NO_UPPER_BOUND, "count": 1},
+            ],
+        )
+        self.assertEqual(data["skipped-ticks"], 3)
+
+    def test_record_notification_and_error(self):
+        stats = SubscriptionStats()
+        stats.record_notification()
+        stats.record_notification()
+        stats.record_error(ValueError("bad value"))
+        stats.record_error(KeyError("key"))
+        data = stats.to_dict()
+        self.assertEqual(data["notifications"], 2)
+        self.assertEqual(data["last-error"], "KeyError: 'key'")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,18 @@
 
 import unittest
 import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from goldstone.lib.connector.sysrepo import Connector
 from goldstone.system.telemetry.store import (
     InMemoryTelemetryStore,
+    ColumnarTelemetryStore,
+    PersistentTelemetryStore,
     TelemetryNotExistError,
     InMemorySubscriptionStore,
     SubscriptionExistError,
     SubscriptionNotExistError,
+    PersistentSubscriptionStore,
 )
 from goldstone.system.telemetry.telemetry import Subscription
 
@@ -78,6 +83,191 @@ class TestInMemoryTelemetryStore(unittest.TestCase):
             ts.get(ids, path)
 
 
+class TestColumnarTelemetryStore(unittest.TestCase):
+    """Tests for ColumnarTelemetryStore."""
+
+    def test_set(self):
+        ts = ColumnarTelemetryStore()
+        ids = (1, 1)
+        path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/config/admin-status"
+        before = datetime.datetime.now()
+        ts.set(ids, path, "UP")
+        after = datetime.datetime.now()
+        stored_telemetry = ts.get(ids, path)
+        self.assertEqual(stored_telemetry["value"], "UP")
+        self.assertTrue(
+            before - datetime.timedelta(milliseconds=1)
+            <= stored_telemetry["update-time"]
+            <= after + datetime.timedelta(milliseconds=1)
+        )
+        ts.set(ids, path, "DOWN")
+        self.assertEqual(ts.get(ids, path)["value"], "DOWN")
+        self.assertEqual(ts.list(ids), [path])
+
+    def test_delete_not_exist(self):
+        ts = ColumnarTelemetryStore()
+        path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/config/admin-status"
+        with self.assertRaises(TelemetryNotExistError):
+            ts.delete((1, 1), path)
+        with self.assertRaises(TelemetryNotExistError):
+            ts.get((1, 1), path)
+
+    def test_update(self):
+        ts = ColumnarTelemetryStore()
+        ids = (1, 1)
+        prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        data = {
+            f"{prefix}/state/admin-status": "UP",
+            f"{prefix}/state/oper-status": "DOWN",
+            f"{prefix}/state/mtu": 9000,
+        }
+        updates, deletes = ts.update(ids, data, suppress_redundant=True)
+        self.assertEqual(updates, data)
+        self.assertEqual(deletes, [])
+        self.assertEqual(ts.items(ids), data)
+
+        # Unchanged values are suppressed and missing leaves are deleted.
+        updates, deletes = ts.update(
+            ids,
+            {f"{prefix}/state/admin-status": "UP", f"{prefix}/state/mtu": 1500},
+            suppress_redundant=True,
+        )
+        self.assertEqual(updates, {f"{prefix}/state/mtu": 1500})
+        self.assertEqual(deletes, [f"{prefix}/state/oper-status"])
+        self.assertEqual(
+            ts.items(ids),
+            {f"{prefix}/state/admin-status": "UP", f"{prefix}/state/mtu": 1500},
+        )
+
+        # Unchanged values are updated without suppress_redundant.
+        updates, deletes = ts.update(ids, ts.items(ids))
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(deletes, [])
+
+        # Unchanged values are updated after the heartbeat interval.
+        updates, deletes = ts.update(
+            ids, ts.items(ids), suppress_redundant=True, heartbeat_interval=1
+        )
+        self.assertEqual(len(updates), 2)
+
+    def test_update_prefix(self):
+        ts = ColumnarTelemetryStore()
+        ids = (1, 1)
+        if1 = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        if2 = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/2']"
+        ts.update(
+            ids, {f"{if1}/name": "Interface1/0/1", f"{if2}/name": "Interface1/0/2"}
+        )
+        updates, deletes = ts.update(ids, {}, prefix=if1)
+        self.assertEqual(updates, {})
+        self.assertEqual(deletes, [f"{if1}/name"])
+        self.assertEqual(ts.list(ids), [f"{if2}/name"])
+
+    def test_share_paths(self):
+        ts = ColumnarTelemetryStore()
+        path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/name"
+        ts.set((1, 1), path, "Interface1/0/1")
+        ts.set((2, 1), path, "Interface1/0/1")
+        ts.delete((1, 1), path)
+        self.assertEqual(ts.list((1, 1)), [])
+        self.assertEqual(ts.get((2, 1), path)["value"], "Interface1/0/1")
+        ts.delete((2, 1), path)
+        self.assertEqual(ts.list((2, 1)), [])
+        with self.assertRaises(TelemetryNotExistError):
+            ts.get((2, 1), path)
+
+    def test_threads(self):
+        ts = ColumnarTelemetryStore()
+        prefix = "/goldstone-interfaces:interfaces/interface"
+
+        def sample(sid):
+            for i in range(100):
+                # Paths are interned and released by all subscriptions.
+                data = {f"{prefix}[name='{n}']/state/mtu": i for n in range(i % 7, 20)}
+                ts.update((1, sid), data)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(sample, range(8)))
+        for sid in range(8):
+            self.assertEqual(
+                ts.items((1, sid)),
+                {f"{prefix}[name='{n}']/state/mtu": 99 for n in range(99 % 7, 20)},
+            )
+
+
+class TestPersistentTelemetryStore(unittest.TestCase):
+    """Tests for PersistentTelemetryStore."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_restore(self):
+        prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        ts = PersistentTelemetryStore(self.dir.name)
+        for ids in [(1, 1), (2, 1), (3, 1)]:
+            ts.persist(ids)
+        ts.update(
+            (1, 1),
+            {f"{prefix}/state/admin-status": "UP", f"{prefix}/state/mtu": 1500},
+        )
+        ts.update((1, 1), {f"{prefix}/state/admin-status": "DOWN"})
+        ts.set((2, 1), f"{prefix}/state/mtu", 9000)
+        ts.set((3, 1), f"{prefix}/state/mtu", 9000)
+        ts.discard(3)
+        # Subscriptions which don't need the last sent values are not persisted.
+        ts.set((4, 1), f"{prefix}/state/mtu", 9000)
+        ts.close()
+
+        ts = PersistentTelemetryStore(self.dir.name)
+        self.assertEqual(ts.items((1, 1)), {f"{prefix}/state/admin-status": "DOWN"})
+        self.assertEqual(ts.items((2, 1)), {f"{prefix}/state/mtu": 9000})
+        self.assertEqual(ts.items((3, 1)), {})
+        self.assertEqual(ts.items((4, 1)), {})
+        # Restored values are not notified again.
+        updates, deletes = ts.update(
+            (1, 1), {f"{prefix}/state/admin-status": "DOWN"}, suppress_redundant=True
+        )
+        self.assertEqual(updates, {})
+        self.assertEqual(deletes, [])
+        ts.close()
+
+    def test_compact(self):
+        path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/state/mtu"
+        ts = PersistentTelemetryStore(self.dir.name)
+        ts.persist((1, 1))
+        ts.FLUSH_INTERVAL = 0
+        ts.COMPACT_THRESHOLD = 10
+        for mtu in range(1000, 1100):
+            ts.set((1, 1), path, mtu)
+        ts.close()
+        with open(f"{self.dir.name}/{ts.LOG_FILE}") as f:
+            self.assertLessEqual(len(f.readlines()), 10)
+        ts = PersistentTelemetryStore(self.dir.name)
+        self.assertEqual(ts.get((1, 1), path)["value"], 1099)
+        # Restored subscriptions are still persisted.
+        ts.set((1, 1), path, 1100)
+        ts.close()
+        ts = PersistentTelemetryStore(self.dir.name)
+        self.assertEqual(ts.get((1, 1), path)["value"], 1100)
+        ts.close()
+
+    def test_value_types(self):
+        path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/state/mtu"
+        ts = PersistentTelemetryStore(self.dir.name)
+        ts.persist((1, 1))
+        ts.update((1, 1), {path: [1.5, True, None, "a"]})
+        with self.assertRaises(TypeError):
+            ts.update((1, 1), {path: (1, 2)})
+        with self.assertRaises(TypeError):
+            ts.set((1, 1), path, object())
+        self.assertEqual(ts.get((1, 1), path)["value"], [1.5, True, None, "a"])
+        ts.close()
+        ts = PersistentTelemetryStore(self.dir.name)
+        self.assertEqual(ts.get((1, 1), path)["value"], [1.5, True, None, "a"])
+        ts.close()
+
+
 class TestInMemorySubscriptionStore(unittest.TestCase):
     """Tests for InMemorySubscriptionStore."""
 
@@ -158,5 +348,25 @@ class TestInMemorySubscriptionStore(unittest.TestCase):
         self.assertEqual(ss.list(), [id_1, id_2])
 
 
+class TestPersistentSubscriptionStore(unittest.TestCase):
+    """Tests for PersistentSubscriptionStore."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_restore(self):
+        conn = Connector()
+        ss = PersistentSubscriptionStore(self.dir.name)
+        ts = InMemoryTelemetryStore()
+        self.assertEqual(ss.restore(), {})
+        for id_ in [1, 2]:
+            ss.add(id_, Subscription(conn, {"id": id_}, ts, 5))
+        ss.delete(1)
+        ss = PersistentSubscriptionStore(self.dir.name)
+        self.assertEqual(ss.list(), [])
+        self.assertEqual(ss.restore(), {2: {"id": 2}})
+
+
 if __name__ == "__main__":
     unittest.main()
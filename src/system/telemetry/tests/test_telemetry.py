@@ -3,17 +3,23 @@
 
 import unittest
 import asyncio
+import json
 import logging
 import time
+from unittest import mock
 import sysrepo
 from multiprocessing import Process, Queue
 from goldstone.lib.core import ServerBase, NoOp
 from goldstone.lib.connector.sysrepo import Connector
+from goldstone.system.telemetry.change import ChangeMonitor
 from goldstone.system.telemetry.store import (
     InMemorySubscriptionStore,
     InMemoryTelemetryStore,
 )
-from goldstone.system.telemetry.telemetry import TelemetryServer
+from goldstone.system.telemetry.telemetry import (
+    StreamSubscription,
+    TelemetryServer,
+)
 
 
 class MockGSServer(ServerBase):
@@ -147,6 +153,26 @@ def config_subscription(sess, params):
     sess.apply_changes()
 
 
+def pop_statistics(data):
+    """Remove statistics from operational state data of subscribe requests.
+
+    Args:
+        data (dict): Operational state data of goldstone-telemetry:subscribe-requests.
+
+    Returns:
+        dict: Removed statistics. key: (request ID, subscription ID), value: statistics.
+    """
+    statistics = {}
+    for request in data.get("subscribe-requests", {}).get("subscribe-request", []):
+        subscriptions = request.get("subscriptions", {}).get("subscription", [])
+        for subscription in subscriptions:
+            state = subscription.get("state", {})
+            if "statistics" in state:
+                key = (request["id"], subscription["id"])
+                statistics[key] = state.pop("statistics")
+    return statistics
+
+
 class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
     """Tests for TelemetryServer."""
 
@@ -210,7 +236,25 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
         self.q.put({"type": "set-oper-data", "server": server, "data": data})
 
     def notif_callback(self, xpath, notif_type, notif, ts, priv):
-        if "path" in notif.keys():
+        if notif["type"] == "BATCH":
+            # Unpack a batch into UPDATE and DELETE notifications.
+            batch = json.loads(notif["json-data"])
+            for path, value in batch["update"].items():
+                self.received_notif[path] = {
+                    "type": "UPDATE",
+                    "request-id": notif["request-id"],
+                    "subscription-id": notif["subscription-id"],
+                    "path": path,
+                    "json-data": json.dumps(value),
+                }
+            for path in batch["delete"]:
+                self.received_notif[path] = {
+                    "type": "DELETE",
+                    "request-id": notif["request-id"],
+                    "subscription-id": notif["subscription-id"],
+                    "path": path,
+                }
+        elif "path" in notif.keys():
             self.received_notif[notif["path"]] = notif
         else:
             self.received_notif["sync-response"] = notif
@@ -225,6 +269,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                 with conn.start_session() as sess:
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected = {}
                     self.assertEqual(data, expected)
 
@@ -271,6 +316,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     config_subscription(sess, params)
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected = {
                         "subscribe-requests": {
                             "subscribe-request": [
@@ -381,6 +427,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.discard_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     self.assertEqual(data, expected)
 
                     # Delete a subscription.
@@ -391,6 +438,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.apply_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected_after_delete = {}
                     self.assertEqual(data, expected_after_delete)
 
@@ -437,6 +485,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     config_subscription(sess, params)
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected = {
                         "subscribe-requests": {
                             "subscribe-request": [
@@ -540,6 +589,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.discard_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     self.assertEqual(data, expected)
 
                     # Delete a subscription.
@@ -550,6 +600,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.apply_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected_after_delete = {}
                     self.assertEqual(data, expected_after_delete)
 
@@ -596,6 +647,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     config_subscription(sess, params)
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected = {
                         "subscribe-requests": {
                             "subscribe-request": [
@@ -690,6 +742,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.discard_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     self.assertEqual(data, expected)
 
                     # Delete a subscription.
@@ -700,6 +753,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.apply_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected_after_delete = {}
                     self.assertEqual(data, expected_after_delete)
 
@@ -746,6 +800,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     config_subscription(sess, params)
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected = {
                         "subscribe-requests": {
                             "subscribe-request": [
@@ -814,6 +869,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.discard_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     self.assertEqual(data, expected)
 
                     # Delete a subscription.
@@ -824,6 +880,7 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                     sess.apply_changes()
                     sess.switch_datastore("operational")
                     data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    pop_statistics(data)
                     expected_after_delete = {}
                     self.assertEqual(data, expected_after_delete)
 
@@ -1644,6 +1701,94 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
 
         await self.run_test(test)
 
+    async def test_stream_on_change_counters(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Subscribe notification.
+                    sess.subscribe_notification(
+                        "goldstone-telemetry",
+                        "/goldstone-telemetry:telemetry-notify-event",
+                        self.notif_callback,
+                        asyncio_register=False,
+                    )
+
+                    # Set initial data.
+                    name = "Interface1/0/1"
+                    path_prefix = (
+                        f"/goldstone-interfaces:interfaces/interface[name='{name}']"
+                    )
+                    path = path_prefix + "/state/counters/in-octets"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", name)
+                    sess.apply_changes()
+
+                    def counters(in_octets):
+                        return {
+                            "goldstone-interfaces:interfaces": {
+                                "interface": [
+                                    {
+                                        "name": name,
+                                        "state": {"counters": {"in-octets": in_octets}},
+                                    }
+                                ]
+                            }
+                        }
+
+                    self.set_mock_oper_data("goldstone-interfaces", counters(1))
+                    time.sleep(self.NOTIFICATION_WAIT)
+
+                    # Add a subscription. Counters change without notifications though goldstone-interfaces has
+                    # a change source.
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": True,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "ON_CHANGE",
+                                "sample-interval": None,
+                                "suppress-redundant": None,
+                                "heartbeat-interval": None,
+                            }
+                        ],
+                    }
+                    s = params["subscriptions"][0]
+                    config_subscription(sess, params)
+
+                    # Receive notifications.
+                    time.sleep(self.NOTIFICATION_WAIT)
+                    expected_notifs = {
+                        "sync-response": {
+                            "type": "SYNC_RESPONSE",
+                            "request-id": params["id"],
+                        },
+                    }
+                    self.assertEqual(self.received_notif, expected_notifs)
+                    self.clear_received_notif()
+
+                    # Change the counter and wait default update interval.
+                    self.set_mock_oper_data("goldstone-interfaces", counters(2))
+                    time.sleep(5)
+
+                    # Receive notifications. The counter is polled.
+                    time.sleep(self.NOTIFICATION_WAIT)
+                    expected_notifs = {
+                        path: {
+                            "type": "UPDATE",
+                            "request-id": params["id"],
+                            "subscription-id": s["id"],
+                            "path": path,
+                            "json-data": "2",
+                        },
+                    }
+                    self.assertEqual(self.received_notif, expected_notifs)
+
+        await self.run_test(test)
+
     async def test_stream_on_change_not_changed_but_heartbeat_expired(self):
         def test():
             time.sleep(self.MOCK_WAIT)
@@ -1804,6 +1949,139 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
 
         await self.run_test(test)
 
+    async def test_statistics(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Subscribe notification.
+                    sess.subscribe_notification(
+                        "goldstone-telemetry",
+                        "/goldstone-telemetry:telemetry-notify-event",
+                        self.notif_callback,
+                        asyncio_register=False,
+                    )
+
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add a subscription.
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": False,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "SAMPLE",
+                                "sample-interval": 5 * 1000 * 1000 * 1000,
+                                "suppress-redundant": False,
+                                "heartbeat-interval": None,
+                            }
+                        ],
+                    }
+                    s = params["subscriptions"][0]
+                    config_subscription(sess, params)
+
+                    # Wait sample interval.
+                    time.sleep(self.NOTIFICATION_WAIT)
+                    time.sleep(s["sample-interval"] / 1000 / 1000 / 1000)
+                    time.sleep(self.NOTIFICATION_WAIT)
+
+                    # Get statistics.
+                    sess.switch_datastore("operational")
+                    data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    statistics = pop_statistics(data)[(params["id"], s["id"])]
+                    self.assertGreaterEqual(statistics["samples"], 2)
+                    self.assertEqual(
+                        statistics["sampled-leaves"], statistics["samples"]
+                    )
+                    self.assertEqual(statistics["last-sampled-leaves"], 1)
+                    self.assertGreaterEqual(statistics["notifications"], 2)
+                    self.assertEqual(statistics["skipped-ticks"], 0)
+                    self.assertNotIn("last-error", statistics)
+                    buckets = statistics["sample-duration"]
+                    self.assertEqual(
+                        sum(bucket["count"] for bucket in buckets),
+                        statistics["samples"],
+                    )
+                    self.assertEqual(buckets[-1]["upper-bound"], 2**64 - 1)
+
+        await self.run_test(test)
+
+
+class TestStreamSubscription(unittest.IsolatedAsyncioTestCase):
+    """Tests for StreamSubscription."""
+
+    CONFIG = {"id": 1, "config": {"mode": "STREAM"}}
+
+    async def test_stop_dedicated_sampler(self):
+        with mock.patch("goldstone.system.telemetry.telemetry.PathParser"), mock.patch(
+            "goldstone.system.telemetry.telemetry.Sampler"
+        ) as sampler:
+            subscription = StreamSubscription(
+                mock.Mock(), self.CONFIG, InMemoryTelemetryStore(), 1000
+            )
+            await subscription.stop()
+            sampler.return_value.stop.assert_called_once()
+
+    async def test_keep_shared_sampler(self):
+        sampler = mock.Mock()
+        with mock.patch("goldstone.system.telemetry.telemetry.PathParser"):
+            subscription = StreamSubscription(
+                mock.Mock(),
+                self.CONFIG,
+                InMemoryTelemetryStore(),
+                1000,
+                sampler=sampler,
+            )
+            await subscription.stop()
+        sampler.stop.assert_not_called()
+
+    async def test_on_change_generic_source(self):
+        config = {
+            "id": 1,
+            "config": {"mode": "STREAM"},
+            "subscriptions": {
+                "subscription": [
+                    {
+                        "id": 1,
+                        "config": {
+                            "id": 1,
+                            "path": "/goldstone-interfaces:interfaces/interface/config/mtu",
+                            "mode": "ON_CHANGE",
+                            "sample-interval": None,
+                            "suppress-redundant": False,
+                            "heartbeat-interval": 0,
+                        },
+                    }
+                ]
+            },
+        }
+        change_monitor = ChangeMonitor(mock.MagicMock())
+        change_monitor.start()
+        sampler = mock.Mock()
+        with mock.patch("goldstone.system.telemetry.telemetry.PathParser"):
+            subscription = StreamSubscription(
+                mock.Mock(),
+                config,
+                InMemoryTelemetryStore(),
+                1000,
+                change_monitor=change_monitor,
+                sampler=sampler,
+            )
+            subscription._listen_changes()
+            subscription._start_sampling()
+            # Commits are notified by the generic change source; the data are not polled.
+            sampler.add.assert_not_called()
+            await subscription.stop()
+
 
 if __name__ == "__main__":
     unittest.main()
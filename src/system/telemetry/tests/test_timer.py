@@ -0,0 +1,65 @@
+"""Tests for timer utilities."""
+
+
+import unittest
+from goldstone.system.telemetry.timer import TimerWheel
+
+
+class SmallTimerWheel(TimerWheel):
+    SLOTS = 4
+    LEVELS = 3
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Tests for TimerWheel."""
+
+    def test_expire(self):
+        w = TimerWheel(10)
+        w.add("a", 25)
+        w.add("b", 30)
+        w.add("c", 1000)
+        self.assertEqual(len(w), 3)
+        self.assertEqual(w.advance(20), [])
+        self.assertEqual(w.advance(30), ["a", "b"])
+        self.assertEqual(w.advance(990), [])
+        self.assertEqual(w.advance(1000), ["c"])
+        self.assertEqual(len(w), 0)
+
+    def test_past_deadline(self):
+        w = TimerWheel(10, now=100)
+        w.add("a", 50)
+        self.assertEqual(w.advance(100), [])
+        self.assertEqual(w.advance(110), ["a"])
+
+    def test_replace_and_cancel(self):
+        w = TimerWheel(10)
+        w.add("a", 100)
+        w.add("a", 200)
+        w.add("b", 100)
+        w.cancel("b")
+        w.cancel("unknown")
+        self.assertEqual(w.advance(100), [])
+        self.assertEqual(w.advance(200), ["a"])
+
+    def test_upper_wheels(self):
+        w = SmallTimerWheel(1)
+        deadlines = {
+            "level0": 2,
+            "level1": 4 * 3 + 1,
+            "level2": 4**2 * 2 + 3,
+            "overflow": 4**3 * 5 + 2,
+        }
+        for key, deadline in deadlines.items():
+            w.add(key, deadline)
+        expired = {}
+        now = 0
+        while len(w) > 0:
+            now += 3
+            for key in w.advance(now):
+                expired[key] = now
+        for key, deadline in deadlines.items():
+            self.assertTrue(deadline <= expired[key] < deadline + 3, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
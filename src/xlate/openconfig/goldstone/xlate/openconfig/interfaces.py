@@ -460,6 +460,29 @@ class InterfaceFactory(OpenConfigObjectFactory):
             },
         ]
 
+    def required_data_for(self, keys):
+        name = keys.get("name")
+        if name is None:
+            return self.required_data()
+        # OpenConfig interface names are the same as Goldstone interface names
+        return [
+            {
+                "name": "components",
+                "xpath": "/goldstone-platform:components/component",
+                "default": [],
+            },
+            {
+                "name": "interfaces",
+                "xpath": f"/goldstone-interfaces:interfaces/interface[name='{name}']",
+                "default": [],
+            },
+        ]
+
+    def create_for(self, gs, keys):
+        if isinstance(gs["interfaces"], dict):
+            gs["interfaces"] = [gs["interfaces"]]
+        return super().create_for(gs, keys)
+
     def create(self, gs):
         self._initialize()
         self.gs = gs
@@ -474,8 +497,10 @@ class InterfaceFactory(OpenConfigObjectFactory):
 class InterfaceServer(OpenConfigServer):
     """InterfaceServer provides a service for the openconfig-interfaces module to central datastore."""
 
-    def __init__(self, conn, reconciliation_interval=10):
-        super().__init__(conn, "openconfig-interfaces", reconciliation_interval)
+    def __init__(self, conn, reconciliation_interval=10, snapshot=None):
+        super().__init__(
+            conn, "openconfig-interfaces", reconciliation_interval, snapshot
+        )
         self.handlers = {
             "interfaces": {
                 "interface": {
@@ -506,7 +531,7 @@ class InterfaceServer(OpenConfigServer):
         # NOTE: This should be implemented as a separated class of function to remove the dependency from the
         #     InterfaceServer to specific data models and their details.
         data = self.get_running_data("/openconfig-interfaces:interfaces/interface", [])
-        sess = self.conn.conn.new_session()
+        sess = self.conn.conn.new_session(pooled=True)
         for configs in data:
             name = configs["name"]
 
@@ -24,13 +24,19 @@ See class docstrings for detailed usage.
 from abc import abstractmethod
 import logging
 import asyncio
+import copy
+import os
+import time
 import libyang
 from goldstone.lib.core import ChangeHandler, ServerBase
 from goldstone.lib.errors import Error, InvalArgError, NotFoundError
+from goldstone.lib.xpath import split as xpath_split
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SNAPSHOT_WINDOW = float(os.getenv("GOLDSTONE_OPENCONFIG_SNAPSHOT_WINDOW", 1))
+
 
 class OpenConfigChangeHandler(ChangeHandler):
     """ChangeHandler base for OpenConfig translators.
@@ -48,7 +54,7 @@ class OpenConfigChangeHandler(ChangeHandler):
 
     def __init__(self, server, change):
         super().__init__(server, change)
-        self.xpath = list(libyang.xpath_split(change.xpath))
+        self.xpath = xpath_split(change.xpath)
         self.value = None
         self.original_value = None
 
@@ -204,6 +210,125 @@ class OpenConfigObjectFactory:
         """
         pass
 
+    def required_data_for(self, keys):
+        """Return required data list to create OpenConfig objects selected by list keys.
+
+        Override this to fetch only the Goldstone data for the selected objects. It returns required_data() by
+        default.
+
+        Args:
+            keys (dict): List keys of the requested objects. e.g. {"name": "Ethernet1/0/1"}
+
+        Returns:
+            list: List of required data dictionaries. See required_data().
+        """
+        return self.required_data()
+
+    def create_for(self, gs, keys):
+        """Create OpenConfig objects selected by list keys.
+
+        Override this to create only the selected objects. It filters the result of create() by default.
+
+        Args:
+            gs (dict): Data from Goldstone native/primitive models.
+            keys (dict): List keys of the requested objects. e.g. {"name": "Ethernet1/0/1"}
+
+        Returns:
+            list: List of dictionalies. Each dictionaly represents an OpenConfig object.
+        """
+        objects = self.create(gs)
+        if not keys:
+            return objects
+        return [o for o in objects if all(str(o.get(k)) == v for k, v in keys.items())]
+
+
+class SourceDataSnapshot:
+    """Snapshot of Goldstone operational state data shared by OpenConfig servers.
+
+    OpenConfig servers in one process require the same Goldstone data. e.g. "openconfig-interfaces",
+    "openconfig-platform" and "openconfig-terminal-device" all require "/goldstone-interfaces:interfaces/interface".
+    A gNMI Get across the OpenConfig modules calls oper_cb() of each server. The snapshot lets them share one fetch of
+    each xpath.
+
+    Data fetched within the coherence window are reused. Concurrent requests for the same xpath share one fetch. Each
+    caller gets its own copy of the data, so factories may modify it.
+
+    Args:
+        conn (Connector): Connection to the central datastore.
+        window (float): Coherence window in seconds. 0 disables the reuse of fetched data.
+
+    Attributes:
+        window (float): Coherence window in seconds.
+        hits (int): Number of requests answered from the snapshot or from an in-flight fetch.
+        misses (int): Number of requests which started a fetch.
+        fetch_time (float): Total time spent for fetches in seconds.
+    """
+
+    def __init__(self, conn, window=DEFAULT_SNAPSHOT_WINDOW):
+        self.conn = conn
+        self.window = window
+        self._data = {}  # key: xpath, value: (fetched time, data)
+        self._inflight = {}  # key: xpath, value: fetch task
+        self.hits = 0
+        self.misses = 0
+        self.fetch_time = 0.0
+
+    async def _fetch(self, xpath):
+        start = time.monotonic()
+        data = await self.conn.aio.get_operational(xpath)
+        end = time.monotonic()
+        self.fetch_time += end - start
+        logger.debug("xpath: %s, fetch time: %fsec", xpath, end - start)
+        # don't keep the data when the snapshot was invalidated while fetching
+        if self._inflight.get(xpath) is asyncio.current_task():
+            self._data[xpath] = (end, data)
+        return data
+
+    async def get(self, xpath, default=None):
+        """Get Goldstone operational state data.
+
+        Args:
+            xpath (str): Path to the data.
+            default (any): Default value if the data is not found.
+
+        Returns:
+            any: Copy of the data.
+        """
+        entry = self._data.get(xpath)
+        if entry is not None and time.monotonic() - entry[0] < self.window:
+            self.hits += 1
+            data = entry[1]
+        elif xpath in self._inflight:
+            self.hits += 1
+            data = await asyncio.shield(self._inflight[xpath])
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(xpath))
+            self._inflight[xpath] = task
+
+            def done(_):
+                if self._inflight.get(xpath) is task:
+                    del self._inflight[xpath]
+
+            task.add_done_callback(done)
+            data = await asyncio.shield(task)
+        if data is None:
+            return default
+        return copy.deepcopy(data)
+
+    def invalidate(self):
+        """Drop the snapshot. Following requests fetch the data again."""
+        self._data = {}
+        self._inflight = {}
+
+    def stats(self):
+        """Get counters of the snapshot.
+
+        Returns:
+            dict: "hits", "misses" and "fetch-time" (seconds).
+        """
+        return {"hits": self.hits, "misses": self.misses, "fetch-time": self.fetch_time}
+
 
 class OpenConfigServer(ServerBase):
     """Server base for OpenConfig translators.
@@ -223,11 +348,14 @@ class OpenConfigServer(ServerBase):
         conn (Connector): Connection to the central datastore.
         module (str): YANG module name of the service. e.g. "openconfig-interfaces"
         reconciliation_interval (int): Interval seconds between executions of the reconcile task.
+        snapshot (SourceDataSnapshot): Goldstone data shared with other OpenConfig servers. None to fetch the data
+            for each request.
 
     Attributes:
         conn (Connector): Connection to the central datastore.
         reconciliation_interval (int): Interval seconds between executions of the reconcile task.
         reconcile_task (Task): Reconcile task instance.
+        snapshot (SourceDataSnapshot): Goldstone data shared with other OpenConfig servers.
         handlers (dict): "OpenConfigChangeHandler"s for each configurable OpenConfig path.
             e.g.
             {
@@ -248,10 +376,11 @@ class OpenConfigServer(ServerBase):
             }
     """
 
-    def __init__(self, conn, module, reconciliation_interval=10):
+    def __init__(self, conn, module, reconciliation_interval=10, snapshot=None):
         super().__init__(conn, module)
         self.reconciliation_interval = reconciliation_interval
         self.reconcile_task = None
+        self.snapshot = snapshot
         self.handlers = {}
         self.objects = {}
 
@@ -283,8 +412,8 @@ class OpenConfigServer(ServerBase):
         Args:
             user (dict): Context attributes to provide to "OpenConfigChangeHandler"s.
         """
-        sess_running = self.conn.conn.new_session("running")
-        sess_operational = self.conn.conn.new_session("operational")
+        sess_running = self.conn.conn.new_session("running", pooled=True)
+        sess_operational = self.conn.conn.new_session("operational", pooled=True)
         user["sess"] = {
             "running": sess_running,
             "operational": sess_operational,
@@ -302,31 +431,108 @@ class OpenConfigServer(ServerBase):
             user["sess"]["running"].apply()
             user["sess"]["running"].stop()
             user["sess"]["operational"].stop()
+            if self.snapshot:
+                self.snapshot.invalidate()
         except Error as e:
             # Just for logging.
             logger.error("Failed to apply changes. %s", e)
             raise e
 
+    async def _fetch_required_data(self, factories, keys=None):
+        """Fetch the required data of factories concurrently.
+
+        Each xpath is fetched once even if more than one factory requires it.
+
+        Args:
+            factories (list): "OpenConfigObjectFactory"s.
+            keys (dict): List keys of the requested objects. None to fetch the data for all objects.
+
+        Returns:
+            list: Source data, the argument of the create(), for each factory.
+        """
+        if keys:
+            required_data = [factory.required_data_for(keys) for factory in factories]
+        else:
+            required_data = [factory.required_data() for factory in factories]
+        xpaths = list(dict.fromkeys(d["xpath"] for r in required_data for d in r))
+        if self.snapshot:
+            get = self.snapshot.get
+        else:
+            get = self.get_operational_data_async
+        results = await asyncio.gather(*(get(xpath) for xpath in xpaths))
+        data = dict(zip(xpaths, results))
+        used = set()
+        srcs = []
+        for r in required_data:
+            src = {}
+            for d in r:
+                v = data[d["xpath"]]
+                if v is None:
+                    v = d["default"]
+                elif d["xpath"] in used:
+                    # factories may modify the source data
+                    v = copy.deepcopy(v)
+                used.add(d["xpath"])
+                src[d["name"]] = v
+            srcs.append(src)
+        return srcs
+
     async def _create_objects(self, factory):
-        required_data = factory.required_data()
-        src = {}
-        for d in required_data:
-            data = self.get_operational_data(d["xpath"], d["default"])
-            src[d["name"]] = data
+        [src] = await self._fetch_required_data([factory])
         return factory.create(src)
 
     async def _create_tree(self, subtree):
+        factories = []
+
+        def walk(subtree, result):
+            for k, v in subtree.items():
+                if isinstance(v, dict):
+                    result[k] = {}
+                    walk(v, result[k])
+                elif isinstance(v, OpenConfigObjectFactory):
+                    factories.append((result, k, v))
+
         result = {}
-        for k, v in subtree.items():
-            if isinstance(v, dict):
-                result[k] = await self._create_tree(v)
-            elif isinstance(v, OpenConfigObjectFactory):
-                result[k] = await self._create_objects(v)
+        walk(subtree, result)
+        srcs = await self._fetch_required_data([v for _, _, v in factories])
+        for (parent, k, factory), src in zip(factories, srcs):
+            parent[k] = factory.create(src)
         return result
 
+    def _route(self, xpath):
+        """Find the part of "objects" which serves the requested xpath.
+
+        Args:
+            xpath (str): Requested xpath.
+                e.g. "/openconfig-platform:components/component[name='PORT-1']/state/temperature"
+
+        Returns:
+            tuple: (path, subtree, keys).
+                path (list): Names of the containers from the top to the subtree. e.g. ["components", "component"]
+                subtree (dict or OpenConfigObjectFactory): "objects" or its part to serve the xpath.
+                keys (dict): List keys for the factory. e.g. {"name": "PORT-1"}
+        """
+        path = []
+        subtree = self.objects
+        try:
+            elems = xpath_split(xpath)
+        except (ValueError, TypeError):
+            return path, subtree, {}
+        for _, name, keys in elems:
+            if not isinstance(subtree, dict) or name not in subtree:
+                break
+            path.append(name)
+            subtree = subtree[name]
+            if isinstance(subtree, OpenConfigObjectFactory):
+                return path, subtree, dict(keys)
+        return path, subtree, {}
+
     async def oper_cb(self, xpath, priv):
         """Callback function to get operational state of the service.
 
+        Only the part of "objects" that the requested xpath points to is created. If the xpath has list keys of a
+        factory's objects, the factory creates the selected objects only.
+
         Returns:
             dict: Operational states in a tree form.
                 e.g.
@@ -335,9 +541,16 @@ class OpenConfigServer(ServerBase):
                     {"name": "Ethernet1/0/2", "state": {"oper-status": "DOWN"}},
                 ]}}
         """
+        path, subtree, keys = self._route(xpath)
         try:
-            result = await self._create_tree(self.objects)
+            if isinstance(subtree, OpenConfigObjectFactory):
+                [src] = await self._fetch_required_data([subtree], keys)
+                result = subtree.create_for(src, keys)
+            else:
+                result = await self._create_tree(subtree)
         except Exception as e:
             logger.error("Operational state creation failed. %s", e)
             raise e
+        for name in reversed(path):
+            result = {name: result}
         return result
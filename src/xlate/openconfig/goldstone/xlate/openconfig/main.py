@@ -8,6 +8,7 @@ import itertools
 import json
 from goldstone.lib.util import start_probe, call
 from goldstone.lib.connector.sysrepo import Connector
+from .lib import SourceDataSnapshot
 from .interfaces import InterfaceServer
 from .platform import PlatformServer
 from .terminal_device import TerminalDeviceServer
@@ -51,9 +52,10 @@ def main():
         loop.add_signal_handler(signal.SIGTERM, stop_event.set)
 
         conn = Connector()
-        ifserver = InterfaceServer(conn)
-        pfserver = PlatformServer(conn, operational_modes)
-        tdserver = TerminalDeviceServer(conn, operational_modes)
+        snapshot = SourceDataSnapshot(conn)
+        ifserver = InterfaceServer(conn, snapshot=snapshot)
+        pfserver = PlatformServer(conn, operational_modes, snapshot=snapshot)
+        tdserver = TerminalDeviceServer(conn, operational_modes, snapshot=snapshot)
         tlserver = TelemetryServer(conn)
         servers = [ifserver, pfserver, tdserver, tlserver]
 
@@ -677,6 +677,31 @@ class Component:
         """
         pass
 
+    # state leaves of the parent component update_by_parent() uses
+    INHERITED_STATE = ()
+
+    def inputs(self):
+        """Get Goldstone operational state data the component is created from.
+
+        Returns:
+            tuple: Goldstone data.
+        """
+        return ()
+
+    def inherited_state(self, parent):
+        """Get state of the parent component update_by_parent() uses.
+
+        Args:
+            parent (Component): Parent component.
+
+        Returns:
+            tuple: Values of INHERITED_STATE leaves.
+        """
+        if parent is None:
+            return ()
+        state = parent.data.get("state", {})
+        return tuple(state.get(k) for k in self.INHERITED_STATE)
+
     def set_parent(self, name):
         """Set a parent component.
 
@@ -720,6 +745,9 @@ class Chassis(Component):
         self.data["state"]["oper-status"] = "openconfig-platform-types:ACTIVE"
         self.data["state"]["removable"] = False
 
+    def inputs(self):
+        return (self.comp_sys, self.comp_thermal, self.system)
+
     def _temperature(self, temperature):
         """
         Args:
@@ -798,6 +826,9 @@ class TerminalLinePort(Component):
             }
         }
 
+    def inputs(self):
+        return (self.module,)
+
     def _id(self, id_):
         """
         Args:
@@ -884,6 +915,9 @@ class LineTransceiver(Component):
         self.data["state"]["type"] = "openconfig-platform-types:TRANSCEIVER"
         self.data["state"]["removable"] = True
 
+    def inputs(self):
+        return (self.module,)
+
     def _id(self, id_):
         """
         Args:
@@ -939,6 +973,8 @@ class LineTransceiver(Component):
                         "instant": self._temperature(temp)
                     }
 
+    INHERITED_STATE = ("oper-status",)
+
     def update_by_parent(self, parent):
         if parent:
             state = parent.data.get("state")
@@ -979,6 +1015,9 @@ class OpticalChannel(Component):
             ]
         }
 
+    def inputs(self):
+        return (self.module, self.network_interface)
+
     def _id(self, id_):
         """
         Args:
@@ -1233,6 +1272,9 @@ class TerminalClientPort(Component):
             }
         }
 
+    def inputs(self):
+        return (self.component, self.interface)
+
     def _oper_status(self, presence, oper_status):
         """
         Args:
@@ -1321,6 +1363,9 @@ class ClientTransceiver(Component):
         self.data["state"]["type"] = "openconfig-platform-types:TRANSCEIVER"
         self.data["state"]["removable"] = True
 
+    def inputs(self):
+        return (self.component, self.interface)
+
     def translate(self):
         if self.component:
             state = self.component.get("state")
@@ -1345,6 +1390,8 @@ class ClientTransceiver(Component):
                     if model is not None:
                         self.data["state"]["part-no"] = model
 
+    INHERITED_STATE = ("oper-status", "location")
+
     def update_by_parent(self, parent):
         if parent:
             state = parent.data.get("state")
@@ -1372,6 +1419,9 @@ class Fan(Component):
         self.component = component
         self.data["state"]["type"] = "openconfig-platform-types:FAN"
 
+    def inputs(self):
+        return (self.component,)
+
     def _oper_status(self, fan_state, status):
         """
         Args:
@@ -1430,6 +1480,9 @@ class PowerSupply(Component):
         self.component = component
         self.data["state"]["type"] = "openconfig-platform-types:POWER_SUPPLY"
 
+    def inputs(self):
+        return (self.component,)
+
     def _oper_status(self, psu_state, status):
         """
         Args:
@@ -1516,51 +1569,57 @@ class ComponentFactory(OpenConfigObjectFactory):
     def __init__(self, operational_modes, cnr):
         self.operational_modes = operational_modes
         self.cnr = cnr
+        # key: component name, value: (inputs, data) of the previous create()
+        self._tree = {}
 
     def _initialize(self):
         self.gs = None
+        self._components_by_type = {}
+        self._interfaces_by_component = {}
 
-    def _get_interface(self, name):
+    def _build_indexes(self):
+        """Index Goldstone data to look up components and interfaces in constant time."""
+        for component in self.gs["components"]:
+            self._components_by_type.setdefault(component["state"]["type"], []).append(
+                component
+            )
         for interface in self.gs["interfaces"]:
             try:
-                if interface["component-connection"]["platform"]["component"] == name:
-                    return interface
+                name = interface["component-connection"]["platform"]["component"]
             except (KeyError, TypeError):
                 continue
-        return {}
+            self._interfaces_by_component.setdefault(name, interface)
+
+    def _get_components(self, type_):
+        return self._components_by_type.get(type_, [])
+
+    def _get_interface(self, name):
+        return self._interfaces_by_component.get(name, {})
+
+    def _index_by_name(self, components):
+        index = {}
+        for component in components:
+            index.setdefault(component.name, component)
+        return index
 
     def _get_parent_line_port(self, line_ports, line_transceiver):
         expected_parent_name = self.cnr.get_terminal_line_port(line_transceiver.module)
-        for line_port in line_ports:
-            if line_port.name == expected_parent_name:
-                return line_port
-        return None
+        return line_ports.get(expected_parent_name)
 
     def _get_parent_line_transceiver(self, line_transceivers, optical_channel):
         expected_parent_name = self.cnr.get_line_transceiver(optical_channel.module)
-        for line_transceiver in line_transceivers:
-            if line_transceiver.name == expected_parent_name:
-                return line_transceiver
-        return None
+        return line_transceivers.get(expected_parent_name)
 
     def _get_parent_client_port(self, client_ports, client_transceiver):
         expected_parent_name = self.cnr.get_terminal_client_port(
             client_transceiver.component
         )
-        for client_port in client_ports:
-            if client_port.name == expected_parent_name:
-                return client_port
-        return None
+        return client_ports.get(expected_parent_name)
 
     def _create_chassis(self):
-        comp_sys = None
-        comp_thermal = None
-        for component in self.gs["components"]:
-            if not comp_sys and component["state"]["type"] == "SYS":
-                comp_sys = component
-            if not comp_thermal and component["state"]["type"] == "THERMAL":
-                # TODO: Which THERMAL component is suitable?
-                comp_thermal = component
+        comp_sys = next(iter(self._get_components("SYS")), None)
+        # TODO: Which THERMAL component is suitable?
+        comp_thermal = next(iter(self._get_components("THERMAL")), None)
         chassis = Chassis(
             self.cnr.get_chassis(), comp_sys, comp_thermal, self.gs["system"]
         )
@@ -1599,50 +1658,39 @@ class ComponentFactory(OpenConfigObjectFactory):
 
     def _create_terminal_client_ports(self):
         client_ports = []
-        for component in self.gs["components"]:
-            if component["state"]["type"] == "TRANSCEIVER":
-                interface = self._get_interface(component["name"])
-                client_port = TerminalClientPort(
-                    self.cnr.get_terminal_client_port(component), component, interface
-                )
-                client_ports.append(client_port)
+        for component in self._get_components("TRANSCEIVER"):
+            interface = self._get_interface(component["name"])
+            client_port = TerminalClientPort(
+                self.cnr.get_terminal_client_port(component), component, interface
+            )
+            client_ports.append(client_port)
         return client_ports
 
     def _create_client_transceivers(self):
         transceivers = []
-        for component in self.gs["components"]:
-            if component["state"]["type"] == "TRANSCEIVER":
-                if not component["transceiver"]["state"]["presence"] == "UNPLUGGED":
-                    interface = self._get_interface(component["name"])
-                    transceiver = ClientTransceiver(
-                        self.cnr.get_client_transceiver(component), component, interface
-                    )
-                    transceivers.append(transceiver)
+        for component in self._get_components("TRANSCEIVER"):
+            if not component["transceiver"]["state"]["presence"] == "UNPLUGGED":
+                interface = self._get_interface(component["name"])
+                transceiver = ClientTransceiver(
+                    self.cnr.get_client_transceiver(component), component, interface
+                )
+                transceivers.append(transceiver)
         return transceivers
 
     def _create_fans(self):
         fans = []
-        for component in self.gs["components"]:
-            if component["state"]["type"] == "FAN":
-                fan = Fan(self.cnr.get_fan(component), component)
-                fans.append(fan)
+        for component in self._get_components("FAN"):
+            fan = Fan(self.cnr.get_fan(component), component)
+            fans.append(fan)
         return fans
 
     def _create_power_supplies(self):
         power_supplies = []
-        for component in self.gs["components"]:
-            if component["state"]["type"] == "PSU":
-                power_supply = PowerSupply(
-                    self.cnr.get_power_supply(component), component
-                )
-                power_supplies.append(power_supply)
+        for component in self._get_components("PSU"):
+            power_supply = PowerSupply(self.cnr.get_power_supply(component), component)
+            power_supplies.append(power_supply)
         return power_supplies
 
-    def _set_hierarchy(self, parent, child):
-        child.set_parent(parent.name)
-        child.update_by_parent(parent)
-        parent.append_subcomponent(child.name)
-
     def required_data(self):
         return [
             {
@@ -1670,6 +1718,7 @@ class ComponentFactory(OpenConfigObjectFactory):
     def create(self, gs):
         self._initialize()
         self.gs = gs
+        self._build_indexes()
         chassis = self._create_chassis()
         line_ports = self._create_terminal_line_ports()
         line_transceivers = self._create_line_transceivers()
@@ -1688,8 +1737,6 @@ class ComponentFactory(OpenConfigObjectFactory):
             + fans
             + power_supplies
         )
-        for component in components:
-            component.translate()
         # Component hierarchy:
         #     CASSIS
         #     +-- PORT (TERMINAL_LINE)
@@ -1699,30 +1746,84 @@ class ComponentFactory(OpenConfigObjectFactory):
         #     |   +-- TRANSCEIVER (CLIENT)
         #     +-- FAN
         #     +-- POWER_SUPPLY
+        line_ports_by_name = self._index_by_name(line_ports)
+        line_transceivers_by_name = self._index_by_name(line_transceivers)
+        client_ports_by_name = self._index_by_name(client_ports)
+        hierarchy = []
         for line_port in line_ports:
-            self._set_hierarchy(chassis, line_port)
+            hierarchy.append((chassis, line_port))
         for line_transceiver in line_transceivers:
-            line_port = self._get_parent_line_port(line_ports, line_transceiver)
-            self._set_hierarchy(line_port, line_transceiver)
+            line_port = self._get_parent_line_port(line_ports_by_name, line_transceiver)
+            hierarchy.append((line_port, line_transceiver))
         for optical_channel in optical_channels:
             line_transceiver = self._get_parent_line_transceiver(
-                line_transceivers, optical_channel
+                line_transceivers_by_name, optical_channel
             )
-            self._set_hierarchy(line_transceiver, optical_channel)
+            hierarchy.append((line_transceiver, optical_channel))
         for client_port in client_ports:
-            self._set_hierarchy(chassis, client_port)
+            hierarchy.append((chassis, client_port))
         for client_transceiver in client_transceivers:
-            client_port = self._get_parent_client_port(client_ports, client_transceiver)
-            self._set_hierarchy(client_port, client_transceiver)
+            client_port = self._get_parent_client_port(
+                client_ports_by_name, client_transceiver
+            )
+            hierarchy.append((client_port, client_transceiver))
         for fan in fans:
-            self._set_hierarchy(chassis, fan)
+            hierarchy.append((chassis, fan))
         for power_supply in power_supplies:
-            self._set_hierarchy(chassis, power_supply)
+            hierarchy.append((chassis, power_supply))
+        self._build(components, hierarchy)
         result = []
         for component in components:
             result.append(component.data)
         return result
 
+    def _build(self, components, hierarchy):
+        """Translate components and set their hierarchy.
+
+        A component whose inputs are the same as the previous create() reuses the data created then instead of
+        translating again. The inputs are the Goldstone data of the component, its parent and subcomponents, and the
+        parent's state it inherits with update_by_parent().
+
+        Args:
+            components (list): Components. A parent must come before its subcomponents.
+            hierarchy (list): (parent, subcomponent) tuples.
+        """
+        parents = {}
+        subcomponents = {}
+        for parent, child in hierarchy:
+            if parent is None:
+                continue
+            parents[id(child)] = parent
+            subcomponents.setdefault(id(parent), []).append(child.name)
+
+        tree = {}
+        for component in components:
+            parent = parents.get(id(component))
+            children = subcomponents.get(id(component), [])
+            inputs = (
+                type(component),
+                component.inputs(),
+                parent.name if parent else None,
+                component.inherited_state(parent),
+                tuple(children),
+            )
+            previous = self._tree.get(component.name)
+            if previous is not None and previous[0] == inputs:
+                component.data = previous[1]
+            else:
+                component.translate()
+                if parent:
+                    component.set_parent(parent.name)
+                    component.update_by_parent(parent)
+                for name in children:
+                    component.append_subcomponent(name)
+            # a component with a duplicated name is always translated
+            if component.name in tree:
+                tree[component.name] = None
+            else:
+                tree[component.name] = (inputs, component.data)
+        self._tree = {k: v for k, v in tree.items() if v is not None}
+
 
 class PlatformServer(OpenConfigServer):
     """PlatformServer provides a service for the openconfig-platform module to central datastore.
@@ -1735,8 +1836,10 @@ class PlatformServer(OpenConfigServer):
         cnr (ComponentNameResolver): OpenConfig component name resolver.
     """
 
-    def __init__(self, conn, operational_modes, reconciliation_interval=10):
-        super().__init__(conn, "openconfig-platform", reconciliation_interval)
+    def __init__(
+        self, conn, operational_modes, reconciliation_interval=10, snapshot=None
+    ):
+        super().__init__(conn, "openconfig-platform", reconciliation_interval, snapshot)
         self.handlers = {
             "components": {
                 "component": {
@@ -865,8 +865,12 @@ class TerminalDeviceServer(OpenConfigServer):
         operational_modes (dict): Suppoerted operational-modes.
     """
 
-    def __init__(self, conn, operational_modes, reconciliation_interval=10):
-        super().__init__(conn, "openconfig-terminal-device", reconciliation_interval)
+    def __init__(
+        self, conn, operational_modes, reconciliation_interval=10, snapshot=None
+    ):
+        super().__init__(
+            conn, "openconfig-terminal-device", reconciliation_interval, snapshot
+        )
         self.handlers = {"terminal-device": {}}
         self.operational_modes = operational_modes
         cnr = ComponentNameResolver()
@@ -0,0 +1,129 @@
+"""Benchmark of ComponentFactory.create().
+
+Builds OpenConfig components from synthetic Goldstone data of a chassis with many transceivers and modules. Compares
+ComponentFactory with a factory which looks up interfaces and parent components by scanning lists, as it used to.
+"steady state" creates the components again from an unchanged copy of the data with the same factory, which reuses
+the components created before.
+
+    cd src/xlate/openconfig && python -m tests.bench_platform
+"""
+
+import logging
+import copy
+import timeit
+
+from goldstone.xlate.openconfig.platform import ComponentFactory, ComponentNameResolver
+
+logger = logging.getLogger(__name__)
+
+
+class LinearScanComponentFactory(ComponentFactory):
+    def _get_interface(self, name):
+        for interface in self.gs["interfaces"]:
+            try:
+                if interface["component-connection"]["platform"]["component"] == name:
+                    return interface
+            except (KeyError, TypeError):
+                continue
+        return {}
+
+    def _index_by_name(self, components):
+        return components
+
+    def _find(self, components, name):
+        for component in components:
+            if component.name == name:
+                return component
+        return None
+
+    def _get_parent_line_port(self, line_ports, line_transceiver):
+        name = self.cnr.get_terminal_line_port(line_transceiver.module)
+        return self._find(line_ports, name)
+
+    def _get_parent_line_transceiver(self, line_transceivers, optical_channel):
+        name = self.cnr.get_line_transceiver(optical_channel.module)
+        return self._find(line_transceivers, name)
+
+    def _get_parent_client_port(self, client_ports, client_transceiver):
+        name = self.cnr.get_terminal_client_port(client_transceiver.component)
+        return self._find(client_ports, name)
+
+
+def gs_data(n):
+    components = [
+        {"name": "SYS", "state": {"name": "SYS", "type": "SYS", "id": 1}},
+        {
+            "name": "THERMAL SENSOR1",
+            "state": {"name": "THERMAL SENSOR1", "type": "THERMAL"},
+            "thermal": {"state": {"temperature": 10000}},
+        },
+    ]
+    interfaces = []
+    for i in range(n):
+        name = f"port{i}"
+        components.append(
+            {
+                "name": name,
+                "state": {"name": name, "type": "TRANSCEIVER", "id": 1000 + i},
+                "transceiver": {"state": {"presence": "PRESENT"}},
+            }
+        )
+        interfaces.append(
+            {
+                "name": f"Ethernet{i}",
+                "state": {"name": f"Ethernet{i}", "oper-status": "UP"},
+                "component-connection": {"platform": {"component": name}},
+            }
+        )
+    for i in range(n // 8):
+        components.append(
+            {
+                "name": f"fan{i}",
+                "state": {"name": f"fan{i}", "type": "FAN"},
+                "fan": {"state": {"fan-state": "PRESENT", "status": "RUNNING"}},
+            }
+        )
+    modules = [
+        {
+            "name": f"piu{i}",
+            "state": {"name": f"piu{i}", "oper-status": "ready", "location": str(i)},
+            "network-interface": [{"name": "1", "state": {"name": "1"}}],
+        }
+        for i in range(n // 4)
+    ]
+    return {
+        "components": components,
+        "modules": modules,
+        "interfaces": interfaces,
+        "system": {"state": {"software-version": "Software version"}},
+    }
+
+
+def main():
+    cnr = ComponentNameResolver()
+    factories = {
+        "linear scan": lambda: LinearScanComponentFactory({}, cnr),
+        "indexed": lambda: ComponentFactory({}, cnr),
+    }
+    for n in [256, 1024, 2048]:
+        gs = gs_data(n)
+        results = [f().create(gs) for f in factories.values()]
+        assert all(r == results[0] for r in results)
+        logger.info(f"{len(results[0])} OpenConfig components")
+        for name, f in factories.items():
+            elapsed = min(timeit.repeat(lambda: f().create(gs), number=1, repeat=3))
+            logger.info(f"{name:>14}: {elapsed * 1000:.3f} msec/create")
+
+        factory = ComponentFactory({}, cnr)
+        factory.create(gs)
+        copies = [copy.deepcopy(gs) for _ in range(3)]
+        elapsed = min(
+            timeit.timeit(lambda: factory.create(v), number=1) for v in copies
+        )
+        assert factory.create(copy.deepcopy(gs)) == results[0]
+        logger.info(f"{'steady state':>14}: {elapsed * 1000:.3f} msec/create")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -188,6 +188,7 @@ def run_mock_server(q, mock_modules):
                                 handler[node] = msg["handler"]
                             else:
                                 handler = handler[node]
+                        servers[msg["server"]].compile_handlers()
 
         tasks.append(evloop())
         tasks = [
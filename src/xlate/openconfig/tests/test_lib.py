@@ -0,0 +1,126 @@
+"""Tests of the OpenConfig translator framework library."""
+
+
+import unittest
+from unittest import mock
+from goldstone.xlate.openconfig.lib import OpenConfigServer, OpenConfigObjectFactory
+
+
+class MockSnapshot:
+    def __init__(self, data):
+        self.data = data
+        self.requested = []
+
+    async def get(self, xpath, default=None):
+        self.requested.append(xpath)
+        return self.data.get(xpath, default)
+
+
+class ItemFactory(OpenConfigObjectFactory):
+    def __init__(self):
+        self.created = 0
+
+    def required_data(self):
+        return [{"name": "items", "xpath": "/goldstone-mock:items/item", "default": []}]
+
+    def create(self, gs):
+        self.created += 1
+        return [{"name": item["name"], "state": item} for item in gs["items"]]
+
+
+class KeyedItemFactory(ItemFactory):
+    def required_data_for(self, keys):
+        return [
+            {
+                "name": "items",
+                "xpath": f"/goldstone-mock:items/item[name='{keys['name']}']",
+                "default": [],
+            }
+        ]
+
+
+class TestOpenConfigServerOperCb(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        conn = mock.MagicMock()
+        conn.type = "sysrepo"
+        patcher = mock.patch("goldstone.lib.core.create_server_connector")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.snapshot = MockSnapshot(
+            {
+                "/goldstone-mock:items/item": [{"name": "A"}, {"name": "B"}],
+                "/goldstone-mock:items/item[name='B']": [{"name": "B"}],
+                "/goldstone-mock:modes/mode": [{"name": "1"}],
+            }
+        )
+        self.server = OpenConfigServer(conn, "openconfig-mock", snapshot=self.snapshot)
+        self.items = ItemFactory()
+        self.modes = ItemFactory()
+        self.modes.required_data = lambda: [
+            {"name": "items", "xpath": "/goldstone-mock:modes/mode", "default": []}
+        ]
+        self.server.objects = {
+            "top": {
+                "items": {"item": self.items},
+                "modes": {"mode": self.modes},
+            }
+        }
+
+    async def test_whole_tree(self):
+        result = await self.server.oper_cb("/openconfig-mock:top", None)
+        self.assertEqual(
+            result,
+            {
+                "top": {
+                    "items": {
+                        "item": [
+                            {"name": "A", "state": {"name": "A"}},
+                            {"name": "B", "state": {"name": "B"}},
+                        ]
+                    },
+                    "modes": {"mode": [{"name": "1", "state": {"name": "1"}}]},
+                }
+            },
+        )
+
+    async def test_subtree(self):
+        result = await self.server.oper_cb("/openconfig-mock:top/modes", None)
+        self.assertEqual(
+            result,
+            {"top": {"modes": {"mode": [{"name": "1", "state": {"name": "1"}}]}}},
+        )
+        self.assertEqual(self.items.created, 0)
+        self.assertEqual(self.snapshot.requested, ["/goldstone-mock:modes/mode"])
+
+    async def test_list_entry(self):
+        result = await self.server.oper_cb(
+            "/openconfig-mock:top/items/item[name='B']/state/name", None
+        )
+        self.assertEqual(
+            result,
+            {"top": {"items": {"item": [{"name": "B", "state": {"name": "B"}}]}}},
+        )
+        self.assertEqual(self.modes.created, 0)
+
+    async def test_list_entry_keyed_fetch(self):
+        self.items = KeyedItemFactory()
+        self.server.objects["top"]["items"]["item"] = self.items
+        result = await self.server.oper_cb(
+            "/openconfig-mock:top/items/item[name='B']", None
+        )
+        self.assertEqual(
+            result,
+            {"top": {"items": {"item": [{"name": "B", "state": {"name": "B"}}]}}},
+        )
+        self.assertEqual(
+            self.snapshot.requested, ["/goldstone-mock:items/item[name='B']"]
+        )
+
+    async def test_unknown_node(self):
+        result = await self.server.oper_cb("/openconfig-mock:top/unknown", None)
+        self.assertEqual(len(result["top"]["items"]["item"]), 2)
+        self.assertEqual(len(result["top"]["modes"]["mode"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2828,6 +2828,62 @@ class TestPlatformComponentFactory(unittest.TestCase):
         components = component_factory.create(gs)
         self.assertEqual(components, expected)
 
+    def test_create_incremental(self):
+        def gs():
+            return {
+                "components": [
+                    {"name": "SYS", "state": {"name": "SYS", "type": "SYS", "id": 1}},
+                    {
+                        "name": "port1",
+                        "state": {"name": "port1", "type": "TRANSCEIVER", "id": 200},
+                        "transceiver": {"state": {"presence": "PRESENT"}},
+                    },
+                    {
+                        "name": "fan",
+                        "state": {"name": "fan", "type": "FAN", "id": 300},
+                        "fan": {"state": {"fan-state": "PRESENT", "status": "RUNNING"}},
+                    },
+                ],
+                "modules": [
+                    {
+                        "name": "piu1",
+                        "state": {"name": "piu1", "oper-status": "ready"},
+                        "network-interface": [{"name": "1", "state": {"name": "1"}}],
+                    }
+                ],
+                "interfaces": [],
+                "system": {},
+            }
+
+        cnr = ComponentNameResolver()
+        component_factory = ComponentFactory({}, cnr)
+        previous = component_factory.create(gs())
+        components = component_factory.create(gs())
+        self.assertEqual(components, previous)
+        for a, b in zip(components, previous):
+            self.assertIs(a, b)
+
+        # only the changed component and the components inheriting its state are created again
+        data = gs()
+        data["modules"][0]["state"]["oper-status"] = "initialize"
+        components = component_factory.create(data)
+        self.assertEqual(components, ComponentFactory({}, cnr).create(data))
+        changed = [a["name"] for a, b in zip(components, previous) if a is not b]
+        self.assertEqual(
+            changed,
+            ["line-piu1", "transceiver-line-piu1", "och-transceiver-line-piu1-1"],
+        )
+
+        # a removed subcomponent is removed from its parent
+        data = gs()
+        del data["components"][2]
+        components = component_factory.create(data)
+        self.assertEqual(components, ComponentFactory({}, cnr).create(data))
+        self.assertNotIn(
+            "fan",
+            [v["name"] for v in components[0]["subcomponents"]["subcomponent"]],
+        )
+
 
 class TestPlatformPortAdminStateHandlerTerminalLine(unittest.TestCase):
     """Tests for PortAdminStateHandler (TERMINAL_LINE)."""
@@ -0,0 +1,64 @@
+"""Tests of SourceDataSnapshot."""
+
+
+import unittest
+import asyncio
+from unittest import mock
+from goldstone.xlate.openconfig.lib import SourceDataSnapshot
+
+
+IF = "/goldstone-interfaces:interfaces/interface"
+
+
+class TestSourceDataSnapshot(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.count = 0
+
+        async def get_operational(xpath):
+            self.count += 1
+            await asyncio.sleep(0.01)
+            return [{"name": "Interface1/0/1"}]
+
+        self.conn = mock.MagicMock()
+        self.conn.aio.get_operational = get_operational
+
+    async def test_shared_fetch(self):
+        snapshot = SourceDataSnapshot(self.conn, window=10)
+        results = await asyncio.gather(*(snapshot.get(IF) for _ in range(3)))
+        self.assertEqual(results, [[{"name": "Interface1/0/1"}]] * 3)
+        self.assertEqual(self.count, 1)
+
+        # callers get their own copy
+        results[0][0]["name"] = "modified"
+        self.assertEqual(await snapshot.get(IF), [{"name": "Interface1/0/1"}])
+        self.assertEqual(self.count, 1)
+
+        stats = snapshot.stats()
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreater(stats["fetch-time"], 0)
+
+    async def test_window(self):
+        snapshot = SourceDataSnapshot(self.conn, window=0)
+        await snapshot.get(IF)
+        await snapshot.get(IF)
+        self.assertEqual(self.count, 2)
+
+    async def test_invalidate(self):
+        snapshot = SourceDataSnapshot(self.conn, window=10)
+        await snapshot.get(IF)
+        snapshot.invalidate()
+        await snapshot.get(IF)
+        self.assertEqual(self.count, 2)
+
+    async def test_default(self):
+        async def get_operational(xpath):
+            return None
+
+        self.conn.aio.get_operational = get_operational
+        snapshot = SourceDataSnapshot(self.conn)
+        self.assertEqual(await snapshot.get(IF, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
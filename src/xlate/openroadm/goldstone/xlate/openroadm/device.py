@@ -4,6 +4,7 @@ import logging
 import libyang
 import sysrepo
 from goldstone.lib.core import *
+from goldstone.lib.xpath import split as xpath_split
 from .lib import OpenROADMServer
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ class ShelfChangeHandler(ChangeHandler):
     def __init__(self, server, change):
         super().__init__(server, change)
         xpath = change.xpath
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "org-openroadm-device"
         assert xpath[0][1] == "org-openroadm-device"
         assert xpath[1][1] == "shelves"
@@ -66,7 +67,7 @@ class CircuitPackChangeHandler(ChangeHandler):
     def __init__(self, server, change):
         super().__init__(server, change)
         xpath = change.xpath
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "org-openroadm-device"
         assert xpath[0][1] == "org-openroadm-device"
         assert xpath[1][1] == "circuit-packs"
@@ -115,7 +116,7 @@ class IfChangeHandler(ChangeHandler):
     def __init__(self, server, change):
         super().__init__(server, change)
         xpath = change.xpath
-        xpath = list(libyang.xpath_split(xpath))
+        xpath = xpath_split(xpath)
         assert xpath[0][0] == "org-openroadm-device"
         assert xpath[0][1] == "org-openroadm-device"
         assert xpath[1][1] == "interface"
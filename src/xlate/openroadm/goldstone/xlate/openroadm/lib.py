@@ -57,8 +57,8 @@ class OpenROADMServer(ServerBase):
         Args:
             user (dict): Context attributes to provide to OpenROADM's handlers.
         """
-        sess_running = self.conn.conn.new_session("running")
-        sess_operational = self.conn.conn.new_session("operational")
+        sess_running = self.conn.conn.new_session("running", pooled=True)
+        sess_operational = self.conn.conn.new_session("operational", pooled=True)
         user["sess"] = {"running": sess_running, "operational": sess_operational}
 
     async def post(self, user):
@@ -142,13 +142,15 @@ class PMServer(OpenROADMServer):
                 current_pm_list.append(pm)
         return {"current-pm-entry": current_pm_list}
 
-    def oper_cb(self, xpath, priv):
+    async def oper_cb(self, xpath, priv):
         logger.debug(f"oper_cb: {xpath}")
-        transponder_data = self.get_operational_data(
-            "/goldstone-transponder:modules/module", []
-        )
-        device_data = self.get_running_data(
-            "/org-openroadm-device:org-openroadm-device", strip=False
+        transponder_data, device_data = await asyncio.gather(
+            self.get_operational_data_async(
+                "/goldstone-transponder:modules/module", []
+            ),
+            self.get_running_data_async(
+                "/org-openroadm-device:org-openroadm-device", strip=False
+            ),
         )
 
         return {